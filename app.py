@@ -9,13 +9,20 @@ Son unique rôle est de :
    (les pages, leurs icônes, et les sections du menu) en utilisant
    la fonction `st.navigation`.
 2. Appliquer une configuration de page globale (`st.set_page_config`).
-3. Lancer l'application avec `pg.run()`.
+3. Lancer, une seule fois par processus, le préchauffage des caches en
+   arrière-plan (`dashboards/warmup.py`, désactivable avec `DASHBOARD_WARMUP=0`)
+   et la surveillance du dossier `data/` (`utils/data_watcher.py`) : un
+   fichier modifié est relu et ses caches reconstruits en arrière-plan.
+4. Épingler la version des données pour tout le rerun, puis lancer
+   l'application avec `pg.run()`.
 
 Pour démarrer l'application, c'est CE fichier qu'il faut exécuter :
 streamlit run app.py
 """ 
 
 import streamlit as st
+from dashboards.warmup import start_warmup, run_warmup
+from utils.data_watcher import start_data_watcher, pin_data_versions
 
 st.logo(image="./images/logo_pstb.png", size="large", icon_image="./images/logo_pstb.png")
 
@@ -46,11 +53,23 @@ page_world_happiness_analysis = st.Page("./pages/5_📊_Partie 2 - Visualisation
                                         title="Visualisation Plotly du dataset World Happiness Report harmonisé", 
                                         icon="📊")
 
+page_administration = st.Page("./pages/7_🛠️_Administration.py", 
+                               title="Administration des caches", 
+                               icon="🛠️")
+
 pg = st.navigation({
     "Accueil": [page_accueil],
     "Dashboard" : [page_dashboard],
     "Partie 1 : Netflix (Seaborn)": [page_netflix_cleaning, page_netflix_analysis],
-    "Partie 2 : World Happiness (Plotly)": [page_world_happiness_cleaning, page_world_happiness_analysis]
+    "Partie 2 : World Happiness (Plotly)": [page_world_happiness_cleaning, page_world_happiness_analysis],
+    "Administration": [page_administration]
 })
 
+# Préchauffage des caches et surveillance des données (threads d'arrière-plan, non bloquants)
+start_warmup()
+start_data_watcher(rebuild=run_warmup)
+
+# Toutes les lectures de ce rerun utilisent la même version des données
+pin_data_versions()
+
 pg.run()
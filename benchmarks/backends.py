@@ -0,0 +1,177 @@
+"""
+Comparaison des Backends de Requêtes du Dashboard Netflix (pandas vs DuckDB).
+
+Pour chaque taille de catalogue synthétique (`--rows`), écrit le CSV
+nettoyé dans un dossier temporaire puis mesure, pour les deux backends :
+
+- le chargement : `read_csv` + index bitmap (pandas) ou création de la
+  table DuckDB depuis le CSV, puis depuis son fichier Parquet associé ;
+- un rerun : filtres de la barre latérale, KPIs, Top N des pays, comptes
+  par année et par type, pour quelques combinaisons de filtres ;
+- les résumés indépendants des filtres : matrice de corrélation et
+  résumés des boxplots de durée ;
+- la mémoire occupée par les données (DataFrame + index, ou table DuckDB).
+
+Les résultats des deux backends doivent être identiques (KPIs, comptes,
+matrice de corrélation à 1e-9 près, résumés des boxplots).
+
+Exemple (10 et 100 fois le catalogue réel) :
+    python -m benchmarks.backends --rows 88070 880700
+
+Le code de sortie vaut 1 si un résultat diffère entre les deux backends,
+2 si duckdb n'est pas installé.
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+from benchmarks.cases import unwrap
+from dashboards import netflix_page
+from data_loader import NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES, NETFLIX_CORR_COLUMNS
+from utils import sql_backend
+from utils.bitmap_index import build_bitmap_index
+from utils.pandas_helpers import get_duration_box_stats
+
+
+def best_time(func, repeat):
+    """Meilleur temps (en secondes) de `repeat` appels de `func`, et son dernier résultat."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def filter_states(cleaned):
+    """Combinaisons de filtres d'un rerun : aucun filtre, un type, puis pays + genres + années."""
+    countries = cleaned['main_country'].value_counts().index[:3].tolist()
+    genres = cleaned['main_genre'].value_counts().index[:2].tolist()
+    return [
+        ("Tous", (), (), None),
+        ("Movie", (), (), None),
+        ("TV Show", countries, genres, {'release_year': (2000, 2019), 'year_added': (2015, 2020)}),
+    ]
+
+def run_rerun(df, index, states):
+    """Statistiques d'un rerun du dashboard Netflix pour chaque état de `states`."""
+    results = []
+    for state in states:
+        rows = netflix_page.get_filtered_rows(index, *state)
+        results.append((
+            netflix_page.get_kpis(df, index, rows),
+            netflix_page.get_country_ranking(index, rows),
+            netflix_page.get_type_counts(index, rows),
+            [netflix_page.get_year_counts(index, rows, variable) for variable in netflix_page.HIST_VARIABLES],
+        ))
+    return results
+
+def pandas_summaries(df):
+    return unwrap(netflix_page.get_corr_matrix)(df), unwrap(get_duration_box_stats)(df)
+
+def sql_summaries(catalogue):
+    movies = sql_backend.select_rows(catalogue, equals={'type': ['Movie']})
+    series = sql_backend.select_rows(catalogue, equals={'type': ['TV Show']})
+    return sql_backend.corr_matrix(catalogue, NETFLIX_CORR_COLUMNS), {
+        'movies': sql_backend.box_stats(catalogue, 'duration_min', movies, label='Films'),
+        'series': sql_backend.box_stats(catalogue, 'duration_seasons', series, label='Séries'),
+        'movies_by_genre': sql_backend.box_stats(catalogue, 'duration_min', movies, by='main_genre', top_n=10),
+        'series_by_genre': sql_backend.box_stats(catalogue, 'duration_seasons', series, by='main_genre', top_n=10),
+    }
+
+def same_result(left, right):
+    """Compare récursivement deux résultats (Series, DataFrames, tableaux, flottants à 1e-9 près)."""
+    if isinstance(left, pd.DataFrame):
+        return left.shape == right.shape and np.allclose(left.to_numpy(), right.to_numpy(), atol=1e-9, equal_nan=True)
+    if isinstance(left, pd.Series):
+        return left.equals(right) and left.index.equals(right.index) and left.index.dtype == right.index.dtype
+    if isinstance(left, np.ndarray):
+        return np.array_equal(left, right)
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(same_result(left[key], right[key]) for key in left)
+    if isinstance(left, (list, tuple)):
+        return len(left) == len(right) and all(same_result(a, b) for a, b in zip(left, right))
+    if isinstance(left, float):
+        return abs(left - right) <= 1e-9 * max(1.0, abs(left))
+    return left == right
+
+def index_nbytes(index):
+    """Octets des tableaux numpy de l'index bitmap."""
+    arrays = [*index['codes'].values(), *index['bitmaps'].values(), *(a for pair in index['sorted'].values() for a in pair)]
+    return sum(array.nbytes for array in arrays)
+
+def sql_nbytes(catalogue):
+    """Octets occupés par les tables de la base DuckDB en mémoire."""
+    return catalogue['con'].execute("SELECT sum(memory_usage_bytes) FROM duckdb_memory() "
+                                    "WHERE tag = 'IN_MEMORY_TABLE'").fetchone()[0] or 0
+
+def compare_backends(n_rows, repeat, root):
+    """Mesure les deux backends sur un catalogue synthétique de `n_rows` titres."""
+    path = os.path.join(root, 'netflix_cleaned.csv')
+    cleaned = synthetic.make_netflix_cleaned(n_rows)
+    cleaned.to_csv(path, index=False)
+    states = filter_states(cleaned)
+    del cleaned
+
+    def load_pandas():
+        df = pd.read_csv(path)
+        return df, build_bitmap_index(df, NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES)
+
+    def load_sql(sidecar=False):
+        return sql_backend.build_sql_catalogue(path, NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES, sidecar=sidecar)
+
+    timings = {}
+    timings['load', 'pandas'], (df, index) = best_time(load_pandas, repeat)
+    timings['load', 'duckdb'], catalogue = best_time(load_sql, repeat)
+    # Premier chargement avec sidecar : lecture du CSV et écriture du Parquet
+    load_sql(sidecar=True)['con'].close()
+    timings['load (parquet)', 'duckdb'], _ = best_time(lambda: load_sql(sidecar=True), repeat)
+    os.remove(sql_backend.sidecar_path(path))
+
+    timings['rerun', 'pandas'], pandas_rerun = best_time(lambda: run_rerun(df, index, states), repeat)
+    timings['rerun', 'duckdb'], sql_rerun = best_time(lambda: run_rerun(None, catalogue, states), repeat)
+    timings['summaries', 'pandas'], pandas_summary = best_time(lambda: pandas_summaries(df), repeat)
+    timings['summaries', 'duckdb'], sql_summary = best_time(lambda: sql_summaries(catalogue), repeat)
+
+    memory = {'pandas': int(df.memory_usage(deep=True).sum()) + index_nbytes(index), 'duckdb': sql_nbytes(catalogue)}
+    same = same_result(pandas_rerun, sql_rerun) and same_result(pandas_summary, sql_summary)
+    catalogue['con'].close()
+    return timings, memory, same
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comparaison des backends pandas et DuckDB du dashboard Netflix.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[88070, 880700],
+                        help="Tailles du catalogue Netflix synthétique (défaut : 10x et 100x le catalogue réel).")
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre de répétitions par mesure.")
+    args = parser.parse_args(argv)
+
+    if not sql_backend.DUCKDB_AVAILABLE:
+        print("duckdb n'est pas installé (pip install duckdb).")
+        return 2
+
+    failed = False
+    root = tempfile.mkdtemp(prefix='netflix-backends-')
+    try:
+        for n_rows in args.rows:
+            timings, memory, same = compare_backends(n_rows, args.repeat, root)
+            failed |= not same
+            print(f"{n_rows:,} titres  (résultats identiques : {'oui' if same else 'NON'})")
+            for step in ('load', 'load (parquet)', 'rerun', 'summaries'):
+                pandas_time = timings.get((step, 'pandas'))
+                pandas_text = f"{pandas_time * 1e3:9.1f} ms" if pandas_time is not None else f"{'-':>12}"
+                print(f"  {step:<15} pandas {pandas_text}   duckdb {timings[step, 'duckdb'] * 1e3:9.1f} ms")
+            print(f"  {'mémoire':<15} pandas {memory['pandas'] / 1e6:9.1f} Mo   duckdb {memory['duckdb'] / 1e6:9.1f} Mo")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Catalogue des Cas de Benchmark.
+
+Chaque cas est un `BenchCase` : un nom, un groupe et une fonction
+`prepare()` qui retourne les arguments de l'appel chronométré. `prepare()`
+est exécutée avant **chaque** répétition et n'est pas chronométrée : les
+étapes qui modifient leur DataFrame en place reçoivent ainsi une copie neuve.
+
+Les fonctions mises en cache par Streamlit (`@st.cache_data`) sont
+"déballées" (`unwrap`) : on mesure le calcul, pas la lecture du cache.
+
+Groupes couverts :
+- `loaders`      : toutes les fonctions de `data_loader` (sur des CSV synthétiques).
+- `cleaning`     : les étapes du nettoyage Netflix, le pipeline par morceaux et,
+                   si polars est installé, le nettoyage complet pandas vs plan Polars.
+- `harmonization`: l'harmonisation du World Happiness Report (et, si polars
+                   est installé, depuis les fichiers : pandas vs plan Polars).
+- `aggregations` : `get_extremes_by_year`, matrices de corrélation, table croisée,
+                   index bitmap Netflix (construction, filtres combinés vs masques pandas).
+- `figures`      : chaque fonction de création de graphique des deux dashboards.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Callable
+
+import data_loader
+import numpy as np
+
+from utils import netflix_cleaning, lazy_pipelines
+from utils.bitmap_index import build_bitmap_index, select_rows
+from utils.happiness_harmonization import (harmonize_years, concat_years, harmonize_happiness, load_raw_happiness,
+                                           RAW_PATHS)
+from utils.pandas_helpers import (get_extremes_by_year, build_country_year_panel, get_duration_box_stats,
+                                  compact_happiness_frame)
+from dashboards import netflix_page, happiness_page
+from benchmarks import synthetic
+
+
+@dataclass
+class BenchCase:
+    name: str
+    group: str
+    func: Callable
+    prepare: Callable = lambda: ()
+    teardown: Callable = None
+
+
+def unwrap(func):
+    """Retourne la fonction d'origine d'une fonction décorée par `@st.cache_data`."""
+    return getattr(func, '__wrapped__', func)
+
+
+# ==========================================================
+# FICHIERS SYNTHÉTIQUES (pour les loaders)
+# ==========================================================
+
+def write_synthetic_data_dir(root, netflix_rows, n_years, n_entities):
+    """
+    Écrit dans `root/data/` des CSV synthétiques aux noms attendus par `data_loader`.
+
+    Les loaders lisent des chemins relatifs (`./data/...`) : le runner se
+    place dans `root` (os.chdir) avant de les chronométrer.
+    """
+    data_dir = os.path.join(root, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    synthetic.make_netflix_raw(netflix_rows).to_csv(os.path.join(data_dir, 'netflix_titles.csv'), index=False)
+    synthetic.make_netflix_cleaned(netflix_rows).to_csv(os.path.join(data_dir, 'netflix_cleaned.csv'), index=False)
+    for year, df in synthetic.make_happiness_raw(n_entities).items():
+        df.to_csv(os.path.join(data_dir, f'{year}.csv'), index=False)
+    panel = synthetic.make_happiness_panel(n_years, n_entities)
+    panel.to_csv(os.path.join(data_dir, 'world_happiness_2015-2019_combined.csv'), index=False)
+
+
+# ==========================================================
+# CAS PAR GROUPE
+# ==========================================================
+
+def file_cases():
+    """Cas lisant des fichiers (à exécuter depuis un dossier contenant `data/` synthétique)."""
+    cases = [
+        BenchCase('load_netflix_data_cleaning', 'loaders', unwrap(data_loader.load_netflix_data_cleaning)),
+        BenchCase('load_netflix_data_analysis', 'loaders', unwrap(data_loader.load_netflix_data_analysis)),
+        BenchCase('load_happiness_all_df', 'loaders', unwrap(data_loader.load_happiness_all_df)),
+        BenchCase('load_happiness_data_analysis', 'loaders', unwrap(data_loader.load_happiness_data_analysis)),
+    ]
+    # La table croisée appelle les loaders cachés : le cache est vidé avant chaque répétition
+    def prepare_panel():
+        data_loader.load_netflix_data_analysis.clear()
+        data_loader.load_happiness_data_analysis.clear()
+        return (None,)
+    cases.append(BenchCase('load_netflix_happiness_panel', 'loaders',
+                           unwrap(data_loader.load_netflix_happiness_panel), prepare_panel))
+    # Pipeline de nettoyage par morceaux (lecture CSV -> Parquet)
+    cases.append(BenchCase('cleaning.clean_netflix_chunked', 'cleaning', netflix_cleaning.clean_netflix_chunked,
+                           lambda: ('./data/netflix_titles.csv', './data/netflix_cleaned.parquet')))
+    # Pipelines complets depuis les fichiers bruts : pandas (étape par étape) vs plan paresseux Polars
+    if lazy_pipelines.POLARS_AVAILABLE:
+        cases += [
+            BenchCase('cleaning.clean_netflix', 'cleaning', netflix_cleaning.clean_netflix,
+                      lambda: (netflix_cleaning.RAW_PATH,)),
+            BenchCase('cleaning.clean_netflix_lazy', 'cleaning', lazy_pipelines.clean_netflix_lazy,
+                      lambda: (netflix_cleaning.RAW_PATH,)),
+            BenchCase('harmonization.harmonize_files', 'harmonization',
+                      lambda paths: harmonize_happiness(load_raw_happiness(paths)), lambda: (RAW_PATHS,)),
+            BenchCase('harmonization.harmonize_happiness_lazy', 'harmonization', lazy_pipelines.harmonize_happiness_lazy,
+                      lambda: (RAW_PATHS,)),
+        ]
+    return cases
+
+def netflix_filters(cleaned):
+    """Combinaison de filtres du Dashboard : type, 3 pays, 2 genres et deux intervalles d'années."""
+    countries = cleaned['main_country'].value_counts().index[:3].tolist()
+    genres = cleaned['main_genre'].value_counts().index[:2].tolist()
+    equals = {'type': ['Movie'], 'main_country': countries, 'main_genre': genres}
+    ranges = {'release_year': (2000, 2019), 'year_added': (2015, 2020)}
+    return equals, ranges
+
+def mask_rows(df, equals, ranges):
+    """Même filtre que `select_rows`, par masques booléens pandas (référence)."""
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in equals.items():
+        mask &= df[column].isin(values).to_numpy()
+    for column, (start, end) in ranges.items():
+        mask &= df[column].between(start, end).to_numpy()
+    return np.flatnonzero(mask)
+
+def netflix_cases(netflix_rows):
+    """Cas du nettoyage, des agrégations et des graphiques Netflix pour `netflix_rows` titres."""
+    raw = synthetic.make_netflix_raw(netflix_rows)
+    cleaned = synthetic.make_netflix_cleaned(netflix_rows)
+    _, binary_palette, _, _, DARK_GREY, _, NETFLIX_RED = netflix_page.setup_netflix_theme()
+    index = build_bitmap_index(cleaned, data_loader.NETFLIX_INDEX_CATEGORICAL, data_loader.NETFLIX_INDEX_RANGES)
+    all_rows = np.arange(len(cleaned))
+    filters = netflix_filters(cleaned)
+    year_counts = netflix_page.get_year_counts(index, all_rows, 'release_year')
+    year_density = unwrap(netflix_page.get_year_density)(year_counts)
+    country_ranking = netflix_page.get_country_ranking(index, all_rows)
+    type_counts = netflix_page.get_type_counts(index, all_rows)
+    corr_matrix = unwrap(netflix_page.get_corr_matrix)(cleaned)
+    box_stats = unwrap(get_duration_box_stats)(cleaned)
+
+    cases = []
+    # Étapes du nettoyage : chaque étape reçoit une copie de l'état précédent
+    state = raw.copy()
+    for step in netflix_cleaning.CLEANING_STEPS:
+        snapshot = state.copy()
+        cases.append(BenchCase(f'cleaning.{step.__name__}', 'cleaning', step, lambda snapshot=snapshot: (snapshot.copy(),)))
+        state = step(state.copy())
+    cases.append(BenchCase('cleaning.clean_chunk', 'cleaning', netflix_cleaning.clean_chunk, lambda: (raw.copy(),)))
+
+    cases += [
+        BenchCase('netflix.corr_matrix', 'aggregations', unwrap(netflix_page.get_corr_matrix), lambda: (cleaned,)),
+        BenchCase('build_bitmap_index', 'aggregations', build_bitmap_index,
+                  lambda: (cleaned, data_loader.NETFLIX_INDEX_CATEGORICAL, data_loader.NETFLIX_INDEX_RANGES)),
+        BenchCase('netflix.filter.bitmap', 'aggregations', select_rows, lambda: (index, *filters)),
+        BenchCase('netflix.filter.mask', 'aggregations', mask_rows, lambda: (cleaned, *filters)),
+        BenchCase('get_type_counts', 'aggregations', netflix_page.get_type_counts, lambda: (index, all_rows)),
+        BenchCase('get_year_counts', 'aggregations', netflix_page.get_year_counts,
+                  lambda: (index, all_rows, 'release_year')),
+        BenchCase('get_year_density', 'aggregations', unwrap(netflix_page.get_year_density), lambda: (year_counts,)),
+        BenchCase('get_duration_box_stats', 'aggregations', unwrap(get_duration_box_stats), lambda: (cleaned,)),
+        BenchCase('get_country_ranking', 'aggregations', netflix_page.get_country_ranking, lambda: (index, all_rows)),
+        BenchCase('create_countplot_figure', 'figures', unwrap(netflix_page.create_countplot_figure),
+                  lambda: (type_counts, binary_palette, DARK_GREY)),
+        BenchCase('create_heatmap_figure', 'figures', unwrap(netflix_page.create_heatmap_figure),
+                  lambda: (corr_matrix,)),
+        BenchCase('create_boxplot_movies', 'figures', unwrap(netflix_page.create_boxplot_movies),
+                  lambda: (box_stats, NETFLIX_RED)),
+        BenchCase('create_boxplot_series', 'figures', unwrap(netflix_page.create_boxplot_series),
+                  lambda: (box_stats, DARK_GREY)),
+        BenchCase('create_boxplot_by_genre', 'figures', unwrap(netflix_page.create_boxplot_by_genre),
+                  lambda: (box_stats['movies_by_genre'], 'Films', 'Durée', NETFLIX_RED)),
+        BenchCase('create_barplot_figure', 'figures', unwrap(netflix_page.create_barplot_figure),
+                  lambda: (country_ranking, 10, NETFLIX_RED)),
+        BenchCase('create_histplot_figure', 'figures', unwrap(netflix_page.create_histplot_figure),
+                  lambda: (year_counts, year_density, 'release_year', 30, NETFLIX_RED, DARK_GREY)),
+    ]
+    return cases
+
+def happiness_cases(n_years, n_entities):
+    """Cas de l'harmonisation, des agrégations et des graphiques Happiness."""
+    raw_dfs = synthetic.make_happiness_raw(n_entities)
+    # Types de stockage du panel chargé par `load_happiness_data_analysis`
+    panel = compact_happiness_frame(synthetic.make_happiness_panel(n_years, n_entities))
+    last_year = int(panel['Year'].max())
+    df_year = panel[panel['Year'] == last_year]
+    df_line = panel[panel['Country'].isin(panel['Country'].unique()[:10])]
+    corr_matrix = unwrap(happiness_page.get_corr_matrix)(panel)
+    top_10 = unwrap(get_extremes_by_year)(panel, 'Score', ascending=False)
+    netflix = synthetic.make_netflix_cleaned(10_000)
+
+    harmonized = harmonize_years({year: df.copy() for year, df in raw_dfs.items()})
+    return [
+        BenchCase('harmonization.harmonize_years', 'harmonization', harmonize_years,
+                  lambda: ({year: df.copy() for year, df in raw_dfs.items()},)),
+        BenchCase('harmonization.concat_years', 'harmonization', concat_years, lambda: (harmonized,)),
+        BenchCase('harmonization.harmonize_happiness', 'harmonization', harmonize_happiness,
+                  lambda: ({year: df.copy() for year, df in raw_dfs.items()},)),
+        BenchCase('get_extremes_by_year', 'aggregations', unwrap(get_extremes_by_year), lambda: (panel, 'Score')),
+        BenchCase('get_corr_matrix', 'aggregations', unwrap(happiness_page.get_corr_matrix), lambda: (panel,)),
+        BenchCase('build_country_year_panel', 'aggregations', build_country_year_panel, lambda: (netflix, panel)),
+        BenchCase('create_map_figure', 'figures', happiness_page.create_map_figure,
+                  lambda: (df_year, 'Score', last_year, [panel['Score'].min(), panel['Score'].max()])),
+        BenchCase('create_scatter_figure', 'figures', happiness_page.create_scatter_figure,
+                  lambda: (df_year, last_year, [0, 2], [2, 9])),
+        BenchCase('create_line_figure', 'figures', unwrap(happiness_page.create_line_figure), lambda: (df_line, 'Score')),
+        BenchCase('create_corr_heatmap_figure', 'figures', unwrap(happiness_page.create_corr_heatmap_figure), lambda: (corr_matrix,)),
+        BenchCase('create_race_figure', 'figures', unwrap(happiness_page.create_race_figure), lambda: (top_10, 'Score', 'Top 10')),
+    ]
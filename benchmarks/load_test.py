@@ -0,0 +1,99 @@
+"""
+Test de Charge du Rendu Matplotlib (sessions concurrentes).
+
+Streamlit exécute chaque session dans un thread du même processus. Ce
+script simule `--users` sessions qui rendent **en même temps** les
+graphiques Seaborn du dashboard Netflix (sans cache : chaque session
+recalcule ses images), puis vérifie que chaque image PNG est identique,
+octet pour octet, à celle d'un rendu séquentiel de référence.
+
+Avec l'ancien rendu via pyplot (figure "courante" partagée), des
+sessions concurrentes pouvaient dessiner sur la figure d'une autre ;
+le rendu orienté objet (`new_figure` / `figure_to_png`) n'a aucun état
+global.
+
+Exemple :
+    python -m benchmarks.load_test --users 1 5 20 --rows 8807
+
+Le code de sortie vaut 1 si au moins une image diffère de la référence.
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg') # Rendu sans affichage
+
+from benchmarks import synthetic
+from benchmarks.cases import unwrap
+from dashboards import netflix_page
+from data_loader import NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES
+from utils.bitmap_index import build_bitmap_index
+from utils.pandas_helpers import get_duration_box_stats
+
+
+def netflix_chart_jobs(n_rows):
+    """Graphiques du dashboard Netflix : (nom, fonction non cachée, arguments), sur un catalogue synthétique."""
+    cleaned = synthetic.make_netflix_cleaned(n_rows)
+    _, binary_palette, _, _, DARK_GREY, _, NETFLIX_RED = netflix_page.setup_netflix_theme()
+    index = build_bitmap_index(cleaned, NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES)
+    all_rows = np.arange(len(cleaned))
+    year_counts = netflix_page.get_year_counts(index, all_rows, 'release_year')
+    year_density = unwrap(netflix_page.get_year_density)(year_counts)
+    country_ranking = netflix_page.get_country_ranking(index, all_rows)
+    box_stats = unwrap(get_duration_box_stats)(cleaned)
+    type_counts = netflix_page.get_type_counts(index, all_rows)
+    corr_matrix = unwrap(netflix_page.get_corr_matrix)(cleaned)
+    return [
+        ('countplot', netflix_page.create_countplot_figure, (type_counts, binary_palette, DARK_GREY)),
+        ('heatmap', netflix_page.create_heatmap_figure, (corr_matrix,)),
+        ('boxplot_movies', netflix_page.create_boxplot_movies, (box_stats, NETFLIX_RED)),
+        ('boxplot_series', netflix_page.create_boxplot_series, (box_stats, DARK_GREY)),
+        ('boxplot_genres', netflix_page.create_boxplot_by_genre, (box_stats['movies_by_genre'], 'Films', 'Durée', NETFLIX_RED)),
+        ('barplot', netflix_page.create_barplot_figure, (country_ranking, 10, NETFLIX_RED)),
+        ('histplot', netflix_page.create_histplot_figure, (year_counts, year_density, 'release_year', 30, NETFLIX_RED, DARK_GREY)),
+    ]
+
+def render_session(jobs):
+    """Rend tous les graphiques d'une session, sans passer par le cache."""
+    return {name: unwrap(func)(*args) for name, func, args in jobs}
+
+def run_load(jobs, reference, users):
+    """Lance `users` sessions concurrentes et compte les images différentes de la référence."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        sessions = list(pool.map(lambda _: render_session(jobs), range(users)))
+    wall_time = time.perf_counter() - start
+    mismatches = sum(images[name] != reference[name] for images in sessions for name in reference)
+    return {
+        'users': users,
+        'wall_time': wall_time,
+        'images_per_s': users * len(jobs) / wall_time,
+        'mismatches': mismatches,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge du rendu des graphiques Netflix (threads).")
+    parser.add_argument('--users', type=int, nargs='+', default=[1, 5, 20], help="Nombres de sessions concurrentes.")
+    parser.add_argument('--rows', type=int, default=8807, help="Taille du catalogue Netflix synthétique.")
+    args = parser.parse_args(argv)
+
+    jobs = netflix_chart_jobs(args.rows)
+    reference = render_session(jobs)
+    print(f"{len(jobs)} graphiques par session, {os.cpu_count()} cœur(s)")
+
+    failed = False
+    for users in args.users:
+        result = run_load(jobs, reference, users)
+        failed |= result['mismatches'] > 0
+        print(f"  {users:>3} sessions  {result['wall_time']:8.2f} s  {result['images_per_s']:7.1f} images/s  "
+              f"images différentes : {result['mismatches']}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
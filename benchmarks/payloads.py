@@ -0,0 +1,71 @@
+"""
+Taille des Figures Plotly Envoyées au Navigateur (octets par interaction).
+
+À chaque rerun, `st.plotly_chart` sérialise la figure entière en JSON
+(`plotly.io.to_json`). Ce script construit chaque graphique du dashboard
+"World Happiness Report" sur les données réelles et compare la taille du
+JSON avant et après `compact_figure()` (`utils/chart_styles.py`).
+
+Exemple :
+    python -m benchmarks.payloads --year 2019
+"""
+
+import sys
+import argparse
+
+import plotly.io as pio
+
+from data_loader import load_happiness_data_analysis
+from benchmarks.cases import unwrap
+from dashboards import happiness_page
+from utils.chart_styles import compact_figure
+from utils.pandas_helpers import get_extremes_by_year
+
+LINE_COUNTRIES = ["France", "Germany", "United States", "Japan", "India"]
+
+
+def build_figures(df, year):
+    """Construit les graphiques du dashboard (sans compaction) avec les réglages par défaut."""
+    df_year = df[df['Year'] == year]
+    builders = {
+        'map': lambda: happiness_page.create_map_figure(df_year, 'Score', year, [df['Score'].min(), df['Score'].max()]),
+        'scatter': lambda: happiness_page.create_scatter_figure(df_year, year, [df['GDP_per_Capita'].min(), df['GDP_per_Capita'].max()],
+                                                                [df['Score'].min(), df['Score'].max()]),
+        'line': lambda: unwrap(happiness_page.create_line_figure)(df[df['Country'].isin(LINE_COUNTRIES)], 'Score'),
+        'heatmap': lambda: unwrap(happiness_page.create_corr_heatmap_figure)(happiness_page.get_corr_matrix(df)),
+        'race_top': lambda: unwrap(happiness_page.create_race_figure)(get_extremes_by_year(df, 'Score', ascending=False), 'Score', 'Top 10'),
+    }
+    # Les constructeurs compactent leur figure : on la désactive le temps de la mesure "avant"
+    original = happiness_page.compact_figure
+    happiness_page.compact_figure = lambda fig: fig
+    try:
+        return {name: build() for name, build in builders.items()}
+    finally:
+        happiness_page.compact_figure = original
+
+def payload_sizes(figures):
+    """Taille du JSON (octets) de chaque figure avant et après compaction."""
+    rows = []
+    for name, fig in figures.items():
+        before = len(pio.to_json(fig, validate=False))
+        after = len(pio.to_json(compact_figure(fig), validate=False))
+        rows.append({'chart': name, 'before': before, 'after': after, 'saved': 1 - after / before})
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Taille des figures Plotly du dashboard avant / après compaction.")
+    parser.add_argument('--year', type=int, default=2019, help="Année affichée par la carte et le nuage de points.")
+    args = parser.parse_args(argv)
+
+    rows = payload_sizes(build_figures(load_happiness_data_analysis(), args.year))
+    print(f"  {'graphique':<10} {'avant':>10} {'après':>10} {'gain':>8}")
+    for row in rows:
+        print(f"  {row['chart']:<10} {row['before']:>10} {row['after']:>10} {row['saved']:>8.1%}")
+    total_before = sum(row['before'] for row in rows)
+    total_after = sum(row['after'] for row in rows)
+    print(f"  {'total':<10} {total_before:>10} {total_after:>10} {1 - total_after / total_before:>8.1%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Harnais de Chronométrage des Reruns Complets du Dashboard (sans navigateur).
+
+Mesure ce que ressent l'utilisateur : le temps d'un rerun complet de
+`pages/6_📝_Dashboard.py` (donc de `render_netflix_dashboard` ou
+`render_happiness_dashboard`) pour un état de widgets donné.
+
+Le harnais s'appuie sur `streamlit.testing.v1.AppTest`, qui exécute le
+script dans le processus courant, sans serveur ni navigateur : il
+fonctionne hors ligne (CI).
+
+Pour chaque scénario (une suite scriptée d'interactions : changement de
+type, défilement des années, changement de variable, sélection de pays...),
+on enregistre par rerun :
+- le temps réel (wall time),
+- le pic de mémoire Python allouée pendant le rerun (`tracemalloc`),
+- les hits et misses de chaque fonction mise en cache (registre de
+  `utils/cache_registry.py`) et les nouvelles entrées créées dans les
+  caches Streamlit.
+
+Chaque scénario est joué deux fois : à froid (caches vidés) puis à chaud.
+
+Exemple :
+    python -m benchmarks.render_harness --scenario all --output benchmarks/results/render.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+
+from streamlit.testing.v1 import AppTest
+from utils.cache_registry import get_cache_counters, clear_all_caches
+
+# Chemin absolu : AppTest résout les chemins relatifs par rapport au fichier appelant.
+# Le harnais se lance depuis la racine du dépôt (les loaders lisent `./data/...`).
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_PAGE = os.path.join(ROOT_DIR, 'pages', '6_📝_Dashboard.py')
+DEFAULT_TIMEOUT = 120
+
+
+# ==========================================================
+# ACCÈS AUX WIDGETS
+# ==========================================================
+
+def _widget(at, kind, label=None, key=None):
+    """Retourne le widget de type `kind` ('selectbox', 'slider', ...) désigné par sa clé ou son libellé."""
+    if key is not None:
+        return getattr(at, kind)(key=key)
+    for widget in getattr(at, kind):
+        if widget.label == label:
+            return widget
+    raise LookupError(f"Widget {kind} '{label}' introuvable.")
+
+def set_state(key, value):
+    """
+    Construit une action qui fixe la valeur d'un widget par sa clé, y compris
+    avant le premier rerun (le widget n'existe pas encore).
+    """
+    def action(at):
+        at.session_state[key] = value
+    return action
+
+def set_widget(kind, label, value, key=None):
+    """
+    Construit une action de scénario qui modifie un widget (le rerun est lancé par le harnais).
+
+    `key` désigne les widgets dont le libellé n'est pas unique (ex: "Line", "Race").
+    """
+    def action(at):
+        _widget(at, kind, label, key).set_value(value)
+    return action
+
+
+# ==========================================================
+# SCÉNARIOS
+# ==========================================================
+
+SCENARIOS = {
+    'netflix': [
+        ("chargement initial", None),
+        ("type = Movie", set_widget('selectbox', "Type de productions", "Movie")),
+        ("type = TV Show", set_widget('selectbox', "Type de productions", "TV Show")),
+        ("type = Tous", set_widget('selectbox', "Type de productions", "Tous")),
+        ("pays = United States + India", set_widget('multiselect', "Pays producteurs", ["United States", "India"])),
+        ("genre = Dramas", set_widget('multiselect', "Genres principaux", ["Dramas"])),
+        ("sortie = 2010-2020", set_widget('slider', "Années de sortie", (2010, 2020))),
+        ("ajout = 2018-2021", set_widget('slider', "Années d'ajout", (2018, 2021))),
+        ("top N = 15", set_widget('number_input', "Nombre de pays (Top N)", 15)),
+        ("histogramme = year_added", set_widget('selectbox', "Variable pour l'histogramme", "year_added")),
+        ("bins = 50", set_widget('slider', "Nombre de Bins (Histogramme)", 50)),
+        ("bins = 80", set_widget('slider', "Nombre de Bins (Histogramme)", 80)),
+    ],
+    'happiness': [
+        ("chargement initial", set_state('dashboard_dataset', "World Happiness Report")),
+        ("année = 2015", set_widget('slider', "Sélectionnez une année", 2015)),
+        ("année = 2016", set_widget('slider', "Sélectionnez une année", 2016)),
+        ("année = 2017", set_widget('slider', "Sélectionnez une année", 2017)),
+        ("année = 2018", set_widget('slider', "Sélectionnez une année", 2018)),
+        ("variable carte = GDP_per_Capita", set_widget('selectbox', "Choisissez une variable pour la carte", "GDP_per_Capita")),
+        ("variable courbe = Freedom", set_widget('selectbox', None, "Freedom", key="Line")),
+        ("pays = + Switzerland", set_widget('multiselect', "Sélectionnez des pays à comparer",
+                                            ["France", "Germany", "United States", "Japan", "India", "Switzerland"])),
+        ("variable top & flop = Generosity", set_widget('selectbox', None, "Generosity", key="Race")),
+    ],
+}
+
+
+# ==========================================================
+# MESURES
+# ==========================================================
+
+def cache_entry_counts(counters):
+    """
+    Nombre d'entrées stockées depuis le démarrage par fonction cachée, d'après
+    les clés suivies par le registre (entrées présentes + entrées évincées).
+    """
+    return Counter({name: stats['entries'] + stats['evictions'] for name, stats in counters.items()})
+
+def _counter_deltas(before, after):
+    """Appels et misses enregistrés par le registre des caches entre deux relevés."""
+    calls = misses = 0
+    for name, stats in after.items():
+        previous = before.get(name, {'calls': 0, 'misses': 0})
+        calls += stats['calls'] - previous['calls']
+        misses += stats['misses'] - previous['misses']
+    return calls, misses
+
+def measure_rerun(at, action, track_memory):
+    """Applique `action`, relance le script et mesure le rerun."""
+    if action is not None:
+        action(at)
+    counters_before = get_cache_counters()
+    if track_memory:
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    at.run(timeout=DEFAULT_TIMEOUT)
+    wall_time = time.perf_counter() - start
+
+    peak_memory = tracemalloc.get_traced_memory()[1] if track_memory else None
+    counters_after = get_cache_counters()
+    new_entries = cache_entry_counts(counters_after) - cache_entry_counts(counters_before)
+    calls, misses = _counter_deltas(counters_before, counters_after)
+    return {
+        'wall_time': wall_time,
+        'peak_memory_bytes': peak_memory,
+        'cache_hits': calls - misses,
+        'cache_misses': misses,
+        'new_cache_entries': sum(new_entries.values()),
+        'new_cache_entries_by_function': dict(new_entries),
+        'exceptions': [str(exc.value) for exc in at.exception],
+    }
+
+def run_scenario(name, steps, track_memory):
+    """Joue un scénario à froid puis à chaud et retourne les mesures de chaque rerun."""
+    results = []
+    for phase in ('cold', 'warm'):
+        if phase == 'cold':
+            clear_all_caches()
+        # Une nouvelle AppTest = une nouvelle session (les caches, eux, sont partagés)
+        at = AppTest.from_file(DASHBOARD_PAGE, default_timeout=DEFAULT_TIMEOUT)
+        for step_name, action in steps:
+            measures = measure_rerun(at, action, track_memory)
+            results.append({'scenario': name, 'phase': phase, 'step': step_name, **measures})
+            memory = f"{measures['peak_memory_bytes'] / 1e6:8.1f} Mo" if track_memory else ""
+            print(f"  {name:<10} {phase:<5} {step_name:<36} {measures['wall_time'] * 1000:9.1f} ms "
+                  f"{memory} hits={measures['cache_hits']} misses={measures['cache_misses']}")
+            if measures['exceptions']:
+                print(f"    ! {measures['exceptions']}")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chronométrage des reruns complets du Dashboard (AppTest).")
+    parser.add_argument('--scenario', nargs='+', default=['all'], help="Scénarios : netflix, happiness ou all.")
+    parser.add_argument('--no-memory', action='store_true', help="Désactive tracemalloc (timings sans surcoût).")
+    parser.add_argument('--output', help="Fichier JSON de sortie.")
+    args = parser.parse_args(argv)
+
+    names = list(SCENARIOS) if 'all' in args.scenario else args.scenario
+    track_memory = not args.no_memory
+    if track_memory:
+        tracemalloc.start()
+
+    results = []
+    for name in names:
+        print(f"Scénario : {name}")
+        results += run_scenario(name, SCENARIOS[name], track_memory)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'memory_tracking': track_memory,
+        },
+        'results': results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRésultats écrits dans {args.output}")
+
+    return 1 if any(r['exceptions'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
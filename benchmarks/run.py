@@ -0,0 +1,168 @@
+"""
+Lanceur des Benchmarks (chronométrage, export JSON et comparaison).
+
+Exemples :
+    # Échelles par défaut (rapide) -> JSON
+    python -m benchmarks.run --output benchmarks/results/latest.json
+
+    # Toutes les échelles (Netflix 10k -> 10M lignes, WHR 5x150 -> 50x5000)
+    python -m benchmarks.run --full --output benchmarks/results/full.json
+
+    # Seulement les graphiques, puis comparaison avec une référence
+    python -m benchmarks.run --group figures --output new.json --compare baseline.json --threshold 0.2
+
+En mode comparaison, le code de sortie vaut 1 si au moins un cas est plus
+lent que la référence de plus de `threshold` (0.2 = +20 % sur la médiane).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+
+import matplotlib
+matplotlib.use('Agg') # Rendu sans affichage
+
+from benchmarks import cases as bench_cases
+
+DEFAULT_NETFLIX_ROWS = [10_000, 100_000]
+FULL_NETFLIX_ROWS = [10_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_WHR_SCALES = ['5x150', '10x500']
+FULL_WHR_SCALES = ['5x150', '10x500', '25x2000', '50x5000']
+
+
+def time_case(case, repeat):
+    """Chronomètre `case.func` `repeat` fois (prepare/teardown hors chronométrage)."""
+    timings = []
+    for _ in range(repeat):
+        args = case.prepare()
+        start = time.perf_counter()
+        result = case.func(*args)
+        timings.append(time.perf_counter() - start)
+        if case.teardown is not None:
+            case.teardown(result)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'repeat': repeat,
+    }
+
+def run_cases(case_list, scale, repeat, groups, name_filter):
+    """Exécute les cas sélectionnés et retourne leurs résultats."""
+    results = []
+    for case in case_list:
+        if groups and case.group not in groups:
+            continue
+        if name_filter and name_filter not in case.name:
+            continue
+        stats = time_case(case, repeat)
+        results.append({'name': case.name, 'group': case.group, 'scale': scale, **stats})
+        print(f"  {case.group:<14} {case.name:<40} {scale:<24} median={stats['median'] * 1000:10.2f} ms")
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_all(netflix_rows, whr_scales, repeat, groups=None, name_filter=None):
+    """Exécute tous les groupes sur toutes les échelles demandées."""
+    results = []
+    whr_pairs = [tuple(int(v) for v in scale.split('x')) for scale in whr_scales]
+
+    for n_rows in netflix_rows:
+        print(f"Netflix : {n_rows} lignes")
+        results += run_cases(bench_cases.netflix_cases(n_rows), f"netflix={n_rows}", repeat, groups, name_filter)
+
+    for n_years, n_entities in whr_pairs:
+        print(f"World Happiness : {n_years} années x {n_entities} pays")
+        results += run_cases(bench_cases.happiness_cases(n_years, n_entities),
+                             f"whr={n_years}x{n_entities}", repeat, groups, name_filter)
+
+    # Loaders : CSV synthétiques écrits dans un dossier temporaire
+    cwd = os.getcwd()
+    for n_rows, (n_years, n_entities) in zip(netflix_rows, whr_pairs):
+        scale = f"netflix={n_rows},whr={n_years}x{n_entities}"
+        print(f"Fichiers : {scale}")
+        with tempfile.TemporaryDirectory() as root:
+            bench_cases.write_synthetic_data_dir(root, n_rows, n_years, n_entities)
+            os.chdir(root)
+            try:
+                results += run_cases(bench_cases.file_cases(), scale, repeat, groups, name_filter)
+            finally:
+                os.chdir(cwd)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+def compare(current, baseline, threshold):
+    """
+    Compare deux exécutions (médianes) et retourne la liste des régressions.
+
+    Un cas régresse si `current / baseline - 1 > threshold`.
+    """
+    reference = {(r['name'], r['scale']): r for r in baseline['results']}
+    regressions = []
+    print(f"\nComparaison avec la référence (seuil : +{threshold:.0%})")
+    for result in current['results']:
+        base = reference.get((result['name'], result['scale']))
+        if base is None:
+            continue
+        ratio = result['median'] / base['median'] - 1
+        flag = 'REGRESSION' if ratio > threshold else ''
+        print(f"  {result['name']:<40} {result['scale']:<24} {ratio:+8.1%} {flag}")
+        if flag:
+            regressions.append({**result, 'baseline_median': base['median'], 'change': ratio})
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks des loaders, transformations et graphiques.")
+    parser.add_argument('--netflix-rows', type=int, nargs='+', help="Tailles du catalogue Netflix synthétique.")
+    parser.add_argument('--whr', nargs='+', help="Tailles du panel WHR, au format ANNÉESxPAYS (ex: 5x150).")
+    parser.add_argument('--full', action='store_true', help="Toutes les échelles (jusqu'à 10M lignes et 50x5000).")
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre de répétitions par cas.")
+    parser.add_argument('--group', nargs='+', help="Groupes à exécuter (loaders, cleaning, harmonization, aggregations, figures).")
+    parser.add_argument('--filter', help="Sous-chaîne du nom des cas à exécuter.")
+    parser.add_argument('--output', help="Fichier JSON de sortie.")
+    parser.add_argument('--compare', help="Fichier JSON de référence à comparer.")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Seuil de régression (0.2 = +20 %%).")
+    args = parser.parse_args(argv)
+
+    netflix_rows = args.netflix_rows or (FULL_NETFLIX_ROWS if args.full else DEFAULT_NETFLIX_ROWS)
+    whr_scales = args.whr or (FULL_WHR_SCALES if args.full else DEFAULT_WHR_SCALES)
+    report = run_all(netflix_rows, whr_scales, args.repeat, args.group, args.filter)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRésultats écrits dans {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) au-delà de +{args.threshold:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Générateurs de Données Synthétiques pour les Benchmarks.
+
+Produit, à une échelle arbitraire, des DataFrames ayant exactement le
+schéma des datasets du projet :
+
+- `make_netflix_raw(n_rows)`       : schéma de `netflix_titles.csv` (brut).
+- `make_netflix_cleaned(n_rows)`   : schéma de `netflix_cleaned.csv` (nettoyé).
+- `make_happiness_raw(n_entities)` : les 5 fichiers annuels bruts (schémas 2015-2019).
+- `make_happiness_panel(n_years, n_entities)` : schéma du CSV harmonisé.
+
+Les valeurs sont tirées d'un générateur aléatoire à graine fixe : deux
+appels avec les mêmes paramètres produisent les mêmes données. Les
+colonnes texte sont construites par indexation dans des petits
+dictionnaires de valeurs, pour générer 10 millions de lignes en
+quelques secondes.
+"""
+
+import numpy as np
+import pandas as pd
+from utils.country_names import ISO_CODES
+from utils.happiness_harmonization import COLS_BY_YEAR
+
+SEED = 42
+
+NETFLIX_COUNTRIES = ['United States', 'India', 'United Kingdom', 'Japan', 'South Korea', 'Canada',
+                     'Spain', 'France', 'Mexico', 'Egypt', 'Turkey', 'Nigeria', 'Australia',
+                     'Taiwan', 'Brazil', 'Philippines', 'Germany', 'China', 'Indonesia', 'Argentina']
+NETFLIX_GENRES = ['Dramas', 'Comedies', 'Action & Adventure', 'Documentaries', 'International TV Shows',
+                  'Children & Family Movies', 'Crime TV Shows', 'Kids\' TV', 'Stand-Up Comedy',
+                  'Horror Movies', 'British TV Shows', 'Docuseries', 'Anime Series', 'Reality TV']
+REGIONS = ['Western Europe', 'North America', 'Australia and New Zealand', 'Middle East and Northern Africa',
+           'Latin America and Caribbean', 'Southeastern Asia', 'Central and Eastern Europe',
+           'Eastern Asia', 'Sub-Saharan Africa', 'Southern Asia']
+INDICATORS = ['Score', 'GDP_per_Capita', 'Social_Support', 'Health_Life_Expectancy',
+              'Freedom', 'Trust_Government_Corruption', 'Generosity']
+
+
+def _pick(rng, values, n_rows, p=None):
+    """Tire `n_rows` valeurs dans `values` (tableau objet construit par indexation)."""
+    values = np.asarray(values, dtype=object)
+    return values[rng.choice(len(values), size=n_rows, p=p)]
+
+def _multi_values(rng, values, n_rows, max_items=3):
+    """Construit des listes "a, b, c" (comme `country` ou `listed_in`) à partir d'un petit pool."""
+    pool_size = 500
+    combos = [', '.join(rng.choice(values, size=rng.integers(1, max_items + 1), replace=False)) for _ in range(pool_size)]
+    return _pick(rng, combos, n_rows)
+
+def _date_strings(rng, n_rows):
+    """Dates d'ajout au format "September 25, 2021", tirées parmi les jours 2008-2021."""
+    days = pd.date_range('2008-01-01', '2021-09-25', freq='D')
+    labels = np.asarray(days.strftime('%B %d, %Y'), dtype=object)
+    # Les dates récentes sont plus fréquentes (croissance du catalogue)
+    weights = np.linspace(0.1, 1.0, len(days)) ** 2
+    return labels[rng.choice(len(days), size=n_rows, p=weights / weights.sum())]
+
+
+def make_netflix_raw(n_rows, seed=SEED):
+    """Génère un catalogue brut de `n_rows` titres au schéma de `netflix_titles.csv`."""
+    rng = np.random.default_rng(seed)
+    is_movie = rng.random(n_rows) < 0.7
+    seasons = rng.geometric(0.6, size=n_rows)
+    minutes = rng.normal(100, 25, size=n_rows).clip(3, 312).astype(int)
+
+    duration = np.where(is_movie, pd.Series(minutes).astype(str) + ' min',
+                        pd.Series(seasons).astype(str) + np.where(seasons > 1, ' Seasons', ' Season'))
+    date_added = _date_strings(rng, n_rows)
+    date_added[rng.random(n_rows) < 0.001] = np.nan
+    country = _multi_values(rng, NETFLIX_COUNTRIES, n_rows)
+    country[rng.random(n_rows) < 0.09] = np.nan
+
+    return pd.DataFrame({
+        'show_id': 's' + pd.Series(np.arange(1, n_rows + 1)).astype(str),
+        'type': np.where(is_movie, 'Movie', 'TV Show'),
+        'title': 'Title ' + pd.Series(np.arange(n_rows)).astype(str),
+        'director': _pick(rng, ['Director A', 'Director B', np.nan], n_rows),
+        'cast': _pick(rng, ['Actor A, Actor B', 'Actor C', np.nan], n_rows),
+        'country': country,
+        'date_added': date_added,
+        'release_year': (2021 - rng.gamma(1.5, 4, size=n_rows)).clip(1925, 2021).astype('int64'),
+        'rating': _pick(rng, ['TV-MA', 'TV-14', 'PG-13', 'R', 'TV-PG'], n_rows),
+        'duration': duration,
+        'listed_in': _multi_values(rng, NETFLIX_GENRES, n_rows),
+        'description': _pick(rng, ['A synthetic description.'], n_rows),
+    })
+
+def make_netflix_cleaned(n_rows, seed=SEED):
+    """Génère un catalogue nettoyé de `n_rows` titres au schéma de `netflix_cleaned.csv`."""
+    rng = np.random.default_rng(seed)
+    is_movie = rng.random(n_rows) < 0.7
+    release_year = (2021 - rng.gamma(1.5, 4, size=n_rows)).clip(1925, 2021).astype('int64')
+    date_added = pd.to_datetime('2008-01-01') + pd.to_timedelta(rng.integers(0, 5000, size=n_rows), unit='D')
+    year_added = date_added.year.astype('float64')
+
+    countries = np.asarray(NETFLIX_COUNTRIES, dtype=object)
+    country_idx = rng.zipf(1.6, size=n_rows).clip(1, len(countries)) - 1
+    main_country = countries[country_idx]
+    main_country[rng.random(n_rows) < 0.09] = np.nan
+
+    return pd.DataFrame({
+        'show_id': 's' + pd.Series(np.arange(1, n_rows + 1)).astype(str),
+        'type': np.where(is_movie, 'Movie', 'TV Show'),
+        'title': 'Title ' + pd.Series(np.arange(n_rows)).astype(str),
+        'main_country': main_country,
+        'main_country_code': pd.Series(main_country).map({name: code for code, name in ISO_CODES.items()}),
+        'main_genre': _pick(rng, NETFLIX_GENRES, n_rows),
+        'release_year': release_year,
+        'date_added_feature': date_added,
+        'year_added': year_added,
+        'month_added': date_added.month.astype('float64'),
+        'added_day_of_month': date_added.day.astype('float64'),
+        'lag_time': year_added - release_year,
+        'duration_min': np.where(is_movie, rng.normal(100, 25, size=n_rows).clip(3, 312).round(), np.nan),
+        'duration_seasons': np.where(is_movie, np.nan, rng.geometric(0.6, size=n_rows).astype('float64')),
+    })
+
+
+def _entities(n_entities):
+    """Noms et codes des entités : les vrais pays d'abord, puis des entités synthétiques."""
+    real = list(ISO_CODES.items())[:n_entities]
+    codes = [code for code, _ in real] + [f"X{i:05d}" for i in range(n_entities - len(real))]
+    names = [name for _, name in real] + [f"Entity {i}" for i in range(n_entities - len(real))]
+    return np.asarray(names, dtype=object), np.asarray(codes, dtype=object)
+
+def _indicator_values(rng, n_rows):
+    """Valeurs plausibles des 7 indicateurs (Score entre 2.5 et 8, facteurs entre 0 et 1.6)."""
+    score = rng.uniform(2.5, 8, size=n_rows)
+    values = {'Score': score}
+    for col in INDICATORS[1:]:
+        values[col] = (score / 8 * rng.uniform(0.3, 1.6) + rng.normal(0, 0.1, size=n_rows)).clip(0, 2)
+    return values
+
+def make_happiness_panel(n_years=5, n_entities=158, seed=SEED):
+    """Génère un panel harmonisé de `n_entities` pays sur `n_years` années (à partir de 2015)."""
+    rng = np.random.default_rng(seed)
+    names, codes = _entities(n_entities)
+    regions = _pick(rng, REGIONS, n_entities)
+    frames = []
+    for year in range(2015, 2015 + n_years):
+        values = _indicator_values(rng, n_entities)
+        df = pd.DataFrame({'Country': names, 'Region': regions, **values})
+        df['Rank'] = df['Score'].rank(ascending=False, method='first').astype('int64')
+        df['Year'] = year
+        df['ISO_Code'] = codes
+        frames.append(df)
+    panel = pd.concat(frames, ignore_index=True)
+    return panel[['Country', 'Region', 'Rank'] + INDICATORS + ['Year', 'ISO_Code']]
+
+def make_happiness_raw(n_entities=158, seed=SEED):
+    """Génère les 5 fichiers annuels bruts (schémas réels 2015-2019) pour `n_entities` pays."""
+    rng = np.random.default_rng(seed)
+    names, _ = _entities(n_entities)
+    regions = _pick(rng, REGIONS, n_entities)
+    raw_dfs = {}
+    for year, cols in COLS_BY_YEAR.items():
+        values = _indicator_values(rng, n_entities)
+        values['Rank'] = pd.Series(values['Score']).rank(ascending=False, method='first').astype('int64').to_numpy()
+        values['Country'] = names
+        values['Region'] = regions
+        df = pd.DataFrame({raw: values[unified] for raw, unified in cols.items()})
+        # Colonnes statistiques supprimées par l'harmonisation
+        df['Dystopia Residual'] = rng.uniform(0, 3, size=n_entities)
+        raw_dfs[year] = df
+    return raw_dfs
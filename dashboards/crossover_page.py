@@ -0,0 +1,124 @@
+"""
+Module de Rendu pour le Dashboard croisé "Netflix x World Happiness".
+
+Ce script n'est pas une page autonome, mais un module. Il contient
+la fonction principale `render_crossover_dashboard()` qui est
+appelée par le routeur principal (`6_📝_Dashboard.py`) lorsque
+l'utilisateur sélectionne cette vue.
+
+Son rôle est de :
+1.  Exploiter la table croisée précalculée (`load_netflix_happiness_panel`),
+    indexée par code pays ISO-3 et par année.
+2.  Afficher les filtres de la barre latérale (année, indicateur).
+3.  Calculer et afficher les KPIs (Indicateurs Clés).
+4.  Créer et afficher les graphiques Plotly comparant la production
+    Netflix d'un pays à ses indicateurs de bonheur.
+
+Les DataFrames Netflix et Happiness ne sont jamais manipulés ici :
+seule la petite table croisée est filtrée à chaque rerun.
+"""
+
+# Importation des dépendances
+import numpy as np
+import streamlit as st
+import plotly.express as px
+from utils.chart_styles import get_happiness_layout, register_happiness_template
+from utils.pandas_helpers import WHR_INDICATORS
+
+def render_crossover_dashboard(panel_df):
+    st.header("Dashboard Netflix x World Happiness Report")
+    st.markdown("""
+    Cette section **croise** les deux datasets du projet grâce à leur dimension commune : le **pays**.
+    Pour chaque pays et chaque année (2015-2019), le nombre de productions Netflix sorties cette année-là est rapproché des indicateurs du World Happiness Report.
+    """)
+    st.divider()
+
+    CONTINUOUS_PALETTE, CATEGORICAL_PALETTE, _ = get_happiness_layout()
+    HAPPINESS_TEMPLATE = register_happiness_template()
+
+    # ===========================================================
+    # FILTRES DE LA SIDEBAR
+    # ===========================================================
+    st.sidebar.header("Filtres de la vue croisée")
+
+    all_years = panel_df.index.get_level_values('Year').unique().sort_values()
+    selected_year = st.sidebar.slider(
+        "Sélectionnez une année",
+        min_value=int(all_years.min()),
+        max_value=int(all_years.max()),
+        value=int(all_years.max()),
+        key="crossover_year"
+    )
+    selected_indicator = st.sidebar.selectbox("Indicateur de bonheur", WHR_INDICATORS, key="crossover_indicator")
+
+    # Sélection sur l'index (Year) : pas de scan des datasets d'origine
+    df_year = panel_df.xs(selected_year, level='Year').reset_index()
+    df_producers = df_year[df_year['nb_titles'] > 0]
+
+    # ===========================================================
+    # Les KPI
+    # ===========================================================
+    st.subheader(f"Indicateurs Clés pour {selected_year}")
+
+    total_titles = int(df_year['nb_titles'].sum())
+    producer_count = df_producers.shape[0]
+    corr_value = "N/A"
+    if producer_count > 2:
+        corr_value = round(np.log1p(df_producers['nb_titles']).corr(df_producers[selected_indicator]), 2)
+
+    kpi_col1, kpi_col2, kpi_col3 = st.columns(3, border=True)
+    kpi_col1.metric("Productions Netflix sorties", total_titles)
+    kpi_col2.metric("Pays producteurs", producer_count)
+    kpi_col3.metric(f"Corrélation (log titres, {selected_indicator})", corr_value)
+    st.divider()
+
+    # ===================================================================================
+    # Graphe 1 : Production vs Indicateur
+    # ===================================================================================
+    st.subheader("Production Netflix vs Bonheur")
+
+    if df_producers.empty:
+        st.warning("Aucune production Netflix n'est rattachée à un pays du World Happiness Report pour cette année.")
+    else:
+        fig_scatter = px.scatter(
+            df_producers,
+            x='nb_titles',
+            y=selected_indicator,
+            color='Region',
+            size='nb_titles',
+            hover_name='Country',
+            hover_data={'nb_movies': True, 'nb_tv_shows': True},
+            log_x=True,
+            title=f'Productions Netflix vs {selected_indicator} en {selected_year}',
+            labels={'nb_titles': 'Nombre de productions (échelle log)', 'nb_movies': 'Films', 'nb_tv_shows': 'Séries'},
+            template=HAPPINESS_TEMPLATE
+        )
+        fig_scatter.update_layout(title_y=0.95, title_yanchor='top', legend_title_text='')
+        st.plotly_chart(fig_scatter, width="stretch")
+
+    # ===================================================================================
+    # Graphe 2 : Carte de la production
+    # ===================================================================================
+    fig_map = px.choropleth(
+        df_year,
+        locations='ISO_Code',
+        locationmode='ISO-3',
+        color=np.log1p(df_year['nb_titles']),
+        hover_name='Country',
+        hover_data={'nb_titles': True, selected_indicator: ':.2f', 'ISO_Code': False},
+        color_continuous_scale=CONTINUOUS_PALETTE,
+        title=f'Productions Netflix par pays en {selected_year}',
+        labels={'color': 'log(1 + titres)', 'nb_titles': 'Productions'},
+        template=HAPPINESS_TEMPLATE
+    )
+    fig_map.update_layout(geo=dict(showframe=False, showcoastlines=False, projection_type='natural earth'))
+    st.plotly_chart(fig_map, width="stretch")
+
+    with st.expander("🔍 Lire l'analyse"):
+        st.markdown("""
+        ### 📈 Analyse : Production audiovisuelle et Bonheur
+
+        * **Échelle logarithmique :** La production Netflix est extrêmement concentrée (États-Unis, Inde, Royaume-Uni...). L'échelle log permet de comparer les petits producteurs entre eux.
+        * **Lecture :** Une corrélation positive indique que les pays qui produisent davantage pour Netflix ont, en moyenne, un indicateur plus élevé. Il s'agit d'une **corrélation**, pas d'une causalité : la richesse (`GDP_per_Capita`) explique à la fois une industrie audiovisuelle développée et un score de bonheur élevé.
+        * **Pays absents :** Les pays sans production Netflix pour l'année choisie n'apparaissent pas dans le nuage de points, mais restent visibles (en bas de l'échelle) sur la carte.
+        """)
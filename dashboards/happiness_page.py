@@ -8,61 +8,210 @@ l'utilisateur sélectionne ce dataset.
 
 Son rôle est de :
 1.  Construire l'intégralité de l'interface du dashboard Happiness.
-2.  Afficher les filtres de la barre latérale (sidebar)
-    spécifiques à ce dataset (ex: sliders, multiselects).
+2.  Afficher le filtre global de la barre latérale (année) et,
+    dans chaque section, ses propres filtres (selectbox, multiselect).
 3.  Calculer et afficher les KPIs (Indicateurs Clés).
 4.  Créer et afficher tous les graphiques interactifs Plotly
     (Choropleth, Scatter, Line, Bar Race).
+
+Chaque section est une fonction `render_*`. Celles qui possèdent des
+widgets sont des fragments (`st.fragment`) : changer la variable de la
+courbe ou les pays comparés ne relance que la courbe, sans reconstruire
+la carte, le nuage de points, la heatmap ni le Top & Flop. Seul le
+curseur d'année (barre latérale) relance tout le dashboard : les figures
+qui n'en dépendent pas (courbe, heatmap, Top & Flop) sont alors relues
+depuis le cache (`cached_data`) au lieu d'être reconstruites.
 """
 
 # Importation des dépendances
 import pandas as pd
 import streamlit as st
 import plotly.express as px
-from utils.chart_styles import get_happiness_layout
+from utils.chart_styles import (get_happiness_layout, register_happiness_template, get_render_mode,
+                                downsample_points, aggregate_line_points, compact_figure)
 from utils.pandas_helpers import get_extremes_by_year
+from utils.profiling import span
+from utils.cache_registry import cached_data
+
+# ===========================================================
+# DÉFINITION DE LA CHARTE GRAPHIQUE
+# ===========================================================
+CONTINUOUS_PALETTE, CATEGORICAL_PALETTE, _ = get_happiness_layout()
+# Template nommé (enregistré une seule fois par processus) référencé par chaque figure
+HAPPINESS_TEMPLATE = register_happiness_template()
+
+# Valeurs par défaut des widgets (reprises par le préchauffage des caches)
+DEFAULT_VARIABLE = "Score"
+DEFAULT_LINE_COUNTRIES = ["France", "Germany", "United States", "Japan", "India"]
+
+# ==========================================================
+# FONCTIONS DE CRÉATION DE GRAPHIQUES
+# ==========================================================
+
+@cached_data(max_entries=2, disk=True)
+def get_corr_matrix(df):
+    """Calcule et met en cache la matrice de corrélation des facteurs du bonheur."""
+    numeric_cols = ['Score', 'GDP_per_Capita', 'Social_Support', 'Health_Life_Expectancy', 'Freedom', 'Trust_Government_Corruption', 'Generosity']
+    return df[numeric_cols].corr()
+
+def create_map_figure(df_year, variable, selected_year, range_color):
+    """Crée et retourne la carte choroplèthe d'une variable pour une année."""
+    fig_map = px.choropleth(
+        df_year, 
+        locations='ISO_Code',
+        locationmode='ISO-3', 
+        color=variable, 
+        hover_name='Country',
+        hover_data={'Region': True, 'Rank': True, 'GDP_per_Capita': ':.2f', 'Year': True, 'Country': False, 'ISO_Code': False},
+        color_continuous_scale=CONTINUOUS_PALETTE,
+        range_color = range_color, 
+        title=f'Carte : {variable} en {selected_year}',
+        template=HAPPINESS_TEMPLATE
+    )
+    fig_map.update_layout(geo=dict(showframe=False, showcoastlines=False, projection_type='natural earth'))
+    return compact_figure(fig_map)
 
-def render_happiness_dashboard(world_happiness_df):
-    st.header("Dashboard World Happiness Report")
-    st.markdown("""
-    Cette section propose une exploration **interactive** des facteurs du bonheur mondial, en utilisant la bibliothèque **Plotly Express**.  
-    L'objectif est d'utiliser des visualisations dynamiques pour explorer les données.  
-    **Passez votre souris** sur les graphiques pour afficher les détails, **zoomez** sur les cartes, et **regardez les animations** (bar chart race) pour comprendre les tendances.
-    """)
-    st.divider()
-
-    # ===========================================================
-    # DÉFINITION DE LA CHARTE GRAPHIQUE
-    # ===========================================================
-    CONTINUOUS_PALETTE, CATEGORICAL_PALETTE, GLOBAL_TEMPLATE_LAYOUT = get_happiness_layout()
-
-    # ===========================================================
-    # FILTRE GLOBAL
-    # ===========================================================
-    st.sidebar.header("Filtres Globaux")
+def create_scatter_figure(df_year, selected_year, range_x, range_y):
+    """
+    Crée et retourne le nuage de points Bonheur vs PIB pour une année.
 
-    # Filtre unique pour contrôler les KPIs, la Carte et le Nuage de points.
-    all_years = world_happiness_df["Year"].unique()
-    all_years.sort() 
-    selected_year = st.sidebar.slider(
-        "Sélectionnez une année",
-        min_value=int(all_years.min()),
-        max_value=int(all_years.max()),
-        value=int(all_years.max())
+    Au-delà de quelques milliers de points (données infranationales...), le
+    nuage est échantillonné par région et tracé en WebGL.
+    """
+    df_plot = downsample_points(df_year, by='Region')
+    fig_scatter = px.scatter(
+        df_plot,
+        x='GDP_per_Capita',
+        y='Score',
+        color="Region", 
+        size='Social_Support', 
+        hover_name='Country', 
+        range_x = range_x,
+        range_y = range_y,
+        title = f'Bonheur vs. PIB en {selected_year}',
+        labels = {'GDP_per_Capita': 'PIB par Habitant', 'Score': 'Score de Bonheur'},
+        render_mode = get_render_mode(len(df_plot)),
+        template = HAPPINESS_TEMPLATE
     )
+    # Plotly Express nomme la légende d'après `color` : la charte la masque
+    fig_scatter.update_layout(title_y=0.95, title_yanchor='top', legend_title_text='')
+    return compact_figure(fig_scatter)
+
+@cached_data(max_entries=16, disk=True)
+def create_line_figure(df_line, variable):
+    """
+    Crée et retourne la courbe d'évolution d'une variable pour les pays sélectionnés.
+
+    Les séries trop longues sont agrégées côté serveur et tracées en WebGL.
+    """
+    df_plot = aggregate_line_points(df_line, 'Year', variable, 'Country')
+    fig_line = px.line(
+        df_plot, 
+        x='Year', 
+        y=variable, 
+        color='Country', 
+        markers=True, 
+        hover_name='Country',
+        title=f'Évolution de : {variable} (2015-2019)',
+        labels={'Year': 'Année'},
+        render_mode=get_render_mode(len(df_plot)),
+        template=HAPPINESS_TEMPLATE
+    )
+    fig_line.update_layout(title_y=0.9, title_yanchor='top', legend_title_text='')
+    return compact_figure(fig_line)
 
-    # Filtrage du DataFrame basé sur le filtre unifié
-    df_filtered_year = world_happiness_df[world_happiness_df['Year'] == selected_year]
-
-    # ===========================================================
-    # Les KPI
-    # ===========================================================
+@cached_data(max_entries=2, disk=True)
+def create_corr_heatmap_figure(corr_matrix):
+    """Crée et retourne la heatmap de la matrice de corrélation."""
+    fig_heatmap = px.imshow(
+        img = corr_matrix, 
+        x = corr_matrix.columns, 
+        y = corr_matrix.index, 
+        color_continuous_scale = 'RdBu', 
+        color_continuous_midpoint = 0, 
+        zmin = -1, zmax = 1, 
+        text_auto = True, 
+        aspect = "auto", 
+        title = 'Matrice de Corrélation des Facteurs du Bonheur',
+        template = HAPPINESS_TEMPLATE
+    )
+    fig_heatmap.update_traces(texttemplate="%{z:.2f}")
+    fig_heatmap.update_layout(title_y=0.95, title_yanchor='top')
+    return compact_figure(fig_heatmap)
+
+@cached_data(max_entries=16, disk=True)
+def create_race_figure(extremes_df, variable, title_prefix):
+    """Crée et retourne le "Bar Chart Race" (Top 10 ou Flop 10) d'une variable."""
+    # Échelle
+    max_x = extremes_df[variable].max() * 1.05
+    min_x = extremes_df[variable].min() * 0.9 # Pour ne pas commencer à 0
+    if min_x < 0: min_x = 0 # Sauf si les valeurs sont négatives
+
+    fig_race = px.bar(
+        extremes_df,
+        x=variable, y='Country', orientation='h',
+        animation_frame='Year', animation_group='Country',
+        color='Region', hover_name='Country',
+        range_x=[min_x, max_x],
+        title=f'{title_prefix} : {variable} (2015-2019)',
+        labels={'Country':'Pays'},
+        template=HAPPINESS_TEMPLATE
+    )
+    fig_race.update_layout(yaxis_categoryorder='total ascending', title_y=0.95, title_yanchor='top', legend_title_text='')
+    return compact_figure(fig_race)
+
+# ==========================================================
+# FIGURES D'UN ÉTAT DU DASHBOARD
+# ==========================================================
+# Utilisées par les sections et par le préchauffage (`dashboards/warmup.py`) :
+# mêmes arguments, donc mêmes clés de cache.
+
+def get_map_figure(world_happiness_df, df_filtered_year, variable, selected_year):
+    """Carte d'une variable, avec une échelle de couleurs calculée sur le DF COMPLET."""
+    global_min_val = world_happiness_df[variable].min()
+    global_max_val = world_happiness_df[variable].max()
+    return create_map_figure(df_filtered_year, variable, selected_year, [global_min_val, global_max_val])
+
+def get_scatter_figure(world_happiness_df, df_filtered_year, selected_year):
+    """Nuage de points d'une année, avec des axes calculés sur le DF COMPLET."""
+    global_min_gdp = world_happiness_df['GDP_per_Capita'].min() * 0.9
+    global_max_gdp = world_happiness_df['GDP_per_Capita'].max() * 1.05
+    global_min_score = world_happiness_df['Score'].min() * 0.9
+    global_max_score = world_happiness_df['Score'].max() * 1.05
+    return create_scatter_figure(df_filtered_year, selected_year, [global_min_gdp, global_max_gdp], [global_min_score, global_max_score])
+
+def get_line_figure(world_happiness_df, countries, variable):
+    """Courbe d'évolution d'une variable pour les pays `countries`."""
+    df_line_filtered = world_happiness_df[world_happiness_df['Country'].isin(countries)]
+    return create_line_figure(df_line_filtered, variable)
+
+def get_heatmap_figure(world_happiness_df):
+    """Heatmap des corrélations (toutes années confondues)."""
+    return create_corr_heatmap_figure(get_corr_matrix(world_happiness_df))
+
+def get_race_figures(world_happiness_df, variable):
+    """"Bar Chart Race" Top 10 et Flop 10 d'une variable."""
+    with span("happiness.race.extremes"):
+        top_10_final = get_extremes_by_year(world_happiness_df, variable, ascending=False)
+        flop_10_final = get_extremes_by_year(world_happiness_df, variable, ascending=True)
+    return create_race_figure(top_10_final, variable, 'Top 10'), create_race_figure(flop_10_final, variable, 'Flop 10')
+
+# ==========================================================
+# SECTIONS DU DASHBOARD
+# ==========================================================
+# Une section qui possède ses propres widgets est un fragment (`st.fragment`) :
+# modifier l'un d'eux ne relance que cette section, pas le script entier.
+
+def render_kpis(df_filtered_year, selected_year):
+    """Affiche les KPIs de l'année sélectionnée."""
     st.subheader(f"Indicateurs Clés pour {selected_year}")
     
-    avg_score = round(df_filtered_year['Score'].mean(), 2)
-    avg_gdp = round(df_filtered_year['GDP_per_Capita'].mean(), 2)
-    avg_health = round(df_filtered_year['Health_Life_Expectancy'].mean(), 2)
-    country_count = df_filtered_year['Country'].nunique()
+    with span("happiness.kpis"):
+        # Moyennes float32 converties en float : l'arrondi s'affiche 5.38, pas 5.380000114
+        avg_score = round(float(df_filtered_year['Score'].mean()), 2)
+        avg_gdp = round(float(df_filtered_year['GDP_per_Capita'].mean()), 2)
+        avg_health = round(float(df_filtered_year['Health_Life_Expectancy'].mean()), 2)
+        country_count = df_filtered_year['Country'].nunique()
 
     # Affichage avec st.columns
     kpi_col1, kpi_col2, kpi_col3, kpi_col4 = st.columns(4, border=True)
@@ -70,37 +219,24 @@ def render_happiness_dashboard(world_happiness_df):
     kpi_col2.metric("PIB par Hab. (Moy.)", avg_gdp)
     kpi_col3.metric("Espérance de Vie (Moy.)", avg_health)
     kpi_col4.metric("Nombre de Pays", country_count)
-    st.divider()
 
-    # ===================================================================================
-    # Graphe 1 : Carte mondiale
-    # ===================================================================================
+@st.fragment
+def render_map_section(world_happiness_df, df_filtered_year, selected_year):
+    """Affiche la carte choroplèthe et son sélecteur de variable (fragment)."""
     st.subheader("Analyse Géographique")
     
-    st.sidebar.subheader("Filtres de la Carte")
+    # Filtre propre à la carte (dans le fragment : ne relance que la carte)
+    col_filter, _ = st.columns([1, 2])
     map_list = ["Score", "GDP_per_Capita", "Social_Support", "Health_Life_Expectancy", "Freedom", "Trust_Government_Corruption", "Generosity"]
-    select_box_variable_map = st.sidebar.selectbox("Choisissez une variable pour la carte", map_list)
+    select_box_variable_map = col_filter.selectbox("Choisissez une variable pour la carte", map_list)
 
     # Échelle (range_color) calculée sur le DF COMPLET
-    global_min_val = world_happiness_df[select_box_variable_map].min()
-    global_max_val = world_happiness_df[select_box_variable_map].max()
-
-    fig_map = px.choropleth(
-        df_filtered_year, 
-        locations='Country',
-        locationmode='country names', 
-        color=select_box_variable_map, 
-        hover_name='Country',
-        hover_data={'Region': True, 'Rank': True, 'GDP_per_Capita': ':.2f', 'Year': True, 'Country': False},
-        color_continuous_scale=CONTINUOUS_PALETTE,
-        range_color = [global_min_val, global_max_val], 
-        title=f'Carte : {select_box_variable_map} en {selected_year}'
-    )
-    fig_map.update_layout(GLOBAL_TEMPLATE_LAYOUT)
-    fig_map.update_layout(geo=dict(showframe=False, showcoastlines=False, projection_type='natural earth'))
+    with span("happiness.map.build"):
+        fig_map = get_map_figure(world_happiness_df, df_filtered_year, select_box_variable_map, selected_year)
     
     # Affichage
-    st.plotly_chart(fig_map, use_container_width=True)
+    with span("happiness.map.render"):
+        st.plotly_chart(fig_map, use_container_width=True)
     
     with st.expander("🔍 Lire l'analyse de la carte"):
         st.markdown("""
@@ -110,7 +246,7 @@ def render_happiness_dashboard(world_happiness_df):
 
         **Comment l'utiliser ?**
 
-        1.  **Sélecteur de Variable :** Utilisez le `selectbox` "Choisissez une variable" dans la barre latérale pour changer la métrique affichée (ex: "Score" de bonheur, "GDP_per_Capita", "Health_Life_Expectancy").
+        1.  **Sélecteur de Variable :** Utilisez le `selectbox` "Choisissez une variable" au-dessus de la carte pour changer la métrique affichée (ex: "Score" de bonheur, "GDP_per_Capita", "Health_Life_Expectancy").
         2.  **Sélecteur d'Année :** Utilisez le `slider` "Sélectionnez une année" pour figer la carte sur une année précise.
         3.  **Interactivité :** Passez votre souris sur un pays pour voir ses détails. Zoomez et déplacez-vous sur la carte pour explorer des régions spécifiques.
 
@@ -122,35 +258,17 @@ def render_happiness_dashboard(world_happiness_df):
 
         *Note : Le code fixe l'échelle de couleur (`range_color`) en fonction de la sélection, garantissant que les comparaisons entre les années (en bougeant le slider) sont visuellement justes.*
    """)
-    st.divider()
 
-    # ===================================================================================
-    # Graphe 2 : Nuage de points
-    # ===================================================================================
+def render_scatter_section(world_happiness_df, df_filtered_year, selected_year):
+    """Affiche le nuage de points Bonheur vs PIB de l'année sélectionnée."""
     st.subheader("Analyse des Facteurs : Bonheur vs PIB")
 
     # Échelle calculée sur le DF COMPLET
-    global_min_gdp = world_happiness_df['GDP_per_Capita'].min() * 0.9
-    global_max_gdp = world_happiness_df['GDP_per_Capita'].max() * 1.05
-    global_min_score = world_happiness_df['Score'].min() * 0.9
-    global_max_score = world_happiness_df['Score'].max() * 1.05
-
-    fig_scatter = px.scatter(
-        df_filtered_year,
-        x='GDP_per_Capita',
-        y='Score',
-        color="Region", 
-        size='Social_Support', 
-        hover_name='Country', 
-        range_x = [global_min_gdp, global_max_gdp],
-        range_y = [global_min_score, global_max_score],
-        title = f'Bonheur vs. PIB en {selected_year}',
-        labels = {'GDP_per_Capita': 'PIB par Habitant', 'Score': 'Score de Bonheur'}
-    )
-    fig_scatter.update_layout(GLOBAL_TEMPLATE_LAYOUT)
-    fig_scatter.update_layout(title_x=0.5, title_y=0.95, title_yanchor='top')
+    with span("happiness.scatter.build"):
+        fig_scatter = get_scatter_figure(world_happiness_df, df_filtered_year, selected_year)
 
-    st.plotly_chart(fig_scatter, use_container_width=True)
+    with span("happiness.scatter.render"):
+        st.plotly_chart(fig_scatter, use_container_width=True)
     with st.expander("🔍 Lire l'analyse du nuage de points"):
         st.markdown("""
         ### 📈 Analyse : La Relation entre Richesse et Bonheur
@@ -174,42 +292,31 @@ def render_happiness_dashboard(world_happiness_df):
         * **L'argent ne fait pas tout (L'importance de la Taille) :** Regardez les pays qui ont un PIB *similaire* (sur la même ligne verticale). Certains ont de **grosses bulles** (fort soutien social) et sont plus heureux, tandis que d'autres ont de **petites bulles** (faible soutien social) et sont moins heureux.
         * **Conclusion :** Le bonheur repose sur un triptyque : **Richesse** (PIB), **Santé** (vu sur la heatmap) et **Communauté** (Soutien Social, la taille des bulles). Un pays riche avec des liens sociaux faibles sera moins heureux qu'un pays riche avec des liens sociaux forts.
     """)
-    st.divider()
 
-    # ===================================================================================
-    # Graphe 3 : Line
-    # ===================================================================================
+@st.fragment
+def render_line_section(world_happiness_df):
+    """Affiche la comparaison temporelle des pays et ses sélecteurs (fragment)."""
     st.subheader("Analyse Temporelle (Comparaison de Pays)")
     
-    st.sidebar.subheader("Filtres de la Courbe")
+    # Filtres propres à la courbe (dans le fragment : ne relancent que la courbe)
+    col_variable, col_countries = st.columns([1, 2])
     map_list_line = ["Score", "GDP_per_Capita", "Social_Support", "Health_Life_Expectancy", "Freedom", "Trust_Government_Corruption", "Generosity"]
-    select_box_variable_line = st.sidebar.selectbox("Choisissez une variable", map_list_line, key="Line")
+    select_box_variable_line = col_variable.selectbox("Choisissez une variable", map_list_line, key="Line")
     
-    all_countries = world_happiness_df['Country'].unique()
-    all_countries.sort()
-    selected_countries = st.sidebar.multiselect(
+    all_countries = sorted(world_happiness_df['Country'].unique())
+    selected_countries = col_countries.multiselect(
         "Sélectionnez des pays à comparer",
         options=all_countries,
-        default=["France", "Germany", "United States", "Japan", "India"], max_selections=10
+        default=DEFAULT_LINE_COUNTRIES, max_selections=10
     )
 
     if not selected_countries:
-        st.warning("Veuillez sélectionner au moins un pays dans la barre latérale pour afficher le graphique.")
+        st.warning("Veuillez sélectionner au moins un pays ci-dessus pour afficher le graphique.")
     else:
-        df_line_filtered = world_happiness_df[world_happiness_df['Country'].isin(selected_countries)]
-        fig_line = px.line(
-            df_line_filtered, 
-            x='Year', 
-            y=select_box_variable_line, 
-            color='Country', 
-            markers=True, 
-            hover_name='Country',
-            title=f'Évolution de : {select_box_variable_line} (2015-2019)',
-            labels={'Year': 'Année'}
-        )
-        fig_line.update_layout(GLOBAL_TEMPLATE_LAYOUT)
-        fig_line.update_layout(title_x=0.5, title_y=0.9, title_yanchor='top')
-        st.plotly_chart(fig_line, use_container_width=True)
+        with span("happiness.line.build"):
+            fig_line = get_line_figure(world_happiness_df, selected_countries, select_box_variable_line)
+        with span("happiness.line.render"):
+            st.plotly_chart(fig_line, use_container_width=True)
     
     with st.expander("🔍 Lire l'analyse de la courbe"):
         st.markdown("""
@@ -229,36 +336,16 @@ def render_happiness_dashboard(world_happiness_df):
         * **Le Classement change peu :** Les hiérarchies sont bien établies. Si vous sélectionnez (par exemple) la Suisse, la France et l'Inde, vous verrez que leurs lignes restent largement parallèles sans jamais se croiser. Un pays "riche" reste "riche" et un pays "pauvre" reste "pauvre" sur cette courte période de 5 ans.
         * **Absence de Crise (sur cette période) :** Les données s'arrêtant en 2019, nous ne voyons pas l'impact d'événements mondiaux majeurs (comme le COVID-19 en 2020) qui auraient pu provoquer des chutes brutales.
         * **Cas Particuliers :** C'est l'outil parfait pour repérer des anomalies. Y a-t-il un pays dont le score de "Confiance dans le Gouvernement" (`Trust_Government_Corruption`) chute soudainement une année ?""")
-    st.divider()
 
-    # ===================================================================================
-    # Graphe 4 : Heatmap
-    # ===================================================================================
+def render_heatmap_section(world_happiness_df):
+    """Affiche la heatmap des corrélations (toutes années confondues)."""
     st.subheader("Analyse des Corrélations (toutes années confondues)")
     
-    @st.cache_data
-    def get_corr_matrix(df):
-        numeric_cols = ['Score', 'GDP_per_Capita', 'Social_Support', 'Health_Life_Expectancy', 'Freedom', 'Trust_Government_Corruption', 'Generosity']
-        return df[numeric_cols].corr()
-
-    corr_matrix = get_corr_matrix(world_happiness_df)
-
-    fig_heatmap = px.imshow(
-        img = corr_matrix, 
-        x = corr_matrix.columns, 
-        y = corr_matrix.index, 
-        color_continuous_scale = 'RdBu', 
-        color_continuous_midpoint = 0, 
-        zmin = -1, zmax = 1, 
-        text_auto = True, 
-        aspect = "auto", 
-        title = 'Matrice de Corrélation des Facteurs du Bonheur'
-    )
-    fig_heatmap.update_traces(texttemplate="%{z:.2f}")
-    fig_heatmap.update_layout(GLOBAL_TEMPLATE_LAYOUT)
-    fig_heatmap.update_layout(title_x=0.5, title_y=0.95, title_yanchor='top')
+    with span("happiness.heatmap.build"):
+        fig_heatmap = get_heatmap_figure(world_happiness_df)
 
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+    with span("happiness.heatmap.render"):
+        st.plotly_chart(fig_heatmap, use_container_width=True)
     with st.expander("🔍 Lire l'analyse de la heatmap"):
         st.markdown("""
         ### 📈 Analyse : Quels facteurs sont les plus importants ?
@@ -291,61 +378,26 @@ def render_happiness_dashboard(world_happiness_df):
 
         Remarquez aussi que les facteurs du triptyque sont eux-mêmes corrélés (ex: `GDP_per_Capita` et `Health_Life_Expectancy` sont rouge vif). Cela montre un cercle vertueux : les pays riches ont tendance à avoir de meilleurs systèmes de santé, ce qui contribue au bonheur.
     """)
-    st.divider()
 
-    # ===================================================================================
-    # Graphe 5 : Top 10 et Flop 10 (Bar Chart Race)
-    # ===================================================================================
+@st.fragment
+def render_race_section(world_happiness_df):
+    """Affiche les "Bar Chart Race" Top 10 et Flop 10 et leur sélecteur de variable (fragment)."""
     st.subheader("Top & Flop 10 (Bar Chart Race)")
 
-    st.sidebar.subheader("Filtres Top & Flop")
+    # Filtre propre au Top & Flop (dans le fragment : ne relance que les deux graphiques)
+    col_filter, _ = st.columns([1, 2])
     map_list_race = ["Score", "GDP_per_Capita", "Social_Support", "Health_Life_Expectancy", "Freedom", "Trust_Government_Corruption", "Generosity"]
-    select_box_variable_race = st.sidebar.selectbox("Choisissez une variable", map_list_race, key="Race")
+    select_box_variable_race = col_filter.selectbox("Choisissez une variable", map_list_race, key="Race")
 
-    # --- Préparation des données  ---
-    top_10_final = get_extremes_by_year(world_happiness_df, select_box_variable_race, ascending=False)
-    flop_10_final = get_extremes_by_year(world_happiness_df, select_box_variable_race, ascending=True)
-    
     # --- Création des graphiques ---
-    
-    # Échelle Top 10
-    max_top = top_10_final[select_box_variable_race].max() * 1.05
-    min_top = top_10_final[select_box_variable_race].min() * 0.9 # Pour ne pas commencer à 0
-    if min_top < 0: min_top = 0 # Sauf si les valeurs sont négatives
-
-    fig_top = px.bar(
-        top_10_final,
-        x=select_box_variable_race, y='Country', orientation='h',
-        animation_frame='Year', animation_group='Country',
-        color='Region', hover_name='Country',
-        range_x=[min_top, max_top],
-        title=f'Top 10 : {select_box_variable_race} (2015-2019)',
-        labels={'Country':'Pays'}
-    )
-    fig_top.update_layout(GLOBAL_TEMPLATE_LAYOUT, yaxis_categoryorder='total ascending')
-    fig_top.update_layout(title_x=0.5, title_y=0.95, title_yanchor='top')
-
-    # Échelle Flop 10
-    max_flop = flop_10_final[select_box_variable_race].max() * 1.05
-    min_flop = flop_10_final[select_box_variable_race].min() * 0.9
-    if min_flop < 0: min_flop = 0
-
-    fig_flop = px.bar(
-        flop_10_final,
-        x=select_box_variable_race, y='Country', orientation='h',
-        animation_frame='Year', animation_group='Country',
-        color='Region', hover_name='Country',
-        range_x=[min_flop, max_flop],
-        title=f'Flop 10 : {select_box_variable_race} (2015-2019)',
-        labels={'Country':'Pays'}
-    )
-    fig_flop.update_layout(GLOBAL_TEMPLATE_LAYOUT, yaxis_categoryorder='total ascending')
-    fig_flop.update_layout(title_x=0.5, title_y=0.95, title_yanchor='top')
+    with span("happiness.race.build"):
+        fig_top, fig_flop = get_race_figures(world_happiness_df, select_box_variable_race)
 
     col_top_flop_1, col_top_flop_2 = st.columns(2, gap="medium")
 
     with col_top_flop_1:
-        st.plotly_chart(fig_top, use_container_width=True)
+        with span("happiness.race.render"):
+            st.plotly_chart(fig_top, use_container_width=True)
         with st.expander("🔍 Lire l'analyse du Top 10"):
             st.markdown("""
             ### 📈 Analyse : Le "Bar Chart Race" du Top 10
@@ -363,7 +415,8 @@ def render_happiness_dashboard(world_happiness_df):
             * **La "Race" :** Le `yaxis_categoryorder='total ascending'` (le code qui fait la "race") montre qu'il est très difficile d'entrer dans ce Top 10, et tout aussi difficile d'en sortir. C'est la visualisation d'une **stabilité structurelle** (économies solides, systèmes de santé robustes, confiance élevée).""")
 
     with col_top_flop_2:
-        st.plotly_chart(fig_flop, use_container_width=True) 
+        with span("happiness.race.render"):
+            st.plotly_chart(fig_flop, use_container_width=True)
         with st.expander("🔍 Lire l'analyse du Flop 10"):
             st.markdown("""
             ### 📉 Analyse : Le "Bar Chart Race" du Flop 10
@@ -378,4 +431,51 @@ def render_happiness_dashboard(world_happiness_df):
             * **La Concentration de la Difficulté :** Le constat est tragique et immédiat. Regardez les couleurs (`color='Region'`) : le Flop 10 est dominé de manière écrasante par une seule région, **"Sub-Saharan Africa"**.
             * **La "Trappe" :** Contrairement au Top 10, les barres sont toutes écrasées à gauche, montrant un "effet de plancher". Si vous choisissez "GDP_per_Capita", vous visualisez la **"trappe de pauvreté"** : les pays ont du mal à décoller.
             * **L'Impact des Conflits :** Selon la variable, vous verrez apparaître des pays d'autres régions, souvent en raison de conflits ou de crises graves (ex: Syrie, Afghanistan, Yémen, Venezuela) qui détruisent le `Social_Support` et la `Health_Life_Expectancy`.
-            * **La "Volatilité" :** Le "Flop 10" est souvent plus volatile que le "Top 10", non pas à cause d'une amélioration, mais parce qu'un pays s'effondre encore plus vite qu'un autre.""")
\ No newline at end of file
+            * **La "Volatilité" :** Le "Flop 10" est souvent plus volatile que le "Top 10", non pas à cause d'une amélioration, mais parce qu'un pays s'effondre encore plus vite qu'un autre.""")
+
+# ==========================================================
+# FONCTION DE RENDU PRINCIPALE
+# ==========================================================
+
+def render_happiness_dashboard(world_happiness_df):
+    st.header("Dashboard World Happiness Report")
+    st.markdown("""
+    Cette section propose une exploration **interactive** des facteurs du bonheur mondial, en utilisant la bibliothèque **Plotly Express**.  
+    L'objectif est d'utiliser des visualisations dynamiques pour explorer les données.  
+    **Passez votre souris** sur les graphiques pour afficher les détails, **zoomez** sur les cartes, et **regardez les animations** (bar chart race) pour comprendre les tendances.
+    """)
+    st.divider()
+
+    # ===========================================================
+    # FILTRE GLOBAL
+    # ===========================================================
+    st.sidebar.header("Filtres Globaux")
+
+    # Filtre unique pour contrôler les KPIs, la Carte et le Nuage de points.
+    all_years = world_happiness_df["Year"].unique()
+    all_years.sort() 
+    selected_year = st.sidebar.slider(
+        "Sélectionnez une année",
+        min_value=int(all_years.min()),
+        max_value=int(all_years.max()),
+        value=int(all_years.max())
+    )
+
+    # Filtrage du DataFrame basé sur le filtre unifié
+    with span("happiness.filter"):
+        df_filtered_year = world_happiness_df[world_happiness_df['Year'] == selected_year]
+
+    # ===========================================================
+    # SECTIONS (KPIs, Carte, Nuage de points, Courbe, Heatmap, Top & Flop)
+    # ===========================================================
+    render_kpis(df_filtered_year, selected_year)
+    st.divider()
+    render_map_section(world_happiness_df, df_filtered_year, selected_year)
+    st.divider()
+    render_scatter_section(world_happiness_df, df_filtered_year, selected_year)
+    st.divider()
+    render_line_section(world_happiness_df)
+    st.divider()
+    render_heatmap_section(world_happiness_df)
+    st.divider()
+    render_race_section(world_happiness_df)
@@ -9,36 +9,136 @@ l'utilisateur sélectionne ce dataset.
 Son rôle est de :
 1.  Construire l'intégralité de l'interface du dashboard Netflix.
 2.  Appliquer la charte graphique `Seaborn` (`setup_netflix_theme`).
-3.  Afficher les filtres de la barre latérale (sidebar)
-    spécifiques à ce dataset (ex: sliders, selectbox).
+3.  Afficher les filtres combinés de la barre latérale (sidebar) et,
+    dans leurs sections, les filtres du Top N et de l'histogramme.
 4.  Calculer et afficher les KPIs (Indicateurs Clés).
 5.  Créer (et mettre en cache) tous les graphiques statiques `Seaborn`
     (countplot, barplot, heatmap, etc.).
+
+L'histogramme et le Top N ne relisent pas le catalogue à chaque valeur
+de slider : les comptes par année et le classement des pays sont calculés
+une seule fois (par type), puis simplement regroupés ou tronqués ; la
+courbe de densité est calculée une fois sur une grille fixe. Les figures
+rendues restent bornées (cache LRU, `max_entries`).
+
+Les filtres de la barre latérale (type, pays, genre, années de sortie et
+d'ajout) sont résolus par l'index bitmap du catalogue
+(`utils/bitmap_index.py`) : KPIs et comptes sont calculés sur les numéros
+de lignes retenues, sans construire de DataFrame filtré. Avec le backend
+DuckDB (`utils/sql_backend.py`, optionnel), le catalogue n'est pas chargé
+dans pandas : les mêmes fonctions sont résolues par des requêtes SQL
+(`get_query_engine`).
+
+Chaque constructeur de graphique ne reçoit que des données agrégées : il
+peut ainsi être exécuté dans un pool de processus (`utils/render_pool.py`,
+backend optionnel), les images d'un rerun étant alors rendues en parallèle.
 """
 
 # Importation des dépendances
 import streamlit as st
-import matplotlib.pyplot as plt 
 import seaborn as sns
 import pandas as pd 
-from utils.chart_styles import setup_netflix_theme
+from matplotlib.artist import setp
+from utils.chart_styles import setup_netflix_theme, new_figure, figure_to_png
+from utils.profiling import span
+from utils.cache_registry import cached_data
+from utils.render_pool import pooled, render_charts
+from utils.pandas_helpers import binned_kde, get_duration_box_stats
+from utils import bitmap_index, sql_backend
 
 # =============================================================================
 # --- CHARTE GRAPHIQUE ---
 main_palette, binary_palette, heatmap_cmap, LIGHT_GREY, DARK_GREY, NETFLIX_BLACK, NETFLIX_RED = setup_netflix_theme()
 
+# Options et valeurs par défaut des widgets (reprises par le préchauffage des caches)
+TYPE_OPTIONS = ["Tous", "Movie", "TV Show"]
+HIST_VARIABLES = ["release_year", "year_added"]
+DEFAULT_TOP_N = 10
+DEFAULT_BINS = 30
+
+# ==========================================================
+# STATISTIQUES (INDEX BITMAP OU SQL, ET CACHE)
+# ==========================================================
+
+def get_query_engine(netflix_index):
+    """
+    Module qui résout les filtres et les comptes de `netflix_index` :
+    `sql_backend` pour un catalogue DuckDB, `bitmap_index` sinon
+    (mêmes fonctions, mêmes résultats).
+    """
+    return sql_backend if netflix_index.get('engine') == 'duckdb' else bitmap_index
+
+def get_kpis(netflix_df, netflix_index, rows):
+    """
+    Calcule les KPIs des lignes `rows` : nombre de titres, délai moyen
+    d'ajout (jours entiers, 0 si inconnu) et pays le plus producteur ("N/A" si aucun).
+    """
+    engine = get_query_engine(netflix_index)
+    if engine is sql_backend:
+        total_titles = sql_backend.count_rows(netflix_index, rows)
+        avg_lag_time = sql_backend.mean_value(netflix_index, 'lag_time', rows)
+    else:
+        total_titles = len(rows)
+        avg_lag_time = netflix_df['lag_time'].iloc[rows].mean()
+    avg_lag_time = 0 if avg_lag_time is None or pd.isna(avg_lag_time) else int(avg_lag_time)
+
+    most_prod_country = engine.most_frequent(netflix_index, 'main_country', rows)
+    if most_prod_country is None:
+        most_prod_country = "N/A"
+    return total_titles, avg_lag_time, most_prod_country
+
+def get_year_counts(netflix_index, rows, variable):
+    """
+    Compte les titres des lignes `rows` par année pour `variable` (`release_year` ou `year_added`).
+
+    C'est la résolution maximale de l'histogramme (les années sont entières) :
+    toute autre valeur de `bins` s'obtient en regroupant ces comptes
+    (histogramme pondéré, identique à celui des données brutes).
+    """
+    year_counts = get_query_engine(netflix_index).count_values(netflix_index, variable, rows, sort=False).sort_index()
+    year_counts.index = year_counts.index.astype('int64')
+    return year_counts
+
+@cached_data(max_entries=16, disk=True)
+def get_year_density(year_counts):
+    """
+    Calcule une fois la densité (KDE) des comptes annuels sur une grille fixe.
+
+    La densité ne dépend pas du nombre de bins : changer le slider ne la
+    recalcule pas. Voir `binned_kde` (binning + convolution FFT).
+    """
+    return binned_kde(year_counts.index, year_counts.to_numpy())
+
+def get_country_ranking(netflix_index, rows):
+    """Classement complet des pays producteurs des lignes `rows` (nombre de titres, ordre décroissant)."""
+    return get_query_engine(netflix_index).count_values(netflix_index, 'main_country', rows)
+
+def get_type_counts(netflix_index, rows):
+    """Nombre de titres des lignes `rows` par type, dans l'ordre d'apparition (celui de `sns.countplot`)."""
+    return get_query_engine(netflix_index).count_values(netflix_index, 'type', rows, sort=False)
+
+@cached_data(max_entries=2, disk=True)
+def get_corr_matrix(data_df):
+    """Matrice de corrélation des variables numériques du catalogue."""
+    numeric_cols = ['release_year', 'year_added', 'month_added', 'lag_time', 'duration_min', 'duration_seasons']
+    return data_df[numeric_cols].corr()
+
 # ==========================================================
 # FONCTIONS DE CRÉATION DE GRAPHIQUES (MISES EN CACHE)
 # ==========================================================
 
-@st.cache_data
-def create_countplot_figure(data_df, palette, color):
-    """Crée et retourne la figure Matplotlib pour le countplot."""
-    fig, ax = plt.subplots()
-    sns.countplot(
-        data=data_df,
-        x='type',
+@cached_data(max_entries=16, disk=True)
+@pooled
+def create_countplot_figure(type_counts, palette, color):
+    """Crée et retourne l'image PNG du countplot (à partir des comptes par type, cf. `get_type_counts`)."""
+    fig = new_figure()
+    ax = fig.subplots()
+    sns.barplot(
+        x=type_counts.index,
+        y=type_counts.to_numpy(),
+        hue=type_counts.index,
         palette=palette,
+        legend=False,
         width=0.75,
         ax=ax
     )
@@ -49,14 +149,14 @@ def create_countplot_figure(data_df, palette, color):
     
     for container in ax.containers:
         ax.bar_label(container, fontsize=12, color=color)
-    return fig
-
-@st.cache_data
-def create_heatmap_figure(data_df):
-    """Crée et retourne la figure Matplotlib pour la heatmap."""
-    fig, ax = plt.subplots(figsize=(10, 8))
-    numeric_cols = ['release_year', 'year_added', 'month_added', 'lag_time', 'duration_min', 'duration_seasons']
-    corr_matrix = data_df[numeric_cols].corr()
+    return figure_to_png(fig)
+
+@cached_data(max_entries=2, disk=True)
+@pooled
+def create_heatmap_figure(corr_matrix):
+    """Crée et retourne l'image PNG de la heatmap (cf. `get_corr_matrix`)."""
+    fig = new_figure(figsize=(10, 8))
+    ax = fig.subplots()
     sns.heatmap(
         corr_matrix,
         annot=True, 
@@ -67,45 +167,74 @@ def create_heatmap_figure(data_df):
         ax=ax
     )
     ax.set_title('Matrice de Corrélation')
-    plt.xticks(rotation=45, ha="right")
-    plt.yticks(rotation=0)
-    return fig
-
-@st.cache_data
-def create_boxplot_movies(data_df, color):
-    """Crée et retourne la figure boxplot pour les films."""
-    fig1, ax1 = plt.subplots()
-    sns.boxplot(
-        data=data_df[data_df['type'] == 'Movie'],
-        x='duration_min',
-        color=color,
-        ax=ax1)
+    setp(ax.get_xticklabels(), rotation=45, ha="right")
+    setp(ax.get_yticklabels(), rotation=0)
+    return figure_to_png(fig)
+
+def draw_box_stats(ax, stats_list, color):
+    """Trace des boxplots horizontaux à partir de résumés précalculés (`Axes.bxp`)."""
+    stats_list = [stats for stats in stats_list if stats is not None]
+    ax.bxp(
+        stats_list,
+        orientation='horizontal',
+        patch_artist=True,
+        widths=0.6,
+        boxprops={'facecolor': color, 'edgecolor': DARK_GREY},
+        medianprops={'color': NETFLIX_BLACK, 'linewidth': 2},
+        whiskerprops={'color': DARK_GREY},
+        capprops={'color': DARK_GREY},
+        flierprops={'marker': 'd', 'markerfacecolor': DARK_GREY, 'markeredgecolor': DARK_GREY, 'markersize': 4},
+    )
+    # Premier élément en haut (ordre de fréquence)
+    ax.invert_yaxis()
+
+@cached_data(max_entries=2, disk=True)
+@pooled
+def create_boxplot_movies(box_stats, color):
+    """Crée et retourne l'image PNG du boxplot des films (cf. `get_duration_box_stats`)."""
+    fig1 = new_figure()
+    ax1 = fig1.subplots()
+    draw_box_stats(ax1, [box_stats['movies']], color)
+    ax1.set_yticks([])
     ax1.set_title('Distribution de la Durée des Films (en minutes)')
     ax1.set_xlabel('Durée (minutes)')
-    return fig1
-
-@st.cache_data
-def create_boxplot_series(data_df, color) :
-    """Crée et retourne la figure boxplot pour les séries."""
-    fig2, ax2 = plt.subplots()
-    sns.boxplot(
-        data=data_df[data_df['type'] == 'TV Show'].dropna(subset=['duration_seasons']),
-        x='duration_seasons',
-        color=color,
-        ax=ax2)
+    return figure_to_png(fig1)
+
+@cached_data(max_entries=2, disk=True)
+@pooled
+def create_boxplot_series(box_stats, color) :
+    """Crée et retourne l'image PNG du boxplot des séries (cf. `get_duration_box_stats`)."""
+    fig2 = new_figure()
+    ax2 = fig2.subplots()
+    draw_box_stats(ax2, [box_stats['series']], color)
+    ax2.set_yticks([])
     ax2.set_title('Distribution du Nombre de Saisons (Séries TV)')
     ax2.set_xlabel('Nombre de Saisons')
-    return fig2
-
-@st.cache_data
-def create_barplot_figure(data_df, num_top, color) :
+    return figure_to_png(fig2)
+
+@cached_data(max_entries=4, disk=True)
+@pooled
+def create_boxplot_by_genre(genre_stats, title, xlabel, color):
+    """Crée et retourne l'image PNG des boxplots d'une durée, un par genre principal."""
+    fig = new_figure(figsize=(8, 6))
+    ax = fig.subplots()
+    draw_box_stats(ax, genre_stats, color)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    return figure_to_png(fig)
+
+@cached_data(max_entries=16, disk=True)
+@pooled
+def create_barplot_figure(country_ranking, num_top, color) :
     """
-    Crée et retourne la figure barplot pour le Top N Pays.
+    Crée et retourne l'image PNG du barplot du Top N Pays
+    (à partir du classement précalculé, cf. `get_country_ranking`).
     """
-    top_data = data_df['main_country'].value_counts().head(num_top).reset_index()
+    top_data = country_ranking.head(num_top).reset_index()
     top_data.columns = ['country', 'count']
     
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig = new_figure(figsize=(10, 8))
+    ax = fig.subplots()
     sns.barplot(
         data=top_data,
         x='count',
@@ -117,23 +246,31 @@ def create_barplot_figure(data_df, num_top, color) :
     ax.set_title(f'Top {num_top} des Pays Producteurs')
     ax.set_xlabel('Nombre de Titres')
     ax.set_ylabel('Pays')
-    sns.despine(left=True, bottom=True)
-    return fig
+    sns.despine(ax=ax, left=True, bottom=True)
+    return figure_to_png(fig)
 
-@st.cache_data
-def create_histplot_figure(data_df, selectbox_year, bins, color, dark_grey_color):
-    """Crée et retourne la figure histplot."""
-    fig, ax = plt.subplots()
+@cached_data(max_entries=16, disk=True)
+@pooled
+def create_histplot_figure(year_counts, year_density, selectbox_year, bins, color, dark_grey_color):
+    """
+    Crée et retourne l'image PNG de l'histplot à partir des comptes annuels
+    précalculés (cf. `get_year_counts`), pondérés par leur effectif,
+    et y superpose la densité précalculée (cf. `get_year_density`).
+    """
+    years = year_counts.index.to_numpy(dtype='float64')
+    fig = new_figure()
+    ax = fig.subplots()
     sns.histplot(
-        data=data_df,
-        x=selectbox_year,
+        x=years,
+        weights=year_counts.to_numpy(),
         bins=bins,           
         color=color,     
-        kde=True,              
-        line_kws={           
-            'color': dark_grey_color,
-            'linewidth': 3}, 
         ax=ax)
+    # Densité mise à l'échelle des barres (effectif total x largeur d'une classe)
+    if year_density is not None:
+        grid, density = year_density
+        bin_width = (years.max() - years.min()) / bins
+        ax.plot(grid, density * year_counts.sum() * bin_width, color=dark_grey_color, linewidth=3)
     # Personnalisation
     if selectbox_year == "release_year":
         ax.set_title('Distribution des années de sortie')
@@ -142,13 +279,130 @@ def create_histplot_figure(data_df, selectbox_year, bins, color, dark_grey_color
         ax.set_title("Distribution des Années d'ajout")
         ax.set_xlabel("Année d'ajout")
     ax.set_ylabel('Fréquence')
-    return fig
+    return figure_to_png(fig)
+
+# ==========================================================
+# IMAGES D'UN ÉTAT DU DASHBOARD
+# ==========================================================
+# Utilisées par le rendu et par le préchauffage (`dashboards/warmup.py`) :
+# mêmes arguments, donc mêmes clés de cache.
+
+def get_filtered_rows(netflix_index, selected_type="Tous", countries=(), genres=(), year_ranges=None):
+    """Lignes retenues par les filtres de la barre latérale (cf. `select_rows`)."""
+    return get_query_engine(netflix_index).select_rows(
+        netflix_index,
+        equals={
+            'type': [selected_type] if selected_type != "Tous" else [],
+            'main_country': list(countries),
+            'main_genre': list(genres),
+        },
+        ranges=year_ranges,
+    )
+
+def get_chart_calls(netflix_df, netflix_index, rows):
+    """
+    Graphiques qui ne dépendent que des filtres de la barre latérale (arguments de `render_charts`).
+
+    Un catalogue SQL fournit la matrice de corrélation et les résumés des
+    boxplots déjà calculés (`netflix_df` vaut alors None).
+    """
+    if get_query_engine(netflix_index) is sql_backend:
+        corr_matrix, box_stats = netflix_index['corr_matrix'], netflix_index['box_stats']
+    else:
+        corr_matrix, box_stats = get_corr_matrix(netflix_df), get_duration_box_stats(netflix_df)
+    return {
+        'countplot': (create_countplot_figure, (get_type_counts(netflix_index, rows), binary_palette, DARK_GREY)),
+        'heatmap': (create_heatmap_figure, (corr_matrix,)),
+        'boxplot_movies': (create_boxplot_movies, (box_stats, NETFLIX_RED)),
+        'boxplot_series': (create_boxplot_series, (box_stats, DARK_GREY)),
+        'boxplot_movies_genre': (create_boxplot_by_genre, (box_stats['movies_by_genre'], 'Durée des Films par Genre (Top 10)',
+                                                           'Durée (minutes)', NETFLIX_RED)),
+        'boxplot_series_genre': (create_boxplot_by_genre, (box_stats['series_by_genre'], 'Nombre de Saisons par Genre (Top 10)',
+                                                           'Nombre de Saisons', DARK_GREY)),
+    }
+
+def get_barplot_image(netflix_index, rows, nb_top=DEFAULT_TOP_N):
+    """Image du Top N des pays producteurs des lignes `rows`."""
+    return create_barplot_figure(get_country_ranking(netflix_index, rows), nb_top, NETFLIX_RED)
+
+def get_histplot_image(netflix_index, rows, variable=HIST_VARIABLES[0], bins=DEFAULT_BINS):
+    """Image de l'histogramme temporel des lignes `rows`."""
+    year_counts = get_year_counts(netflix_index, rows, variable)
+    return create_histplot_figure(year_counts, get_year_density(year_counts), variable, bins, NETFLIX_RED, DARK_GREY)
+
+# ==========================================================
+# SECTIONS À FILTRES PROPRES (FRAGMENTS)
+# ==========================================================
+# Modifier le Top N ou les réglages de l'histogramme ne relance que la
+# section concernée (`st.fragment`), pas les autres graphiques.
+
+@st.fragment
+def render_barplot_section(netflix_index, rows):
+    """Affiche le Top N des pays producteurs et son sélecteur (fragment)."""
+    header = st.empty()
+    nb_top = st.number_input("Nombre de pays (Top N)", min_value=5, value=DEFAULT_TOP_N, max_value=15)
+    header.subheader(f"Top {nb_top} des Pays")
+    with span("netflix.barplot.build"):
+        image = get_barplot_image(netflix_index, rows, nb_top)
+    with span("netflix.barplot.render"):
+        st.image(image, width="stretch")
+    with st.expander("🔍 Lire l'analyse"):
+        st.markdown("""
+        ### 📈 Analyse : Domination Géographique
+
+        Le `barplot` illustre la répartition géographique des productions de contenu sur Netflix, en se concentrant sur les **N** premiers pays (défini par le widget).
+
+        **1. Le Constat**
+
+        Quelle que soit la valeur de N (5, 10 ou 15), le constat est sans appel :
+
+        * **Hégémonie Américaine :** Les **États-Unis** ne sont pas seulement en tête, ils dominent de manière écrasante. Leur production représente souvent plus que les 9 autres pays du top 10 réunis.
+        * **Les Puissances Secondaires :** L'**Inde** (grâce à Bollywood et à sa large population) et le **Royaume-Uni** (forte industrie télévisuelle) se distinguent clairement comme les deux autres piliers de la production.
+        * **La "Longue Traîne" :** On observe un **fossé important** après le trio de tête. La contribution des autres pays chute rapidement, ce qui montre que si le catalogue est "international", il est en réalité fortement concentré sur quelques acteurs majeurs.
+
+        **2. L'Analyse**
+
+        Cette domination s'explique par une combinaison de facteurs historiques et économiques :
+
+        * **Héritage d'Hollywood :** Les États-Unis sont les pionniers de l'industrie cinématographique moderne et disposent d'un catalogue historique inégalé.
+        * **Origine de Netflix :** Netflix est une entreprise américaine. Son service a d'abord été lancé et optimisé pour son marché domestique.
+        * **Force d'Exportation Culturelle :** Le contenu américain (films et séries en langue anglaise) a la plus grande force d'exportation culturelle au monde.
+    """)
+
+@st.fragment
+def render_histplot_section(netflix_index, rows):
+    """Affiche l'histogramme temporel et ses sélecteurs (fragment)."""
+    st.subheader("Distribution Temporelle")
+    col_variable, col_bins = st.columns(2)
+    year_selection = col_variable.selectbox("Variable pour l'histogramme", HIST_VARIABLES)
+    nb_bins = col_bins.slider("Nombre de Bins (Histogramme)", min_value=10, value=DEFAULT_BINS, max_value=100)
+    with span("netflix.histplot.build"):
+        image = get_histplot_image(netflix_index, rows, year_selection, nb_bins)
+    with span("netflix.histplot.render"):
+        st.image(image, width="stretch")
+    with st.expander("🔍 Lire l'analyse"):
+        st.markdown("""
+        ### 📈 Analyse : Évolution Temporelle du Catalogue
+
+        Cet histogramme montre la distribution du contenu Netflix soit par **Année de Sortie** (son "âge" réel), soit par **Année d'Ajout** (son arrivée sur la plateforme). L'analyse change radicalement en fonction de votre choix.
+
+        #### 1. Si vous sélectionnez "release_year" (Année de Sortie)
+
+        * **Le Constat :** Le graphique est **fortement asymétrique à gauche** (*left-skewed*). La grande majorité des films et séries disponibles ont été produits au cours des 5 à 10 dernières années.
+        * **L'Analyse :** Cela illustre la stratégie de Netflix axée sur la **"fraîcheur"**. Le modèle économique repose sur un renouvellement constant, le lancement de "Netflix Originals" (qui ont un `lag_time` de 0) et l'acquisition de contenus récents. Le catalogue n'est pas une "archive" du cinéma, c'est une plateforme de nouveautés.
+
+        #### 2. Si vous sélectionnez "year_added" (Année d'Ajout)
+
+        * **Le Constat :** Le graphique montre une **croissance exponentielle** des ajouts de contenu, culminant autour de 2018-2019, suivie d'une **baisse notable** en 2020-2021.
+        * **L'Analyse :** C'est l'histoire de l'essor du streaming. La baisse de 2020 n'est pas un désintérêt, mais le résultat de deux facteurs majeurs :
+        1. **COVID-19 :** L'arrêt brutal de toutes les productions mondiales a tari le "pipeline" de nouveaux contenus.
+        2. **La Concurrence :** L'arrivée de Disney+, HBO Max, etc., a non seulement fragmenté le marché mais a aussi poussé Netflix à pivoter d'une stratégie de "volume" à une stratégie de "qualité" (blockbusters).""")
 
 # ==========================================================
 # FONCTION DE RENDU PRINCIPALE
 # ==========================================================
 
-def render_netflix_dashboard(netflix_df):
+def render_netflix_dashboard(netflix_df, netflix_index):
     st.header("Dashboard Netflix")
     st.markdown("""
     Cette section propose une analyse **statistique** du catalogue Netflix, en utilisant la bibliothèque **Seaborn**.  
@@ -162,24 +416,24 @@ def render_netflix_dashboard(netflix_df):
     # ===========================================================
     st.sidebar.subheader("Filtres Netflix")
     
-    # --- Filtre 1: Type (pour KPIs et graphiques) ---
-    selected_type = st.sidebar.selectbox("Type de productions", ["Tous", "Movie", "TV Show"])
-    
-    # --- Filtre 2: Top N (pour Barplot) ---
-    nb_top = st.sidebar.number_input("Nombre de pays (Top N)", min_value=5, value=10, max_value=15)
-
-    # --- Filtres 3 & 4: Histogramme ---
-    list_year = ["release_year", "year_added"]
-    year_selection = st.sidebar.selectbox("Variable pour l'histogramme", list_year)
-    nb_bins = st.sidebar.slider("Nombre de Bins (Histogramme)", min_value=10, value=30, max_value=100)
+    # --- Filtres combinés (pour KPIs et graphiques) ---
+    # Les filtres du Top N et de l'histogramme sont dans leurs sections (fragments)
+    selected_type = st.sidebar.selectbox("Type de productions", TYPE_OPTIONS)
+    selected_countries = st.sidebar.multiselect("Pays producteurs", netflix_index['categories']['main_country'],
+                                                placeholder="Tous")
+    selected_genres = st.sidebar.multiselect("Genres principaux", netflix_index['categories']['main_genre'],
+                                             placeholder="Tous")
+    year_ranges = {}
+    for variable, label in [('release_year', "Années de sortie"), ('year_added', "Années d'ajout")]:
+        min_year, max_year = (int(year) for year in get_query_engine(netflix_index).get_value_range(netflix_index, variable))
+        year_ranges[variable] = st.sidebar.slider(label, min_value=min_year, max_value=max_year,
+                                                  value=(min_year, max_year))
 
     # ===========================================================
-    # FILTRAGE DES DONNÉES
+    # FILTRAGE DES DONNÉES (ET des bitmaps puis numéros de lignes, ou clause WHERE)
     # ===========================================================
-    if selected_type != "Tous":
-        df_filtered = netflix_df[netflix_df['type'] == selected_type]
-    else:
-        df_filtered = netflix_df
+    with span("netflix.filter"):
+        rows = get_filtered_rows(netflix_index, selected_type, selected_countries, selected_genres, year_ranges)
 
     # ===========================================================
     # Les KPI
@@ -187,14 +441,8 @@ def render_netflix_dashboard(netflix_df):
     st.subheader("Indicateurs Clés")
     
     # Calculs
-    total_titles = df_filtered.shape[0]
-    avg_lag_time = 0
-    if not df_filtered['lag_time'].isnull().all():
-        avg_lag_time = int(df_filtered['lag_time'].mean())
-        
-    most_prod_country = "N/A"
-    if not df_filtered['main_country'].isnull().all():
-        most_prod_country = df_filtered['main_country'].mode()[0]
+    with span("netflix.kpis"):
+        total_titles, avg_lag_time, most_prod_country = get_kpis(netflix_df, netflix_index, rows)
 
     # Colonnes des KPIs 
     kpi_col1, kpi_col2, kpi_col3 = st.columns(3, border=True)
@@ -203,19 +451,26 @@ def render_netflix_dashboard(netflix_df):
     kpi_col3.metric("Top Pays Producteur", most_prod_country)
     st.divider()
 
+    if total_titles == 0:
+        st.warning("Aucun titre ne correspond aux filtres sélectionnés dans la barre latérale.")
+        return
+
     # ===================================================================================
     # Affichage des Graphiques
     # ===================================================================================
     st.subheader("Analyses Visuelles")
 
+    # Construction de toutes les images du rerun (en parallèle avec le backend 'process')
+    with span("netflix.charts.build"):
+        images = render_charts(get_chart_calls(netflix_df, netflix_index, rows))
+
     # Création des colonnes
     col_graph1, col_graph2 = st.columns(2, gap="medium")
 
     # Graphe 1 : Countplot
     with col_graph1:
-        # Appel de la fonction cachée
-        fig_countplot = create_countplot_figure(df_filtered, binary_palette, DARK_GREY)
-        st.pyplot(fig_countplot)
+        with span("netflix.countplot.render"):
+            st.image(images['countplot'], width="stretch")
         with st.expander("🔍 Lire l'analyse"):
             st.markdown("""
                 ### 📈 Analyse : Répartition Films vs. Séries
@@ -237,9 +492,8 @@ def render_netflix_dashboard(netflix_df):
 
     # Graphe 2 : Heatmap
     with col_graph2:
-        # Appel de la fonction cachée
-        fig_heatmap = create_heatmap_figure(netflix_df)
-        st.pyplot(fig_heatmap)
+        with span("netflix.heatmap.render"):
+            st.image(images['heatmap'], width="stretch")
         with st.expander("🔍 Lire l'analyse"):
             st.markdown("""
             ### 📈 Analyse : Matrice de Corrélation
@@ -269,14 +523,11 @@ def render_netflix_dashboard(netflix_df):
     # Graphe 3 : Boxplots
     col_box1, col_box2 = st.columns(2, gap="medium")
     
-    # Appel des fonctions cachées
-    boxplot_movies = create_boxplot_movies(netflix_df, NETFLIX_RED)
-    boxplot_series = create_boxplot_series(netflix_df, DARK_GREY)
-
-    with col_box1:
-        st.pyplot(boxplot_movies)
-    with col_box2:
-        st.pyplot(boxplot_series)
+    with span("netflix.boxplots.render"):
+        with col_box1:
+            st.image(images['boxplot_movies'], width="stretch")
+        with col_box2:
+            st.image(images['boxplot_series'], width="stretch")
 
     with st.expander("🔍 Lire l'analyse des Boxplots"):
         st.markdown("""
@@ -310,61 +561,21 @@ def render_netflix_dashboard(netflix_df):
         * **Réponse :** Les unités (minutes vs. saisons) sont incomparables. Mais si l'on pose une **hypothèse** (une série médiane = 1 saison de 8 épisodes * 45 min = 360 min), on constate qu'une série est **largement plus longue** qu'un film médian (100 min).
 
         **Conclusion :** Netflix utilise les **Films** pour le **volume** (satisfaire tous les goûts) et les **Séries** pour la **rétention** (créer des "hits" qui fidélisent les abonnés).""")
+
+    # Graphe 3 bis : Boxplots par genre (mêmes résumés précalculés)
+    st.subheader("Durées par Genre Principal")
+    col_genre1, col_genre2 = st.columns(2, gap="medium")
+    with span("netflix.boxplots_genre.render"):
+        with col_genre1:
+            st.image(images['boxplot_movies_genre'], width="stretch")
+        with col_genre2:
+            st.image(images['boxplot_series_genre'], width="stretch")
     
     st.divider()
     
-    # Graphe 4 : Barplot & Graphe 5 : Histplot
+    # Graphe 4 : Barplot & Graphe 5 : Histplot (fragments : leurs filtres ne relancent qu'eux)
     col_bar, col_hist = st.columns(2, gap="medium")
-
-    # Graphe 4 : Barplot
     with col_bar:
-        st.subheader(f"Top {nb_top} des Pays")
-        # Appel de la fonction caché
-        fig_barplot = create_barplot_figure(df_filtered, nb_top, NETFLIX_RED)
-        st.pyplot(fig_barplot)
-        with st.expander("🔍 Lire l'analyse"):
-            st.markdown("""
-            ### 📈 Analyse : Domination Géographique
-
-            Le `barplot` illustre la répartition géographique des productions de contenu sur Netflix, en se concentrant sur les **N** premiers pays (défini par le widget).
-
-            **1. Le Constat**
-
-            Quelle que soit la valeur de N (5, 10 ou 15), le constat est sans appel :
-
-            * **Hégémonie Américaine :** Les **États-Unis** ne sont pas seulement en tête, ils dominent de manière écrasante. Leur production représente souvent plus que les 9 autres pays du top 10 réunis.
-            * **Les Puissances Secondaires :** L'**Inde** (grâce à Bollywood et à sa large population) et le **Royaume-Uni** (forte industrie télévisuelle) se distinguent clairement comme les deux autres piliers de la production.
-            * **La "Longue Traîne" :** On observe un **fossé important** après le trio de tête. La contribution des autres pays chute rapidement, ce qui montre que si le catalogue est "international", il est en réalité fortement concentré sur quelques acteurs majeurs.
-
-            **2. L'Analyse**
-
-            Cette domination s'explique par une combinaison de facteurs historiques et économiques :
-
-            * **Héritage d'Hollywood :** Les États-Unis sont les pionniers de l'industrie cinématographique moderne et disposent d'un catalogue historique inégalé.
-            * **Origine de Netflix :** Netflix est une entreprise américaine. Son service a d'abord été lancé et optimisé pour son marché domestique.
-            * **Force d'Exportation Culturelle :** Le contenu américain (films et séries en langue anglaise) a la plus grande force d'exportation culturelle au monde.
-""")
-
-    # Graphe 5 : Histplot
+        render_barplot_section(netflix_index, rows)
     with col_hist:
-        st.subheader("Distribution Temporelle")
-        # Appel de la fonction cachée
-        fig_hist = create_histplot_figure(df_filtered, year_selection, nb_bins, NETFLIX_RED, DARK_GREY)
-        st.pyplot(fig_hist)
-        with st.expander("🔍 Lire l'analyse"):
-            st.markdown("""
-            ### 📈 Analyse : Évolution Temporelle du Catalogue
-
-            Cet histogramme montre la distribution du contenu Netflix soit par **Année de Sortie** (son "âge" réel), soit par **Année d'Ajout** (son arrivée sur la plateforme). L'analyse change radicalement en fonction de votre choix.
-
-            #### 1. Si vous sélectionnez "release_year" (Année de Sortie)
-
-            * **Le Constat :** Le graphique est **fortement asymétrique à gauche** (*left-skewed*). La grande majorité des films et séries disponibles ont été produits au cours des 5 à 10 dernières années.
-            * **L'Analyse :** Cela illustre la stratégie de Netflix axée sur la **"fraîcheur"**. Le modèle économique repose sur un renouvellement constant, le lancement de "Netflix Originals" (qui ont un `lag_time` de 0) et l'acquisition de contenus récents. Le catalogue n'est pas une "archive" du cinéma, c'est une plateforme de nouveautés.
-
-            #### 2. Si vous sélectionnez "year_added" (Année d'Ajout)
-
-            * **Le Constat :** Le graphique montre une **croissance exponentielle** des ajouts de contenu, culminant autour de 2018-2019, suivie d'une **baisse notable** en 2020-2021.
-            * **L'Analyse :** C'est l'histoire de l'essor du streaming. La baisse de 2020 n'est pas un désintérêt, mais le résultat de deux facteurs majeurs :
-            1. **COVID-19 :** L'arrêt brutal de toutes les productions mondiales a tari le "pipeline" de nouveaux contenus.
-            2. **La Concurrence :** L'arrivée de Disney+, HBO Max, etc., a non seulement fragmenté le marché mais a aussi poussé Netflix à pivoter d'une stratégie de "volume" à une stratégie de "qualité" (blockbusters).""")
\ No newline at end of file
+        render_histplot_section(netflix_index, rows)
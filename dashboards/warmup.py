@@ -0,0 +1,192 @@
+"""
+Module de Préchauffage des Caches (au démarrage du serveur).
+
+Après un déploiement, le premier visiteur paie la lecture des CSV, la
+charte graphique, les matrices de corrélation et chaque figure du
+Dashboard. `start_warmup()`, appelée par `app.py`, lance ce travail dans
+un thread d'arrière-plan (non bloquant) :
+
+1.  Appelle les loaders de `data_loader` (datasets, index bitmap Netflix
+    ou catalogue SQL, table croisée).
+2.  Construit les figures du Dashboard pour son état par défaut (valeurs
+    par défaut des widgets), puis pour une liste d'états courants.
+
+Les figures sont construites avec les mêmes fonctions et les mêmes
+arguments que le rendu (`get_chart_calls`, `get_line_figure`...) : elles
+remplissent donc les mêmes entrées des caches partagés. Une requête qui
+arrive pendant le préchauffage attend le calcul en cours de la même clé
+au lieu de le refaire. La durée totale est écrite dans les logs du serveur.
+
+Configuration (variables d'environnement) :
+- `DASHBOARD_WARMUP=0` désactive le préchauffage ;
+- `DASHBOARD_WARMUP_STATES` remplace la liste des états courants (JSON), ex :
+  '[{"dataset": "Netflix", "type": "Movie"}, {"dataset": "World Happiness Report", "year": 2018}]'
+
+Un état ne précise que ce qui diffère des valeurs par défaut. Clés reconnues :
+- Netflix : `type`, `countries`, `genres`, `release_year`, `year_added`
+  (intervalles), `top_n`, `hist_variable`, `bins` ;
+- World Happiness Report : `year`, `map_variable`, `line_variable`,
+  `countries`, `race_variable`.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+from streamlit.logger import get_logger
+from utils.data_watcher import DATA_WATCHER_THREAD_NAME
+
+# `data_loader` et les dashboards sont importés dans le thread (imports différés) :
+# `app.py` n'attend pas l'import de seaborn et de Plotly.
+
+WARMUP_ENABLED = os.environ.get('DASHBOARD_WARMUP', '1').lower() in ('1', 'true', 'yes')
+
+# États courants préchauffés après les états par défaut des deux dashboards
+DEFAULT_WARMUP_STATES = [
+    {'dataset': "Netflix", 'type': "Movie"},
+    {'dataset': "Netflix", 'type': "TV Show"},
+    {'dataset': "Netflix", 'hist_variable': "year_added"},
+    {'dataset': "World Happiness Report", 'race_variable': "GDP_per_Capita"},
+]
+WARMUP_STATES = json.loads(os.environ.get('DASHBOARD_WARMUP_STATES', 'null')) or DEFAULT_WARMUP_STATES
+
+WARMUP_THREAD_NAME = "cache-warmup"
+# Threads d'arrière-plan (hors session) qui appellent les fonctions mises en
+# cache : préchauffage et reconstruction après un changement des données
+BACKGROUND_THREAD_NAMES = (WARMUP_THREAD_NAME, DATA_WATCHER_THREAD_NAME)
+
+_lock = threading.Lock()
+_thread = None
+_context_filter = None
+_logger = get_logger(__name__)
+
+
+class _WarmupContextFilter(logging.Filter):
+    """
+    Masque l'avertissement "missing ScriptRunContext" émis par les fonctions
+    mises en cache appelées depuis un thread d'arrière-plan
+    (`BACKGROUND_THREAD_NAMES`) ou l'un de ses threads de rendu (hors
+    session : c'est attendu).
+    """
+
+    def filter(self, record):
+        if not (record.args and isinstance(record.args[0], str)):
+            return True
+        thread_name = record.args[0]
+        return not any(thread_name == name or thread_name.startswith(name + '-') for name in BACKGROUND_THREAD_NAMES)
+
+def _install_context_filter():
+    """Installe `_WarmupContextFilter` sur le logger de Streamlit, une seule fois par processus."""
+    global _context_filter
+    with _lock:
+        if _context_filter is None:
+            _context_filter = _WarmupContextFilter()
+            get_logger('streamlit.runtime.scriptrunner_utils.script_run_context').addFilter(_context_filter)
+
+
+# ==========================================================
+# PRÉCHAUFFAGE D'UN ÉTAT
+# ==========================================================
+
+def warm_netflix_state(netflix_df, netflix_index, state):
+    """Construit les images du dashboard Netflix pour un état des widgets."""
+    from dashboards import netflix_page
+    from utils.render_pool import render_charts
+
+    year_ranges = {variable: tuple(state[variable]) for variable in ('release_year', 'year_added') if variable in state}
+    rows = netflix_page.get_filtered_rows(netflix_index, state.get('type', "Tous"), state.get('countries', ()),
+                                          state.get('genres', ()), year_ranges)
+    if netflix_page.get_kpis(netflix_df, netflix_index, rows)[0] == 0:
+        return
+    render_charts(netflix_page.get_chart_calls(netflix_df, netflix_index, rows))
+    netflix_page.get_barplot_image(netflix_index, rows, state.get('top_n', netflix_page.DEFAULT_TOP_N))
+    netflix_page.get_histplot_image(netflix_index, rows, state.get('hist_variable', netflix_page.HIST_VARIABLES[0]),
+                                    state.get('bins', netflix_page.DEFAULT_BINS))
+
+def warm_happiness_state(happiness_df, state):
+    """
+    Construit les figures du dashboard World Happiness Report pour un état des widgets.
+
+    La carte et le nuage de points ne sont pas mis en cache : les construire
+    initialise tout de même Plotly Express (premier appel plus lent).
+    """
+    from dashboards import happiness_page
+
+    selected_year = state.get('year', int(happiness_df['Year'].max()))
+    df_filtered_year = happiness_df[happiness_df['Year'] == selected_year]
+    happiness_page.get_map_figure(happiness_df, df_filtered_year, state.get('map_variable', happiness_page.DEFAULT_VARIABLE),
+                                  selected_year)
+    happiness_page.get_scatter_figure(happiness_df, df_filtered_year, selected_year)
+    happiness_page.get_line_figure(happiness_df, state.get('countries', happiness_page.DEFAULT_LINE_COUNTRIES),
+                                   state.get('line_variable', happiness_page.DEFAULT_VARIABLE))
+    happiness_page.get_heatmap_figure(happiness_df)
+    happiness_page.get_race_figures(happiness_df, state.get('race_variable', happiness_page.DEFAULT_VARIABLE))
+
+
+# ==========================================================
+# ORCHESTRATION
+# ==========================================================
+
+def run_warmup(states=None):
+    """
+    Charge les datasets et préchauffe les caches pour l'état par défaut puis
+    pour chaque état de `states` (par défaut `WARMUP_STATES`).
+
+    Un état en échec est journalisé sans interrompre les suivants.
+
+    Returns:
+        float: Durée totale du préchauffage, en secondes.
+    """
+    import data_loader
+
+    # Aussi appelée par le thread de surveillance des données (reconstruction)
+    _install_context_filter()
+    start = time.perf_counter()
+    # Loaders des pages d'analyse (données brutes) et du Dashboard
+    data_loader.load_netflix_data_cleaning()
+    data_loader.load_happiness_all_df()
+    happiness = data_loader.load_happiness_data_analysis()
+    if data_loader.use_netflix_sql_backend():
+        # Le Dashboard Netflix n'utilise alors ni le DataFrame ni l'index bitmap
+        netflix = None
+        netflix_index = data_loader.load_netflix_catalogue(data_loader.get_netflix_catalogue_version())
+    else:
+        netflix = data_loader.load_netflix_data_analysis()
+        netflix_index = data_loader.load_netflix_index(data_loader.get_dataset_version(data_loader.NETFLIX_CLEANED_PATH))
+    data_loader.load_netflix_happiness_panel(
+        data_loader.get_dataset_version(data_loader.NETFLIX_CLEANED_PATH, data_loader.HAPPINESS_COMBINED_PATH))
+    _logger.info("Préchauffage : datasets chargés en %.1f s", time.perf_counter() - start)
+
+    states = [{'dataset': "Netflix"}, {'dataset': "World Happiness Report"}, *(states or WARMUP_STATES)]
+    for state in states:
+        try:
+            if state['dataset'] == "Netflix" and netflix_index is not None:
+                warm_netflix_state(netflix, netflix_index, state)
+            elif state['dataset'] == "World Happiness Report" and happiness is not None:
+                warm_happiness_state(happiness, state)
+        except Exception:
+            _logger.exception("Préchauffage : échec de l'état %s", state)
+
+    elapsed = time.perf_counter() - start
+    _logger.info("Préchauffage des caches terminé en %.1f s (%d états)", elapsed, len(states))
+    return elapsed
+
+def start_warmup():
+    """
+    Lance le préchauffage dans un thread d'arrière-plan, une seule fois par
+    processus (les reruns suivants de `app.py` ne font rien).
+
+    Returns:
+        threading.Thread | None: Le thread de préchauffage, ou None s'il est désactivé.
+    """
+    global _thread
+    if not WARMUP_ENABLED:
+        return None
+    _install_context_filter()
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=run_warmup, name=WARMUP_THREAD_NAME, daemon=True)
+            _thread.start()
+        return _thread
@@ -6,24 +6,55 @@ pour l'application. Il agit comme la "source unique de vérité" pour
 l'accès aux données.
 
 Fonctionnalités Clés :
-- Utilise `@st.cache_data` pour mettre en cache les DataFrames en mémoire,
+- Utilise `@cached_data` (`@st.cache_data` observable et borné, cf.
+  `utils/cache_registry.py`) pour mettre en cache les DataFrames en mémoire,
   garantissant des performances optimales et un re-chargement instantané
   lors de la navigation entre les pages.
+- Conserve aussi sur disque (`disk=True`, cf. `utils/disk_cache.py`) les
+  datasets prêts à l'analyse et la table croisée : après un redémarrage,
+  ils sont relus depuis le cache disque tant que les CSV n'ont pas changé.
+- Déclare les fichiers lus par chaque loader (`source_files`) : la version
+  de leur contenu (cf. `utils/data_watcher.py`) entre dans la clé du cache.
+  Un fichier remplacé pendant que le serveur tourne est donc relu, sans
+  redémarrage ni vidage des autres caches. Chaque loader garde deux
+  entrées : l'ancienne version reste servie aux reruns en cours pendant
+  la reconstruction de la nouvelle.
 - Gère les erreurs `FileNotFoundError` pour que l'application ne
   plante pas si un fichier de données est manquant.
+- Chronomètre chaque chargement réel (hors cache) via `@timed`
+  (`utils/profiling.py`, actif avec `DASHBOARD_PROFILING=1`).
 
 Contient les chargeurs pour :
 - Données Netflix (brutes et nettoyées)
 - Données World Happiness Report (fichiers annuels bruts et version harmonisée)
+- Table croisée Netflix x World Happiness (par pays et par année)
+- Index bitmap du catalogue Netflix (filtres combinés du Dashboard)
+- Catalogue Netflix interrogé en SQL (backend DuckDB optionnel, cf.
+  `utils/sql_backend.py`), à la place du DataFrame et de l'index bitmap
 """
 
 import pandas as pd
 import streamlit as st
 import sys 
+from utils.country_names import map_country_codes
+from utils.pandas_helpers import build_country_year_panel, compact_happiness_frame
+from utils.profiling import timed
+from utils.bitmap_index import build_bitmap_index
+from utils.sql_backend import build_sql_catalogue, box_stats, corr_matrix, select_rows, use_sql_backend
+from utils.cache_registry import cached_data, cached_resource
+from utils.data_watcher import get_file_versions
+
+# Chemins des datasets prêts à l'analyse
+NETFLIX_CLEANED_PATH = './data/netflix_cleaned.csv'
+HAPPINESS_COMBINED_PATH = './data/world_happiness_2015-2019_combined.csv'
+# Datasets bruts
+NETFLIX_RAW_PATH = './data/netflix_titles.csv'
+HAPPINESS_RAW_PATHS = ('./data/2015.csv', './data/2016.csv', './data/2017.csv', './data/2018.csv', './data/2019.csv')
 
 # ===================================================================================
 # Netflix section 1
-@st.cache_data 
+@cached_data(max_entries=2, source_files=(NETFLIX_RAW_PATH,))
+@timed()
 def load_netflix_data_cleaning():
     """
     Charge et met en cache le dataset **brut** de Netflix (`netflix_titles.csv`).
@@ -38,7 +69,7 @@ def load_netflix_data_cleaning():
         pd.DataFrame | None : Le DataFrame brut, ou None si le chargement échoue.
     """
 
-    file_path = './data/netflix_titles.csv'
+    file_path = NETFLIX_RAW_PATH
     try : 
         netflix = pd.read_csv(file_path) 
         return netflix
@@ -51,7 +82,8 @@ def load_netflix_data_cleaning():
         return None
 
 # Netflix section 2
-@st.cache_data 
+@cached_data(max_entries=2, disk=True, source_files=(NETFLIX_CLEANED_PATH,))
+@timed()
 def load_netflix_data_analysis():
     """
     Charge et met en cache le dataset **nettoyé** de Netflix (`netflix_cleaned.csv`).
@@ -61,6 +93,8 @@ def load_netflix_data_analysis():
     - La page "3_📈_Visualisation Seaborn".
     - Le Dashboard interactif ("6_📝_Dashboard").
 
+    Ajoute la colonne `main_country_code` (code ISO-3) via `utils/country_names.py`.
+
     Gère les erreurs `FileNotFoundError` si le fichier est manquant.
 
     Returns:
@@ -68,9 +102,12 @@ def load_netflix_data_analysis():
 
     """
 
-    file_path = './data/netflix_cleaned.csv'
+    file_path = NETFLIX_CLEANED_PATH
     try : 
         df = pd.read_csv(file_path)
+        # Clé pays canonique (ISO-3), ajoutée si le CSV a été généré avant son introduction
+        if 'main_country_code' not in df.columns:
+            df['main_country_code'] = map_country_codes(df['main_country'])
         return df
     except FileNotFoundError :
         st.error(f"ERREUR CRITIQUE: Le fichier {file_path} est manquant.")
@@ -82,7 +119,8 @@ def load_netflix_data_analysis():
 
 # ===================================================================================
 # Mise en cache de tous les datasets world happiness report 2015 - 2019
-@st.cache_data
+@cached_data(max_entries=2, source_files=HAPPINESS_RAW_PATHS)
+@timed()
 def load_happiness_all_df():
     """
     Charge et met en cache les 5 datasets **bruts** (2015-2019) du World Happiness Report.
@@ -100,12 +138,7 @@ def load_happiness_all_df():
     """
         
     try :
-        df_2015 = pd.read_csv('./data/2015.csv')
-        df_2016 = pd.read_csv('./data/2016.csv')
-        df_2017 = pd.read_csv('./data/2017.csv')
-        df_2018 = pd.read_csv('./data/2018.csv')
-        df_2019 = pd.read_csv('./data/2019.csv')
-        return df_2015, df_2016, df_2017, df_2018, df_2019
+        return tuple(pd.read_csv(path) for path in HAPPINESS_RAW_PATHS)
     except FileNotFoundError :
         st.error("ERREUR : Un ou plusieurs fichiers CSV (2015-2019) sont manquants dans le dossier '/data'.")
         st.error("L'application ne peut pas charger la partie World Happiness Report")
@@ -115,7 +148,8 @@ def load_happiness_all_df():
         return None
 
 # World Happiness section 2
-@st.cache_data
+@cached_data(max_entries=2, disk=True, source_files=(HAPPINESS_COMBINED_PATH,))
+@timed()
 def load_happiness_data_analysis():
     """
     Charge et met en cache le dataset **harmonisé** du World Happiness Report.
@@ -127,6 +161,13 @@ def load_happiness_data_analysis():
     - "5_📊_Partie 2 - Visualisation avec Plotly"
     - "6_📝_Dashboard"
 
+    Ajoute la colonne `ISO_Code` (code ISO-3) via `utils/country_names.py`,
+    qui sert de clé pour les cartes et les jointures.
+
+    Le DataFrame est stocké dans des types compacts (`compact_happiness_frame`) :
+    indicateurs en float32, `Rank` et `Year` en int16, `Country`, `Region`
+    et `ISO_Code` en catégories (environ trois fois moins de mémoire par session).
+
     Gère les erreurs `FileNotFoundError` si le fichier est manquant.
 
     Returns:
@@ -135,14 +176,138 @@ def load_happiness_data_analysis():
             - None si le chargement échoue.
     """
 
-    file_path = './data/world_happiness_2015-2019_combined.csv'
+    file_path = HAPPINESS_COMBINED_PATH
     try:
         df = pd.read_csv(file_path)
-        return df
+        # Clé pays canonique (ISO-3), ajoutée si le CSV a été généré avant son introduction
+        if 'ISO_Code' not in df.columns:
+            df['ISO_Code'] = map_country_codes(df['Country'])
+        # Les régions manquantes sont complétées à partir des autres années du même pays
+        df['Region'] = df['Region'].fillna(df.groupby('ISO_Code')['Region'].transform('first'))
+        return compact_happiness_frame(df)
     except FileNotFoundError:
         st.error(f"ERREUR CRITIQUE : Le fichier {file_path} est manquant.")
         st.error("Assurez-vous d'avoir exécuté la page d'harmonisation (4_♻️) au moins une fois.")
         return None
     except Exception as e:
         st.error(f"Une erreur inattendue est survenue en chargeant {file_path}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+# ===================================================================================
+# Index bitmap du catalogue Netflix
+NETFLIX_INDEX_CATEGORICAL = ['type', 'main_country', 'main_genre']
+NETFLIX_INDEX_RANGES = ['release_year', 'year_added']
+# Variables numériques de la matrice de corrélation du Dashboard
+NETFLIX_CORR_COLUMNS = ['release_year', 'year_added', 'month_added', 'lag_time', 'duration_min', 'duration_seasons']
+
+@cached_resource(max_entries=2)
+@timed()
+def load_netflix_index(dataset_version):
+    """
+    Construit et met en cache l'index bitmap du dataset **nettoyé** de Netflix.
+
+    Un bitmap par type, pays principal et genre principal, et les années
+    de sortie / d'ajout triées (cf. `utils/bitmap_index.py`) : le Dashboard
+    combine ses filtres sans re-masquer le DataFrame. L'index est construit
+    une fois par version du fichier (`dataset_version`, cf.
+    `get_dataset_version`) et partagé en lecture seule par toutes les sessions.
+
+    Returns:
+        dict | None: L'index, ou None si le dataset n'a pas pu être chargé.
+    """
+
+    netflix = load_netflix_data_analysis()
+    if netflix is None:
+        return None
+    return build_bitmap_index(netflix, NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES)
+
+# ===================================================================================
+# Catalogue Netflix en SQL (backend DuckDB optionnel)
+def use_netflix_sql_backend():
+    """Indique si le Dashboard Netflix interroge le catalogue en SQL (cf. `DASHBOARD_QUERY_BACKEND`)."""
+    return use_sql_backend(NETFLIX_CLEANED_PATH)
+
+def get_netflix_catalogue_version():
+    """Version du catalogue SQL : celle du CSV nettoyé (son sidecar Parquet en est une copie versionnée)."""
+    return get_dataset_version(NETFLIX_CLEANED_PATH)
+
+@cached_resource(max_entries=2)
+@timed()
+def load_netflix_catalogue(dataset_version):
+    """
+    Charge et met en cache le dataset **nettoyé** de Netflix dans une base
+    DuckDB en mémoire (cf. `utils/sql_backend.py`), sans DataFrame pandas.
+
+    Le catalogue remplace, pour le Dashboard, le DataFrame et l'index
+    bitmap : mêmes clés (`categories`...), filtres et comptes résolus par
+    des requêtes SQL. Les résumés qui ne dépendent pas des filtres (matrice
+    de corrélation, boxplots de durée, au format de `get_duration_box_stats`)
+    sont calculés ici, une fois par version du fichier (`dataset_version`,
+    cf. `get_netflix_catalogue_version`).
+
+    Gère les erreurs `FileNotFoundError` si le fichier est manquant.
+
+    Returns:
+        dict | None: Le catalogue, ou None si le chargement échoue.
+    """
+
+    file_path = NETFLIX_CLEANED_PATH
+    try:
+        catalogue = build_sql_catalogue(file_path, NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES,
+                                        source_version=dataset_version[0])
+    except FileNotFoundError:
+        st.error(f"ERREUR CRITIQUE: Le fichier {file_path} est manquant.")
+        st.error("L'application ne peut pas charger le fichier 'netflix_cleaned.csv'.")
+        return None
+    except Exception as e:
+        st.error(f"Une erreur inattendue est survenue en chargeant {file_path}: {e}")
+        return None
+
+    movies = select_rows(catalogue, equals={'type': ['Movie']})
+    series = select_rows(catalogue, equals={'type': ['TV Show']})
+    catalogue['corr_matrix'] = corr_matrix(catalogue, NETFLIX_CORR_COLUMNS)
+    catalogue['box_stats'] = {
+        'movies': box_stats(catalogue, 'duration_min', movies, label='Films'),
+        'series': box_stats(catalogue, 'duration_seasons', series, label='Séries'),
+        'movies_by_genre': box_stats(catalogue, 'duration_min', movies, by='main_genre', top_n=10),
+        'series_by_genre': box_stats(catalogue, 'duration_seasons', series, by='main_genre', top_n=10),
+    }
+    return catalogue
+
+# ===================================================================================
+# Vue croisée Netflix x World Happiness
+def get_dataset_version(*file_paths):
+    """
+    Retourne la "version" des fichiers de données (empreintes de leur contenu,
+    cf. `utils/data_watcher.py`), celle épinglée pour le rerun en cours.
+
+    Passée en argument d'une fonction cachée, elle garantit que le cache
+    n'est invalidé que lorsqu'un fichier source change réellement.
+    """
+    return get_file_versions(file_paths)
+
+@cached_data(max_entries=2, disk=True)
+@timed()
+def load_netflix_happiness_panel(dataset_version):
+    """
+    Construit et met en cache la table croisée Netflix x World Happiness.
+
+    La jointure (comptes de productions Netflix par pays et par année +
+    indicateurs WHR) est calculée une seule fois par version des datasets
+    (`dataset_version`, cf. `get_dataset_version`), et non à chaque rerun.
+    Les DataFrames bruts ne sont jamais modifiés.
+
+    Elle est utilisée par le Dashboard ("6_📝_Dashboard").
+
+    Returns:
+        pd.DataFrame | None:
+            - La table indexée par (`ISO_Code`, `Year`).
+            - None si l'un des deux datasets n'a pas pu être chargé.
+    """
+
+    netflix = load_netflix_data_analysis()
+    happiness = load_happiness_data_analysis()
+    if netflix is None or happiness is None:
+        return None
+    return build_country_year_panel(netflix, happiness)
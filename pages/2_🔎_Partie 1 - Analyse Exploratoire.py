@@ -11,19 +11,24 @@ Il contient :
 2.  L'analyse descriptive des problèmes (valeurs nulles, types
     de données incorrects, colonnes inutiles).
 3.  Le code de nettoyage et de Feature Engineering (ex: `lag_time`,
-    `main_country`), expliqué avec `st.echo`.
+    `main_country`), issu de `utils/netflix_cleaning.py`, avec l'aperçu
+    du DataFrame après chaque étape (exécutée une seule fois et mise en
+    cache par `utils/pipeline_runner.py`).
 4.  La présentation du DataFrame final (`netflix_cleaned.csv`)
-    et un bouton pour le télécharger.
+    et des boutons pour le télécharger (CSV ou Parquet).
 
 Cette page est le "making-of" qui prépare les données pour la page
 de visualisation suivante : "3_📈_Visualisation Seaborn".
 """
 
 # Importation des dépendances
-import pandas as pd
 import streamlit as st
-import numpy as np
-from data_loader import load_netflix_data_cleaning 
+from pprint import pformat
+from data_loader import load_netflix_data_cleaning, get_dataset_version
+from utils.downloads import render_download_buttons
+from utils.netflix_cleaning import (RAW_PATH, COLUMNS_FINAL, parse_date_added, split_duration,
+                                    extract_main_features, select_final_columns)
+from utils.pipeline_runner import get_netflix_cleaning_snapshots, get_step_source, render_snapshot
 
 # Configuration de la page principale
 st.set_page_config(
@@ -66,6 +71,10 @@ st.write("")
 st.divider()
 # =====================================================================================================================
 # Début de l'analyse
+# Optimisation : le pipeline (utils/netflix_cleaning.py) n'est exécuté qu'une fois par version
+# du fichier brut ; la page ré-affiche ensuite l'état capturé après chaque étape.
+snapshots = get_netflix_cleaning_snapshots(get_dataset_version(RAW_PATH))
+
 st.subheader("Étape 1 : Convertir la date en un format compréhensible par Pandas")
 
 st.markdown("""
@@ -74,25 +83,9 @@ st.markdown("""
 """)
 
 with st.expander("Découvrir le code"):
-    with st.echo():
-        # Conversion de 'date_added' (objet) en 'date_added_feature' (datetime)
-        # .str.strip() supprime les espaces blancs en début et en fin
-        netflix['date_added_feature'] = netflix['date_added'].str.strip()
-        netflix['date_added_feature'] = pd.to_datetime(netflix['date_added_feature'], errors='coerce')
-
-        # création de la colonne 'year_added' : Extraction de l'année
-        netflix['year_added'] = netflix['date_added_feature'].dt.year
-
-        # création de la colonne 'month_added' : Extraction du mois
-        netflix['month_added'] = netflix['date_added_feature'].dt.month
-
-        # création de la colonne 'added_day_of_week' : Extraction du jour d'ajout
-        netflix['added_day_of_month'] = netflix['date_added_feature'].dt.day
-
-        # Création de la colonne 'lag_time' : durée entre l'ajout et la sortie
-        netflix['lag_time'] = netflix['year_added'] - netflix['release_year']
+    st.code(get_step_source(parse_date_added), language="python")
 
-st.dataframe(netflix.head(), use_container_width=True)
+render_snapshot(snapshots[0])
 
 st.markdown("""
     En effectuant ce bloc de script, on **obtient** 5 nouvelles colonnes exploitables :
@@ -115,23 +108,9 @@ st.markdown("""
 """)
 
 with st.expander("Découvrir le code"):
-    with st.echo():
-        # Initialisation des colonnes à remplir
-        netflix['duration_min'] = np.nan # Colonne pour la durée des films
-        netflix['duration_seasons'] = np.nan # Colonne pour le nombre de saisons
+    st.code(get_step_source(split_duration), language="python")
 
-        # Création des masques pour séparer Films et Séries
-        mask_films = (netflix['type'] == 'Movie') & (netflix['duration'].notna())
-        mask_series = (netflix['type'] == 'TV Show') & (netflix['duration'].notna())
-
-        # Application des masques et séparation
-        # Durée des films
-        netflix.loc[mask_films, 'duration_min'] = netflix.loc[mask_films, 'duration'].str.replace(' min', '').astype(float)
-
-        # Durée des séries
-        netflix.loc[mask_series, 'duration_seasons'] = netflix.loc[mask_series, 'duration'].str.replace(' Seasons', '').str.replace(' Season', '').astype(float)
-
-st.dataframe(netflix.head(), use_container_width=True)
+render_snapshot(snapshots[1])
 
 st.markdown("""
     À l'aide du script précédent, on obtient two nouvelles colonnes numériques :
@@ -151,18 +130,14 @@ st.markdown("""
 """)
 
 with st.expander("Découvrir le code"):
-    with st.echo():
-        # Pour les pays 
-        netflix['main_country'] = netflix['country'].str.split(',').str[0]
+    st.code(get_step_source(extract_main_features), language="python")
 
-        # Pour les catégories
-        netflix['main_genre'] = netflix['listed_in'].str.split(',').str[0]
-
-st.dataframe(netflix.head(), use_container_width=True)
+render_snapshot(snapshots[2])
 
 st.markdown("""
-    Ce script nous permet d'obtenir **deux** nouvelles colonnes exploitables :
+    Ce script nous permet d'obtenir **trois** nouvelles colonnes exploitables :
     * `main_country` : Le pays de production principal.
+    * `main_country_code` : Son code ISO-3 (ex: "USA"), qui permet de joindre ce dataset avec d'autres sources sans dépendre de l'orthographe du pays.
     * `main_genre` : Le genre principal.
 """)
 
@@ -177,28 +152,11 @@ st.markdown("""
 """)
 
 with st.expander("Découvrir le code"):
-    with st.echo():
-        # Ma liste de colonnes finales
-        columns_final = [
-            'show_id', 
-            'type', 
-            'title', 
-            'main_country', 
-            'main_genre', 
-            'release_year', 
-            'date_added_feature',
-            'year_added', 
-            'month_added', 
-            'added_day_of_month', 
-            'lag_time', 
-            'duration_min', 
-            'duration_seasons'
-        ]
-
-        # Nouveau dataframe :
-        netflix_cleaned = netflix[columns_final].copy()
-
-st.dataframe(netflix_cleaned.head(), use_container_width=True)
+    # Ma liste de colonnes finales
+    st.code("COLUMNS_FINAL = " + pformat(COLUMNS_FINAL), language="python")
+    st.code(get_step_source(select_final_columns), language="python")
+
+render_snapshot(snapshots[3])
 
 st.write("""
     Ainsi, notre travail de data cleaning prend fin.
@@ -209,21 +167,11 @@ st.write("""
 
 
 # =====================================================================================================================
-# Telecharger notre dataframe en csv
-# Optimisation (Mise en cache du 'to_csv')
-@st.cache_data
-def convert_df_to_csv(df):
-    """Convertit un DataFrame en CSV (encodé en UTF-8) en mémoire."""
-    return df.to_csv(index=False).encode('utf-8')
-
-csv_data = convert_df_to_csv(netflix_cleaned)
-
-# Le bouton de téléchargement
-st.download_button(
-    label="Télécharger le DataFrame nettoyé (netflix_cleaned.csv)",
-    data=csv_data,
-    file_name="netflix_cleaned.csv",
-    mime="text/csv",
+# Telecharger notre dataframe (CSV ou Parquet)
+# Optimisation : fichiers générés une seule fois (utils/downloads.py) et partagés entre les sessions
+render_download_buttons(
+    "netflix_cleaned",
+    label="Télécharger le DataFrame nettoyé",
     use_container_width=True
 )
 
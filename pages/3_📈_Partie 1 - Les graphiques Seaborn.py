@@ -22,8 +22,10 @@ Dashboard interactif.
 import pandas as pd
 import streamlit as st
 import seaborn as sns
-import matplotlib.pyplot as plt
-from utils.chart_styles import setup_netflix_theme
+from matplotlib.artist import setp
+from utils.chart_styles import setup_netflix_theme, new_figure, figure_to_png
+from utils.cache_registry import cached_data
+from utils.pandas_helpers import get_duration_box_stats
 from data_loader import load_netflix_data_analysis 
 
 # Configuration de la page principale
@@ -155,9 +157,11 @@ st.subheader("Graphe 1 : Comparaison films VS séries (`countplot`)")
 with st.expander("Découvrir le code"):
     with st.echo():
         # Optimisation (Mise en cache)
-        @st.cache_data
+        @cached_data(max_entries=2)
         def create_countplot_figure(data_df, palette, color):
-            fig, ax = plt.subplots()
+            # Figure orientée objet (sans l'état global de pyplot) : sûre entre sessions concurrentes
+            fig = new_figure()
+            ax = fig.subplots()
             sns.countplot(
                 data=data_df,
                 x='type',
@@ -172,11 +176,12 @@ with st.expander("Découvrir le code"):
             
             for container in ax.containers:
                 ax.bar_label(container, fontsize=12, color=color)
-            return fig
+            # Encodage PNG puis libération de la figure
+            return figure_to_png(fig)
 
 # Affichage du graphe
 fig_countplot = create_countplot_figure(netflix, binary_palette, DARK_GREY)
-st.pyplot(fig_countplot)
+st.image(fig_countplot, width="stretch")
 
 with st.expander("🔍 Lire l'analyse"):
     st.markdown("""
@@ -198,12 +203,13 @@ nb_top_countries = st.number_input("Entrez un nombre pour modifier le graphe", m
 with st.expander("Découvrir le code"):
     with st.echo():
         # Optimisation (Mise en cache)
-        @st.cache_data
+        @cached_data(max_entries=16)
         def create_barplot_figure(data_df, num_top, color):
             top_data = data_df['main_country'].value_counts().head(num_top).reset_index()
             top_data.columns = ['country', 'count']
             
-            fig, ax = plt.subplots(figsize=(10, 8))
+            fig = new_figure(figsize=(10, 8))
+            ax = fig.subplots()
             sns.barplot(
                 data=top_data,
                 x='count',
@@ -215,12 +221,12 @@ with st.expander("Découvrir le code"):
             ax.set_title(f'Top {num_top} des Pays Producteurs')
             ax.set_xlabel('Nombre de Titres')
             ax.set_ylabel('Pays')
-            sns.despine(left=True, bottom=True)
-            return fig
+            sns.despine(ax=ax, left=True, bottom=True)
+            return figure_to_png(fig)
 
 # Affichage du graphique
 fig_barplot = create_barplot_figure(netflix, nb_top_countries, NETFLIX_RED)
-st.pyplot(fig_barplot)
+st.image(fig_barplot, width="stretch")
 
 with st.expander("🔍 Lire l'analyse"):
     st.markdown("""
@@ -241,9 +247,10 @@ nb_bins_hist = st.number_input("Faites varier le nombre de bins", min_value=20,
 with st.expander("Découvrir le code"):
     with st.echo():
         # Optimisation (Mise en cache)
-        @st.cache_data
+        @cached_data(max_entries=16)
         def create_histplot_figure(data_df, bins, color, dark_grey_color):
-            fig, ax = plt.subplots()
+            fig = new_figure()
+            ax = fig.subplots()
             sns.histplot(
                 data=data_df,
                 x='release_year',
@@ -258,11 +265,11 @@ with st.expander("Découvrir le code"):
             ax.set_title('Distribution des Années de Sortie du Contenu')
             ax.set_xlabel('Année de Sortie')
             ax.set_ylabel('Fréquence')
-            return fig
+            return figure_to_png(fig)
 
 # Affichage du graphe
 fig_hist = create_histplot_figure(netflix, nb_bins_hist, NETFLIX_RED, DARK_GREY)
-st.pyplot(fig_hist)
+st.image(fig_hist, width="stretch")
 
 with st.expander("🔍 Lire l'analyse"):
     st.markdown("""
@@ -279,9 +286,10 @@ st.subheader("Graphe 4 : Matrice de corrélation (`heatmap`)")
 with st.expander("Découvrir le code"):
     with st.echo():
         # Optimisation (Mise en cache)
-        @st.cache_data
+        @cached_data(max_entries=2)
         def create_heatmap_figure(data_df):
-            fig, ax = plt.subplots(figsize=(10, 8))
+            fig = new_figure(figsize=(10, 8))
+            ax = fig.subplots()
             numeric_cols = ['release_year', 'year_added', 'month_added', 'lag_time', 'duration_min', 'duration_seasons']
             corr_matrix = data_df[numeric_cols].corr()
             sns.heatmap(
@@ -294,13 +302,13 @@ with st.expander("Découvrir le code"):
                 ax=ax
             )
             ax.set_title('Matrice de Corrélation')
-            plt.xticks(rotation=45, ha="right")
-            plt.yticks(rotation=0)
-            return fig
+            setp(ax.get_xticklabels(), rotation=45, ha="right")
+            setp(ax.get_yticklabels(), rotation=0)
+            return figure_to_png(fig)
 
 # Affichage du graphe
 fig_heatmap = create_heatmap_figure(netflix)
-st.pyplot(fig_heatmap)
+st.image(fig_heatmap, width="stretch")
 
 with st.expander("🔍 Lire l'analyse"):
     st.markdown("""
@@ -316,39 +324,39 @@ st.subheader("Graphe 5 : Durée moyenne selon le type de contenu (`boxplot`)")
 
 with st.expander("Découvrir le code"):
     with st.echo():
-        # Optimisation (Mise en cache)
-        @st.cache_data
-        def create_boxplots_figures(data_df, movie_color, series_color):
+        # Optimisation : les résumés (quartiles, moustaches, valeurs aberrantes)
+        # sont calculés une seule fois par `get_duration_box_stats`,
+        # puis les boîtes sont tracées directement avec `Axes.bxp`.
+        @cached_data(max_entries=2)
+        def create_boxplots_figures(box_stats, movie_color, series_color):
             # Graphique 1 : Durée des films
-            fig1, ax1 = plt.subplots()
-            sns.boxplot(
-                data=data_df[data_df['type'] == 'Movie'],
-                x='duration_min',
-                color=movie_color,
-                ax=ax1)
+            fig1 = new_figure()
+            ax1 = fig1.subplots()
+            ax1.bxp([box_stats['movies']], orientation='horizontal', patch_artist=True,
+                    boxprops={'facecolor': movie_color}, flierprops={'marker': 'd'})
+            ax1.set_yticks([])
             ax1.set_title('Distribution de la Durée des Films (en minutes)')
             ax1.set_xlabel('Durée (minutes)')
 
             # Graphique 2 : Nombre de Saisons des Séries
-            fig2, ax2 = plt.subplots()
-            sns.boxplot(
-                data=data_df[data_df['type'] == 'TV Show'].dropna(subset=['duration_seasons']),
-                x='duration_seasons',
-                color=series_color,
-                ax=ax2)
+            fig2 = new_figure()
+            ax2 = fig2.subplots()
+            ax2.bxp([box_stats['series']], orientation='horizontal', patch_artist=True,
+                    boxprops={'facecolor': series_color}, flierprops={'marker': 'd'})
+            ax2.set_yticks([])
             ax2.set_title('Distribution du Nombre de Saisons (Séries TV)')
             ax2.set_xlabel('Nombre de Saisons')
             
-            return fig1, fig2
+            return figure_to_png(fig1), figure_to_png(fig2)
 
 col3, col4 = st.columns(2)
 
 # Affichage de nos boxplots
-fig_box1, fig_box2 = create_boxplots_figures(netflix, NETFLIX_RED, DARK_GREY)
+fig_box1, fig_box2 = create_boxplots_figures(get_duration_box_stats(netflix), NETFLIX_RED, DARK_GREY)
 with col3:
-    st.pyplot(fig_box1)
+    st.image(fig_box1, width="stretch")
 with col4:
-    st.pyplot(fig_box2)
+    st.image(fig_box2, width="stretch")
 
 with st.expander("🔍 Lire l'analyse"):
     st.markdown("""
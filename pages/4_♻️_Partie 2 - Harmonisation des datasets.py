@@ -1,7 +1,10 @@
 # Importation des dépendances
-import pandas as pd
 import streamlit as st
-from data_loader import load_happiness_all_df
+from data_loader import load_happiness_all_df, get_dataset_version
+from utils import happiness_harmonization
+from utils.happiness_harmonization import RAW_PATHS, REGION_REFERENCE_YEAR
+from utils.downloads import render_download_buttons
+from utils.pipeline_runner import get_happiness_harmonization_snapshots, get_step_source, render_snapshot
 
 # Configuration de la page principale
 st.set_page_config(
@@ -130,95 +133,33 @@ st.write("")
 st.subheader("Harmonisation des dataframes")
 
 with st.expander("Découvrir le code"):
-    
-    with st.echo():
-        # Régularisation des dataframes
-        # 1. Définition des dictionnaires de renommage pour chaque année
-        COLS_2015 = {
-            'Country': 'Country', 'Region': 'Region', 'Happiness Rank': 'Rank', 'Happiness Score': 'Score',
-            'Economy (GDP per Capita)': 'GDP_per_Capita', 'Family': 'Social_Support',
-            'Health (Life Expectancy)': 'Health_Life_Expectancy', 'Freedom': 'Freedom',
-            'Trust (Government Corruption)': 'Trust_Government_Corruption', 'Generosity': 'Generosity'
-        }
-        COLS_2016 = {
-            'Country': 'Country', 'Region': 'Region', 'Happiness Rank': 'Rank', 'Happiness Score': 'Score',
-            'Economy (GDP per Capita)': 'GDP_per_Capita', 'Family': 'Social_Support',
-            'Health (Life Expectancy)': 'Health_Life_Expectancy', 'Freedom': 'Freedom',
-            'Trust (Government Corruption)': 'Trust_Government_Corruption', 'Generosity': 'Generosity'
-        }
-        COLS_2017 = {
-            'Country': 'Country', 'Happiness.Rank': 'Rank', 'Happiness.Score': 'Score',
-            'Economy..GDP.per.Capita.': 'GDP_per_Capita', 'Family': 'Social_Support',
-            'Health..Life.Expectancy.': 'Health_Life_Expectancy', 'Freedom': 'Freedom',
-            'Trust..Government.Corruption.': 'Trust_Government_Corruption', 'Generosity': 'Generosity'
-        }
-        COLS_2018 = {
-            'Country or region': 'Country', 'Overall rank': 'Rank', 'Score': 'Score',
-            'GDP per capita': 'GDP_per_Capita', 'Social support': 'Social_Support',
-            'Healthy life expectancy': 'Health_Life_Expectancy', 'Freedom to make life choices': 'Freedom',
-            'Perceptions of corruption': 'Trust_Government_Corruption', 'Generosity': 'Generosity'
-        }
-        COLS_2019 = COLS_2018 # 2019 est identique à 2018
-
-        # 2. Création d'une liste vide pour stocker nos DataFrames nettoyés
-        dfs_to_concat = []
-
-        try:
-            # --- 2015 ---
-            df_2015 = df_2015[list(COLS_2015.keys())].rename(columns=COLS_2015)
-            df_2015['Year'] = 2015
-            dfs_to_concat.append(df_2015)
-            st.write("Fichier 2015 traité.")
-            
-            # --- 2016 ---
-            df_2016 = df_2016[list(COLS_2016.keys())].rename(columns=COLS_2016)
-            df_2016['Year'] = 2016
-            dfs_to_concat.append(df_2016)
-            st.write("Fichier 2016 traité.")
-            
-            # Création de la table de correspondance pour les Régions
-            region_map = df_2016[['Country', 'Region']].drop_duplicates().set_index('Country')['Region']
-            
-            # --- 2017 ---
-            df_2017 = df_2017[list(COLS_2017.keys())].rename(columns=COLS_2017)
-            df_2017['Year'] = 2017
-            df_2017['Region'] = df_2017['Country'].map(region_map)
-            dfs_to_concat.append(df_2017)
-            st.write("Fichier 2017 traité (régions ajoutées).")
-            
-            # --- 2018 ---
-            df_2018 = df_2018[list(COLS_2018.keys())].rename(columns=COLS_2018)
-            df_2018['Year'] = 2018
-            df_2018['Region'] = df_2018['Country'].map(region_map)
-            dfs_to_concat.append(df_2018)
-            st.write("Fichier 2018 traité (régions ajoutées).")
-
-            # --- 2019 ---
-            df_2019 = df_2019[list(COLS_2019.keys())].rename(columns=COLS_2019)
-            df_2019['Year'] = 2019
-            df_2019['Region'] = df_2019['Country'].map(region_map)
-            dfs_to_concat.append(df_2019)
-            st.write("Fichier 2019 traité (régions ajoutées).")
-            
-            # 3. Concaténation
-            df_final = pd.concat(dfs_to_concat, ignore_index=True)
-            st.success("--- Concaténation terminée ! ---")
-            
-            # 4. Vérification et Sauvegarde
-            st.write(f"Dimensions du DataFrame final : {df_final.shape}")
-            
-            output_filename = "world_happiness_2015-2019_combined.csv"
-            st.write(f"DataFrame final prêt (non sauvegardé ici, mais disponible en téléchargement).")
-            
-            # Affichage du résultat (df_final) à l'intérieur de l'expander
-            st.subheader("Aperçu du DataFrame Final Harmonisé")
-            st.dataframe(df_final.head())
-
-        except KeyError as e:
-            st.error(f"ERREUR : Une colonne attendue n'a pas été trouvée. Vérifiez les dictionnaires de renommage.")
-            st.error(e)
-        except Exception as e:
-            st.error(f"Une erreur inattendue est survenue : {e}")
+    # Code exécuté : module utils/happiness_harmonization.py
+    st.code(get_step_source(happiness_harmonization), language="python")
+
+# Optimisation : l'harmonisation n'est exécutée qu'une fois par version des fichiers bruts ;
+# la page ré-affiche ensuite l'état capturé de chaque fichier et du DataFrame final.
+harmonization = None
+try:
+    harmonization = get_happiness_harmonization_snapshots(get_dataset_version(*RAW_PATHS.values()))
+except KeyError as e:
+    st.error(f"ERREUR : Une colonne attendue n'a pas été trouvée. Vérifiez les dictionnaires de renommage.")
+    st.error(e)
+except Exception as e:
+    st.error(f"Une erreur inattendue est survenue : {e}")
+
+if harmonization is not None:
+    year_tabs = st.tabs([f"Fichier {year}" for year in harmonization['years']])
+    for tab, (year, snapshot) in zip(year_tabs, harmonization['years'].items()):
+        with tab:
+            st.write(f"Fichier {year} traité{' (régions ajoutées)' if year > REGION_REFERENCE_YEAR else ''}.")
+            render_snapshot(snapshot)
+
+    st.success("--- Concaténation terminée ! ---")
+    st.write(f"Dimensions du DataFrame final : {harmonization['final']['shape']}")
+    st.write("DataFrame final prêt (non sauvegardé ici, mais disponible en téléchargement).")
+
+    st.subheader("Aperçu du DataFrame Final Harmonisé")
+    render_snapshot(harmonization['final'])
 
 
 st.markdown("""
@@ -278,17 +219,18 @@ st.markdown("""
 
     Action :
 
-    Une table de correspondance ("mapping") Pays -> Région a été extraite du fichier de 2016 (qui était complet).  
-    Cette table a été utilisée pour "remplir" la colonne Region manquante dans les fichiers de 2017, 2018 et 2019, en se basant sur la colonne Country.  
+    Chaque nom de pays est d'abord converti en code ISO-3 (`ISO_Code`) par le service `utils/country_names.py`, afin que des variantes comme "Trinidad & Tobago" / "Trinidad and Tobago" ou "North Cyprus" / "Northern Cyprus" désignent le même pays.  
+    Une table de correspondance ("mapping") Code ISO -> Région a ensuite été extraite du fichier de 2016 (qui était complet).  
+    Cette table a été utilisée pour "remplir" la colonne Region manquante dans les fichiers de 2017, 2018 et 2019, en se basant sur la colonne ISO_Code.  
 
-    Note : Ce processus a réussi à récupérer la majorité des régions (764 sur 782), les 18 NaN restants correspondant à des pays qui n'avaient pas de correspondance dans les données de 2016.
+    Note : Ce processus a réussi à récupérer la majorité des régions (771 sur 782), les 11 NaN restants correspondant à des pays absents des données de 2016 (ex : Mozambique, Lesotho).
 
     ---        
 
     ##### Opération 5 : Concaténation Verticale
     Assembler les 5 DataFrames (maintenant propres et harmonisés) en un seul grand DataFrame.  
     Action : La fonction pd.concat() a été utilisée pour "empiler" verticalement les DataFrames.  
-    Résultat : Un DataFrame unique de 782 lignes (158 + 157 + 155 + 156 + 156) et 11 colonnes (les 10 du schéma + Year), ne conservant que les NaN qui existaient dans les données sources ou qui n'ont pas pu être mappés (pour Region). 
+    Résultat : Un DataFrame unique de 782 lignes (158 + 157 + 155 + 156 + 156) et 12 colonnes (les 10 du schéma + Year + ISO_Code), ne conservant que les NaN qui existaient dans les données sources ou qui n'ont pas pu être mappés (pour Region). 
     
     **Aucune ligne n'a été perdue.**
             
@@ -304,20 +246,12 @@ st.write("")
 st.markdown("""Téléchargez le nouveau dataframe et passez à la visualisation avec Plotly""")
 col_next1, col_next2 = st.columns(2)
 
-# Telechargement du fichier harmonisé
-@st.cache_data
-def convert_df_to_csv(df):
-    return df.to_csv(index=False).encode('utf-8')
-
-csv_data = convert_df_to_csv(df_final) 
-
-
+# Telechargement du fichier harmonisé (CSV ou Parquet)
+# Optimisation : fichiers générés une seule fois (utils/downloads.py) et partagés entre les sessions
 with col_next1 :
-    st.download_button(
-        label="Téléchargez le nouveau DataFrame en CSV",
-        data=csv_data, 
-        file_name="world_happiness_2015-2019_combined.csv",
-        mime="text/csv",
+    render_download_buttons(
+        "world_happiness_2015-2019_combined",
+        label="Téléchargez le nouveau DataFrame",
         icon="🗒️",
         use_container_width=True
     )
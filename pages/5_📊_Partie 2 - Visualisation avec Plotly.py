@@ -20,7 +20,7 @@ un outil d'exploration interactif et dynamique.
 import pandas as pd
 import plotly.express as px
 import streamlit as st
-from utils.chart_styles import get_happiness_layout
+from utils.chart_styles import get_happiness_layout, register_happiness_template, get_render_mode
 from data_loader import load_happiness_data_analysis
 
 try:
@@ -69,7 +69,9 @@ with st.expander("Afficher le DataFrame harmonisé complet (782 lignes)"):
 
 # ===========================================================================================
 # --- Chargement de la charte graphique ---
-CONTINUOUS_PALETTE, CATEGORICAL_PALETTE, GLOBAL_TEMPLATE_LAYOUT = get_happiness_layout()
+CONTINUOUS_PALETTE, CATEGORICAL_PALETTE, _ = get_happiness_layout()
+# Charte enregistrée une seule fois comme template Plotly nommé (`plotly.io.templates`)
+HAPPINESS_TEMPLATE = register_happiness_template()
 
 # ==========================================================================================================================
 st.divider()
@@ -87,8 +89,8 @@ with st.expander("Découvrir le code"):
 
         fig_map = px.choropleth(
             world_happiness_report,
-            locations='Country',
-            locationmode='country names', 
+            locations='ISO_Code', # Code ISO-3 : aucun pays perdu à cause de son orthographe
+            locationmode='ISO-3', 
             color='Score', 
             animation_frame='Year', 
             animation_group='Country', 
@@ -98,16 +100,15 @@ with st.expander("Découvrir le code"):
                 'Rank': True,
                 'GDP_per_Capita': ':.2f',
                 'Year': True,
-                'Country': False
+                'Country': False,
+                'ISO_Code': False
             },
             color_continuous_scale=CONTINUOUS_PALETTE,
             range_color = [global_min_score, global_max_score],
-            title='Évolution du Score de Bonheur dans le Monde (2015-2019)'
+            title='Évolution du Score de Bonheur dans le Monde (2015-2019)',
+            template=HAPPINESS_TEMPLATE # Application de notre template
         )
 
-        # Application de notre template
-        fig_map.update_layout(GLOBAL_TEMPLATE_LAYOUT)
-
         # Personnalisation de la carte
         fig_map.update_layout(
             geo=dict(
@@ -161,11 +162,12 @@ with st.expander("Découvrir le code"):
             labels = { 
                 'GDP_per_Capita': 'PIB par Habitant',
                 'Score': 'Score de Bonheur'
-            }
+            },
+            # SVG jusqu'à 1 000 points par image, WebGL au-delà
+            render_mode = get_render_mode(world_happiness_report.groupby('Year').size().max()),
+            template = HAPPINESS_TEMPLATE # Application de notre template
         )
-        # Application de notre template
-        fig_scatter.update_layout(GLOBAL_TEMPLATE_LAYOUT)
-        fig_scatter.update_layout(title_x=0.5, title_y=0.95, title_yanchor='top')
+        fig_scatter.update_layout(title_y=0.95, title_yanchor='top', legend_title_text='')
 
 st.plotly_chart(fig_scatter, use_container_width=True)
 with st.expander("🔍 Lire l'analyse"):
@@ -211,11 +213,11 @@ with st.expander("Découvrir le code"):
             labels={
                 'GDP_per_Capita': 'PIB par Habitant',
                 'Year': 'Année'
-            }
+            },
+            render_mode=get_render_mode(len(df_filtered)),
+            template=HAPPINESS_TEMPLATE # Application de notre template
         )
-        # Application de notre template
-        fig_line.update_layout(GLOBAL_TEMPLATE_LAYOUT)
-        fig_line.update_layout(title_x=0.5, title_y=0.9, title_yanchor='top')
+        fig_line.update_layout(title_y=0.9, title_yanchor='top', legend_title_text='')
 
 st.plotly_chart(fig_line, use_container_width=True)
 with st.expander("🔍 Lire l'analyse"):
@@ -279,11 +281,11 @@ with st.expander("Découvrir le code"):
             hover_name='Country',
             range_x=[min_gdp, max_gdp],
             title='Top 10 des Pays par PIB par Habitant (2015-2019)',
-            labels={'GDP_per_Capita':'PIB par habitant', 'Country':'Pays'}
+            labels={'GDP_per_Capita':'PIB par habitant', 'Country':'Pays'},
+            template=HAPPINESS_TEMPLATE
         )
-        fig_top.update_layout(GLOBAL_TEMPLATE_LAYOUT)
         fig_top.update_layout(yaxis_categoryorder='total ascending')
-        fig_top.update_layout(title_x=0.5, title_y=0.95, title_yanchor='top')
+        fig_top.update_layout(title_y=0.95, title_yanchor='top', legend_title_text='')
 
         # Flop 10 =========================================================================
         max_gdp = flop_10_final['GDP_per_Capita'].max() * 1.05
@@ -299,11 +301,11 @@ with st.expander("Découvrir le code"):
             hover_name='Country',
             range_x=[min_gdp, max_gdp],
             title='Flop 10 des Pays par PIB par Habitant (2015-2019)',
-            labels={'GDP_per_Capita':'PIB par habitant', 'Country':'Pays'}
+            labels={'GDP_per_Capita':'PIB par habitant', 'Country':'Pays'},
+            template=HAPPINESS_TEMPLATE
         )
-        fig_flop.update_layout(GLOBAL_TEMPLATE_LAYOUT)
         fig_flop.update_layout(yaxis_categoryorder='total ascending')
-        fig_flop.update_layout(title_x=0.5, title_y=0.95, title_yanchor='top')
+        fig_flop.update_layout(title_y=0.95, title_yanchor='top', legend_title_text='')
 
 # Affichage des graphiques
 st.plotly_chart(fig_top, use_container_width=True)
@@ -338,13 +340,12 @@ with st.expander("Découvrir le code"):
             zmin = -1, zmax = 1, 
             text_auto = True, 
             aspect = "auto", 
-            title = 'Matrice de Corrélation Interactive'
+            title = 'Matrice de Corrélation Interactive',
+            template = HAPPINESS_TEMPLATE # Application de notre template
         )
         # Formatage du texte pour n'avoir que 2 décimales
         fig_heatmap.update_traces(texttemplate="%{z:.2f}")
-        # Application de notre template
-        fig_heatmap.update_layout(GLOBAL_TEMPLATE_LAYOUT)
-        fig_heatmap.update_layout(title_x=0.5, title_y=0.95, title_yanchor='top')
+        fig_heatmap.update_layout(title_y=0.95, title_yanchor='top')
 
 # Affichage du graphe
 st.plotly_chart(fig_heatmap, use_container_width=True)
@@ -6,12 +6,15 @@ de graphiques lui-même, mais agit comme un **routeur** central.
 
 Son rôle est de :
 1.  Charger les deux DataFrames principaux (Netflix, Happiness)
-    via le `data_loader` (qui les met en cache).
+    via le `data_loader` (qui les met en cache). Avec le backend SQL
+    (`DASHBOARD_QUERY_BACKEND`, cf. `utils/sql_backend.py`), le dashboard
+    Netflix interroge un catalogue DuckDB au lieu du DataFrame Netflix.
 2.  Afficher le `st.sidebar.selectbox` principal qui permet
-    de choisir entre "Netflix" et "World Happiness Report".
-3.  Utiliser une structure `if/else` pour appeler la fonction
-    de rendu appropriée (`render_netflix_dashboard` ou
-    `render_happiness_dashboard`).
+    de choisir entre "Netflix", "World Happiness Report" et
+    la vue croisée "Netflix x World Happiness".
+3.  Utiliser une structure `if/elif/else` pour appeler la fonction
+    de rendu appropriée (`render_netflix_dashboard`,
+    `render_happiness_dashboard` ou `render_crossover_dashboard`).
 
 Cette architecture modulaire (importer depuis `/dashboards`) permet
 de garder ce fichier propre et de séparer la logique de chaque
@@ -21,12 +24,16 @@ dashboard, le rendant plus facile à maintenir et à déboguer.
 # Imporation des dépendances
 import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
 import  seaborn as sns
 import plotly.express as px
-from data_loader import load_netflix_data_analysis, load_happiness_data_analysis
+from data_loader import (load_netflix_data_analysis, load_happiness_data_analysis, load_netflix_index,
+                         load_netflix_happiness_panel, load_netflix_catalogue, get_dataset_version,
+                         get_netflix_catalogue_version, use_netflix_sql_backend,
+                         NETFLIX_CLEANED_PATH, HAPPINESS_COMBINED_PATH)
 from dashboards.netflix_page import render_netflix_dashboard
 from dashboards.happiness_page import render_happiness_dashboard
+from dashboards.crossover_page import render_crossover_dashboard
+from utils.profiling import span, render_profiling_panel, export_metrics_throttled, PROFILING_ENABLED
 
 # Configuration de la page principale
 st.set_page_config(
@@ -40,21 +47,52 @@ st.title("Dashboard")
 st.sidebar.subheader("Dashboard 📝")
 
 # Choix du dataset
-list_dataset = ["Netflix", "World Happiness Report"]
-dataframe = st.sidebar.selectbox("Choisissez un dataset", list_dataset)
+list_dataset = ["Netflix", "World Happiness Report", "Netflix x World Happiness"]
+dataframe = st.sidebar.selectbox("Choisissez un dataset", list_dataset, key="dashboard_dataset")
 st.sidebar.write("")
 
 # Chargement des dataframes
-netflix = load_netflix_data_analysis()
-if netflix is None:
-    st.stop()
+# (le catalogue Netflix en SQL n'a pas besoin du DataFrame Netflix)
+netflix_sql = use_netflix_sql_backend()
+netflix = None
+if not netflix_sql:
+    with span("dashboard.load.netflix"):
+        netflix = load_netflix_data_analysis()
+    if netflix is None:
+        st.stop()
 
-world_happiness_report = load_happiness_data_analysis()
+with span("dashboard.load.happiness"):
+    world_happiness_report = load_happiness_data_analysis()
 if world_happiness_report is None:
     st.stop()
 
 # Routage avec les modules
 if dataframe == "Netflix":
-    render_netflix_dashboard(netflix)
+    # Index bitmap (ou catalogue SQL) reconstruit uniquement si le fichier source change
+    if netflix_sql:
+        with span("dashboard.load.netflix_catalogue"):
+            netflix_index = load_netflix_catalogue(get_netflix_catalogue_version())
+    else:
+        with span("dashboard.load.netflix_index"):
+            netflix_index = load_netflix_index(get_dataset_version(NETFLIX_CLEANED_PATH))
+    if netflix_index is None:
+        st.stop()
+    with span("dashboard.netflix"):
+        render_netflix_dashboard(netflix, netflix_index)
+elif dataframe == "World Happiness Report":
+    with span("dashboard.happiness"):
+        render_happiness_dashboard(world_happiness_report)
 else:
-    render_happiness_dashboard(world_happiness_report) 
+    # Table croisée reconstruite uniquement si l'un des fichiers source change
+    with span("dashboard.load.panel"):
+        panel = load_netflix_happiness_panel(get_dataset_version(NETFLIX_CLEANED_PATH, HAPPINESS_COMBINED_PATH))
+    if panel is None:
+        st.stop()
+    with span("dashboard.crossover"):
+        render_crossover_dashboard(panel)
+
+# Instrumentation (uniquement avec DASHBOARD_PROFILING=1)
+render_profiling_panel()
+if PROFILING_ENABLED:
+    export_metrics_throttled()
+ 
@@ -0,0 +1,75 @@
+"""
+Page d'Administration : Observabilité des Caches (7_🛠️_Administration.py).
+
+Cette page n'est pas destinée aux visiteurs : elle expose l'état des
+caches du serveur (toutes sessions confondues), tel que mesuré par le
+registre de `utils/cache_registry.py`.
+
+Son rôle est de :
+1.  Afficher, pour chaque fonction mise en cache, les appels, hits,
+    misses, taux de hit, temps de calcul, entrées, octets stockés et
+    évictions, ainsi que ses bornes (`max_entries`, `ttl`) et, pour les
+    fonctions persistées (`disk=True`), les hits et l'occupation du cache disque.
+2.  Résumer l'empreinte mémoire totale des caches et celle du cache disque.
+3.  Permettre de vider tous les caches (mémoire et disque).
+"""
+
+# Imporation des dépendances
+import pandas as pd
+import streamlit as st
+from utils.cache_registry import get_cache_report, clear_all_caches
+
+# Configuration de la page principale
+st.set_page_config(
+    page_title="Administration",
+    page_icon="🛠️",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+st.sidebar.subheader("Administration 🛠️")
+
+st.title("Administration : Caches")
+st.markdown("""
+Statistiques des fonctions mises en cache depuis le démarrage du serveur.
+Les **entrées** sont les résultats présents en mémoire, suivis clé par clé par le registre ;
+les **évictions** sont les entrées retirées pour respecter `max_entries` (les entrées expirées
+par `ttl` ne sont pas comptées).
+Les **hits disque** (`disk_hits`) sont des misses du cache mémoire servis par le cache
+persistant sur disque (conservé entre deux redémarrages du serveur), sans recalcul.
+""")
+
+report = pd.DataFrame(get_cache_report())
+
+if report.empty:
+    st.info("Aucune fonction mise en cache n'a encore été appelée.", icon="ℹ️")
+    st.stop()
+
+# --- KPIs ---
+kpi_col1, kpi_col2, kpi_col3, kpi_col4, kpi_col5 = st.columns(5, border=True)
+total_calls = report['calls'].sum()
+kpi_col1.metric("Fonctions en cache", len(report))
+kpi_col2.metric("Taux de hit global", f"{report['hits'].sum() / total_calls:.1%}" if total_calls else "N/A")
+kpi_col3.metric("Mémoire stockée", f"{report['bytes'].sum() / 1e6:.1f} Mo")
+kpi_col4.metric("Évictions", int(report['evictions'].sum()))
+kpi_col5.metric("Cache disque", f"{report['disk_bytes'].sum() / 1e6:.1f} Mo", f"{int(report['disk_hits'].sum())} hits",
+                delta_color="off")
+
+# --- Détail par fonction ---
+st.subheader("Détail par fonction")
+st.dataframe(
+    report,
+    width="stretch",
+    hide_index=True,
+    column_config={
+        'hit_rate': st.column_config.ProgressColumn("hit_rate", format="%.2f", min_value=0, max_value=1),
+        'compute_time_s': st.column_config.NumberColumn("compute_time_s", format="%.3f"),
+        'mean_compute_ms': st.column_config.NumberColumn("mean_compute_ms", format="%.1f"),
+    }
+)
+
+col_refresh, col_clear = st.columns([1, 5])
+col_refresh.button("Rafraîchir")
+if col_clear.button("Vider tous les caches", type="primary"):
+    clear_all_caches()
+    st.success("Tous les caches (mémoire et disque) ont été vidés.")
@@ -0,0 +1,18 @@
+"""
+Les modules du dashboard s'importent depuis la racine du dépôt (`utils`,
+`dashboards`, `data_loader`) et lisent `./data/...`, comme avec
+`streamlit run app.py` : les tests s'exécutent depuis cette racine.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture(autouse=True)
+def run_from_repo_root(monkeypatch):
+    monkeypatch.chdir(ROOT_DIR)
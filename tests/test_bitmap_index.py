@@ -0,0 +1,92 @@
+"""
+L'index bitmap (`utils/bitmap_index.py`) doit retourner les mêmes lignes,
+comptes et modes qu'un masque pandas (`df[mask]`), pour toute combinaison
+de filtres du Dashboard Netflix.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_netflix_cleaned
+from data_loader import NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES
+from utils.bitmap_index import build_bitmap_index, count_values, most_frequent, select_rows
+
+N_ROWS = 5_000
+
+
+@pytest.fixture(scope='module')
+def catalogue():
+    df = make_netflix_cleaned(N_ROWS)
+    # Titres sans date d'ajout (comme dans le vrai catalogue) : exclus d'un
+    # intervalle partiel, conservés quand l'intervalle couvre toutes les années
+    rng = np.random.default_rng(0)
+    df.loc[rng.random(N_ROWS) < 0.03, 'year_added'] = np.nan
+    return df, build_bitmap_index(df, NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES)
+
+
+def pandas_mask(df, equals, ranges):
+    """Même sémantique que `select_rows`, sur le DataFrame."""
+    mask = pd.Series(True, index=df.index)
+    for column, values in equals.items():
+        if values:
+            mask &= df[column].isin(values)
+    for column, (start, end) in ranges.items():
+        if start <= df[column].min() and end >= df[column].max():
+            continue
+        mask &= df[column].between(start, end)
+    return mask.to_numpy()
+
+
+def random_filters(df, seed):
+    """Combinaison de filtres tirée au hasard (listes vides comprises)."""
+    rng = np.random.default_rng(seed)
+    equals = {}
+    for column, max_values in (('type', 2), ('main_country', 3), ('main_genre', 2)):
+        values = df[column].dropna().unique()
+        equals[column] = list(rng.choice(values, size=rng.integers(0, max_values + 1), replace=False))
+    ranges = {}
+    for column in NETFLIX_INDEX_RANGES:
+        low, high = df[column].min(), df[column].max()
+        start, end = sorted(rng.uniform(low, high, size=2).round())
+        ranges[column] = (start, end)
+    return equals, ranges
+
+
+CASES = [random_filters(make_netflix_cleaned(N_ROWS), seed) for seed in range(20)] + [
+    # Sélection vide : pays absent du catalogue
+    ({'main_country': ['Atlantis']}, {}),
+    # Intervalle couvrant toutes les années d'ajout : les titres sans date sont gardés
+    ({'type': ['Movie']}, {'year_added': (1900, 2100), 'release_year': (1900, 2100)}),
+    # Aucun filtre
+    ({}, {}),
+]
+
+
+@pytest.mark.parametrize('equals, ranges', CASES)
+def test_bitmap_index_matches_pandas(catalogue, equals, ranges):
+    df, index = catalogue
+    mask = pandas_mask(df, equals, ranges)
+
+    rows = select_rows(index, equals, ranges)
+    np.testing.assert_array_equal(rows, np.flatnonzero(mask))
+
+    filtered = df[mask]
+    for column in ['main_country', 'main_genre', 'type', 'release_year']:
+        for sort in (True, False):
+            expected = filtered[column].value_counts(sort=sort)
+            pd.testing.assert_series_equal(count_values(index, column, rows, sort=sort), expected,
+                                           check_index_type=False)
+        mode = filtered[column].mode()
+        assert most_frequent(index, column, rows) == (mode.iloc[0] if len(mode) else None)
+
+
+def test_full_year_range_keeps_rows_without_year(catalogue):
+    df, index = catalogue
+    low, high = df['year_added'].min(), df['year_added'].max()
+
+    rows = select_rows(index, ranges={'year_added': (low, high)})
+    partial = select_rows(index, ranges={'year_added': (low, high - 1)})
+
+    assert len(rows) == len(df)
+    assert df['year_added'].iloc[partial].notna().all()
@@ -0,0 +1,134 @@
+"""
+Cache persistant sur disque (`utils/disk_cache.py`) : clés, version du code
+et éviction des entrées les moins récemment utilisées.
+"""
+
+import os
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import disk_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, 'DISK_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(disk_cache, '_total_bytes', None)
+    return tmp_path / 'cache'
+
+
+def load_module(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ==========================================================
+# CLÉS
+# ==========================================================
+
+def test_key_depends_on_argument_content():
+    df = pd.DataFrame({'a': [1.0, 2.0], 'b': ['x', 'y']})
+    key = disk_cache.make_key('v', (df, 3), {'n': 10, 'ascending': False})
+
+    assert disk_cache.make_key('v', (df.copy(), 3), {'ascending': False, 'n': 10}) == key
+    assert disk_cache.make_key('v', (df.assign(a=[1.0, 2.5]), 3), {'n': 10, 'ascending': False}) != key
+    assert disk_cache.make_key('v', (df, 3), {'n': 11, 'ascending': False}) != key
+    assert disk_cache.make_key('v', (df.astype({'a': 'float32'}), 3), {'n': 10, 'ascending': False}) != key
+    assert disk_cache.make_key('w', (df, 3), {'n': 10, 'ascending': False}) != key
+
+
+def test_store_then_load(cache_dir):
+    result = {'table': pd.DataFrame({'a': np.arange(5)}), 'value': 1.5}
+    key = disk_cache.make_key('v', (), {})
+
+    assert disk_cache.load('f', key) == (False, None)
+    disk_cache.store('f', key, result)
+    found, loaded = disk_cache.load('f', key)
+
+    assert found
+    pd.testing.assert_frame_equal(loaded['table'], result['table'])
+    assert loaded['value'] == 1.5
+    assert not list(cache_dir.rglob('*.tmp'))
+
+
+# ==========================================================
+# VERSION DU CODE
+# ==========================================================
+
+MODULE_SOURCE = '''
+SCALE = {scale}
+
+def helper(x):
+    return x * SCALE
+
+def cached(x):
+    return helper(x) + 1
+'''
+
+def test_code_version_follows_helpers(tmp_path, monkeypatch, cache_dir):
+    monkeypatch.setattr(disk_cache, 'ROOT_DIR', str(tmp_path))
+    versions = {}
+    for scale in (2, 3):
+        path = tmp_path / f'scale_{scale}' / 'pipeline.py'
+        path.parent.mkdir()
+        path.write_text(MODULE_SOURCE.format(scale=scale))
+        versions[scale] = disk_cache.get_code_version(load_module(path, f'pipeline_{scale}').cached)
+
+    # Seule la constante lue par le helper diffère : la version change
+    assert versions[2] != versions[3]
+
+    # Une entrée écrite par l'ancien code n'est pas relue par le nouveau
+    disk_cache.store('pipeline.cached', disk_cache.make_key(versions[2], (1,), {}), 3)
+    assert disk_cache.load('pipeline.cached', disk_cache.make_key(versions[2], (1,), {})) == (True, 3)
+    assert disk_cache.load('pipeline.cached', disk_cache.make_key(versions[3], (1,), {})) == (False, None)
+
+
+def test_code_version_is_stable(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, 'ROOT_DIR', str(tmp_path))
+    path = tmp_path / 'pipeline.py'
+    path.write_text(MODULE_SOURCE.format(scale=2))
+
+    first = disk_cache.get_code_version(load_module(path, 'pipeline_a').cached)
+    second = disk_cache.get_code_version(load_module(path, 'pipeline_b').cached)
+    assert first == second
+
+
+# ==========================================================
+# ÉVICTION
+# ==========================================================
+
+def test_evicts_least_recently_used_over_limit(cache_dir, monkeypatch):
+    payload = np.random.default_rng(0).random(2_000)  # ~16 Ko, peu compressible
+    for position, key in enumerate(['a', 'b', 'c']):
+        disk_cache.store('f', key, payload)
+        path = disk_cache._entry_path('f', key)
+        os.utime(path, (1_000 + position, 1_000 + position))
+    entry_size = os.path.getsize(disk_cache._entry_path('f', 'a'))
+
+    # 'a' est relue : elle devient la plus récemment utilisée
+    assert disk_cache.load('f', 'a')[0]
+
+    # Borne à 3 entrées : la 4e écriture dépasse et évince la plus ancienne ('b')
+    monkeypatch.setattr(disk_cache, 'DISK_CACHE_MAX_BYTES', int(entry_size * 3.5))
+    monkeypatch.setattr(disk_cache, '_total_bytes', None)
+    disk_cache.store('f', 'd', payload)
+
+    remaining = {key for key in 'abcd' if os.path.exists(disk_cache._entry_path('f', key))}
+    assert remaining == {'a', 'c', 'd'}
+    assert disk_cache._total_bytes == sum(size for _, _, size, _ in disk_cache._iter_entries())
+
+
+def test_no_eviction_under_limit(cache_dir, monkeypatch):
+    monkeypatch.setattr(disk_cache, 'DISK_CACHE_MAX_BYTES', 10_000_000)
+    calls = []
+    monkeypatch.setattr(disk_cache, 'evict', lambda *args, **kwargs: calls.append(args))
+    for key in 'abc':
+        disk_cache.store('f', key, np.arange(100))
+
+    assert calls == []
+    assert disk_cache._total_bytes == sum(size for _, _, size, _ in disk_cache._iter_entries())
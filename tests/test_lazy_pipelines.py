@@ -0,0 +1,20 @@
+"""
+Équivalence des plans paresseux Polars (`utils/lazy_pipelines.py`) et des
+pipelines pandas : nettoyage Netflix et harmonisation du World Happiness Report.
+"""
+
+import pytest
+
+pytest.importorskip('polars')
+
+from utils.lazy_pipelines import assert_same_result, clean_netflix_lazy, harmonize_happiness_lazy
+from utils.netflix_cleaning import clean_netflix
+from utils.happiness_harmonization import load_raw_happiness, harmonize_happiness
+
+
+def test_netflix_lazy_matches_pandas():
+    assert_same_result(clean_netflix_lazy(), clean_netflix())
+
+
+def test_happiness_lazy_matches_pandas():
+    assert_same_result(harmonize_happiness_lazy(), harmonize_happiness(load_raw_happiness()))
@@ -0,0 +1,47 @@
+"""
+Équivalence des deux chemins du nettoyage Netflix (`utils/netflix_cleaning.py`) :
+le nettoyage par morceaux écrit dans Parquet doit relire le même DataFrame
+que le nettoyage en mémoire, quel que soit le découpage.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.netflix_cleaning import clean_netflix, clean_netflix_chunked
+
+RAW_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'netflix_titles.csv')
+
+
+def normalize_types(df):
+    """
+    Uniformise les types qui dépendent du chemin de lecture : texte (object
+    ou StringDtype relu depuis Parquet) en object avec NaN pour les valeurs
+    manquantes, dates en datetime64[ns].
+    """
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].astype('datetime64[ns]')
+        elif pd.api.types.is_string_dtype(df[column]):
+            df[column] = df[column].astype('object').where(df[column].notna(), np.nan)
+    return df
+
+
+@pytest.fixture(scope='module')
+def in_memory():
+    return normalize_types(clean_netflix(RAW_PATH))
+
+
+# Un petit chunksize force plusieurs morceaux (et un dernier morceau incomplet)
+@pytest.mark.parametrize('chunksize', [1_000, 3_333])
+def test_chunked_matches_in_memory(in_memory, tmp_path, chunksize):
+    output_path = tmp_path / 'netflix_cleaned.parquet'
+
+    nb_rows = clean_netflix_chunked(RAW_PATH, output_path, chunksize=chunksize)
+
+    streamed = normalize_types(pd.read_parquet(output_path))
+    assert nb_rows == len(in_memory)
+    pd.testing.assert_frame_equal(streamed, in_memory)
@@ -0,0 +1,122 @@
+"""
+Le backend DuckDB (`utils/sql_backend.py`) doit donner les mêmes résultats
+que l'index bitmap et les helpers pandas pour les mêmes filtres, et ne
+relire son sidecar Parquet que s'il a été écrit pour la version courante du CSV.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('duckdb')
+
+from benchmarks.synthetic import make_netflix_cleaned
+from data_loader import NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES
+from utils import bitmap_index, sql_backend
+from utils.pandas_helpers import compute_box_stats, grouped_box_stats
+
+N_ROWS = 5_000
+
+
+@pytest.fixture(scope='module')
+def csv_path(tmp_path_factory):
+    df = make_netflix_cleaned(N_ROWS)
+    rng = np.random.default_rng(0)
+    df.loc[rng.random(N_ROWS) < 0.03, 'year_added'] = np.nan
+    path = tmp_path_factory.mktemp('catalogue') / 'netflix_cleaned.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope='module')
+def backends(csv_path):
+    df = pd.read_csv(csv_path)
+    index = bitmap_index.build_bitmap_index(df, NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES)
+    catalogue = sql_backend.build_sql_catalogue(csv_path, NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES,
+                                                sidecar=False)
+    yield df, index, catalogue
+    catalogue['con'].close()
+
+
+def random_filters(df, seed):
+    """Combinaison de filtres tirée au hasard (listes vides comprises)."""
+    rng = np.random.default_rng(seed)
+    equals = {}
+    for column, max_values in (('type', 2), ('main_country', 3), ('main_genre', 2)):
+        values = df[column].dropna().unique()
+        equals[column] = list(rng.choice(values, size=rng.integers(0, max_values + 1), replace=False))
+    ranges = {}
+    for column in NETFLIX_INDEX_RANGES:
+        start, end = sorted(rng.uniform(df[column].min(), df[column].max(), size=2).round())
+        ranges[column] = (start, end)
+    return equals, ranges
+
+
+FILTERS = [random_filters(make_netflix_cleaned(N_ROWS), seed) for seed in range(10)] + [
+    ({'main_country': ['Atlantis']}, {}),
+    ({'type': ['Movie']}, {'year_added': (1900, 2100)}),
+    ({}, {}),
+]
+
+
+def assert_same_summary(sql_summary, pandas_summary):
+    """Compare deux résumés de boxplot (format de `compute_box_stats`)."""
+    if pandas_summary is None:
+        assert sql_summary is None
+        return
+    assert sql_summary.keys() == pandas_summary.keys()
+    assert sql_summary['label'] == pandas_summary['label']
+    assert sql_summary['n'] == pandas_summary['n']
+    for key in ('med', 'q1', 'q3', 'whislo', 'whishi', 'mean'):
+        assert sql_summary[key] == pytest.approx(pandas_summary[key], rel=1e-12)
+    np.testing.assert_allclose(sql_summary['fliers'], pandas_summary['fliers'], rtol=1e-12)
+
+
+@pytest.mark.parametrize('equals, ranges', FILTERS)
+def test_sql_matches_bitmap_index(backends, equals, ranges):
+    df, index, catalogue = backends
+    rows = bitmap_index.select_rows(index, equals, ranges)
+    selection = sql_backend.select_rows(catalogue, equals, ranges)
+
+    assert sql_backend.count_rows(catalogue, selection) == len(rows)
+    for column in ['main_country', 'main_genre', 'type', 'release_year']:
+        for sort in (True, False):
+            pd.testing.assert_series_equal(sql_backend.count_values(catalogue, column, selection, sort=sort),
+                                           bitmap_index.count_values(index, column, rows, sort=sort),
+                                           check_index_type=False)
+        assert sql_backend.most_frequent(catalogue, column, selection) == bitmap_index.most_frequent(index, column, rows)
+
+
+@pytest.mark.parametrize('equals, ranges', FILTERS)
+def test_sql_box_stats_match_pandas(backends, equals, ranges):
+    df, index, catalogue = backends
+    filtered = df.iloc[bitmap_index.select_rows(index, equals, ranges)]
+    selection = sql_backend.select_rows(catalogue, equals, ranges)
+
+    assert_same_summary(sql_backend.box_stats(catalogue, 'duration_min', selection, label='Films'),
+                        compute_box_stats(filtered['duration_min'], label='Films'))
+    by_genre = sql_backend.box_stats(catalogue, 'duration_min', selection, by='main_genre', top_n=5)
+    expected = grouped_box_stats(filtered, 'duration_min', 'main_genre', top_n=5)
+    assert len(by_genre) == len(expected)
+    for sql_summary, pandas_summary in zip(by_genre, expected):
+        assert_same_summary(sql_summary, pandas_summary)
+
+
+def test_sidecar_reused_then_invalidated(csv_path, tmp_path):
+    path = str(tmp_path / 'netflix_cleaned.csv')
+    pd.read_csv(csv_path).to_csv(path, index=False)
+    # Fichier au nom "x.parquet" écrit par un autre traitement : jamais lu par le backend
+    pd.DataFrame({'other': [1, 2]}).to_parquet(tmp_path / 'netflix_cleaned.parquet')
+
+    def load(version):
+        catalogue = sql_backend.build_sql_catalogue(path, NETFLIX_INDEX_CATEGORICAL, NETFLIX_INDEX_RANGES,
+                                                    source_version=version)
+        catalogue['con'].close()
+        return catalogue['source'], catalogue['n_rows']
+
+    sidecar = sql_backend.sidecar_path(path)
+    assert load('v1') == (path, N_ROWS)
+    assert load('v1') == (sidecar, N_ROWS)
+    # Nouvelle version du CSV : le sidecar est ignoré puis réécrit
+    assert load('v2') == (path, N_ROWS)
+    assert load('v2') == (sidecar, N_ROWS)
@@ -0,0 +1,257 @@
+"""
+Module de Registre des Caches (observabilité et bornes).
+
+L'application repose sur de nombreuses fonctions mises en cache (loaders,
+charte graphique, constructeurs de figures, agrégations...). Utilisés
+directement, `@st.cache_data` et `@st.cache_resource` ne sont ni bornés
+ni observables : un cache de figures indexé par la valeur d'un slider
+grossit sans limite sur un serveur qui tourne longtemps.
+
+Ce module fournit deux décorateurs, à utiliser à la place des décorateurs
+Streamlit :
+- `@cached_data(max_entries=..., ttl=...)`     -> `st.cache_data`
+- `@cached_resource(max_entries=..., ttl=...)` -> `st.cache_resource`
+
+Chaque fonction décorée est inscrite dans un registre (par processus) qui
+compte les appels, les hits, les misses et le temps de calcul.
+
+Avec `disk=True`, un miss du cache mémoire consulte d'abord le cache
+persistant sur disque (`utils/disk_cache.py`) : le résultat survit aux
+redémarrages du serveur. Les loaders qui lisent des fichiers les
+déclarent dans `source_files` : la version de ces fichiers (empreinte du
+contenu, cf. `utils/data_watcher.py`) entre dans la clé des deux caches.
+
+Streamlit ne publie qu'une statistique agrégée par fonction (octets
+stockés) : le registre suit lui-même les clés présentes en mémoire. Chaque
+miss ajoute sa clé (empreinte des arguments, cf. `disk_cache.make_key`) ;
+au-delà de `max_entries`, la plus ancienne est retirée et comptée comme
+une éviction, et les clés plus vieilles que `ttl` expirent sans être
+comptées. Les hits ne sont pas hachés une seconde fois : la clé retirée
+peut différer de celle que Streamlit évince (LRU), pas leur nombre.
+
+Le rapport (`get_cache_report()`) est affiché sur la page d'administration.
+"""
+
+import time
+import threading
+from functools import wraps
+from collections import OrderedDict
+
+import streamlit as st
+from utils import disk_cache
+from utils.data_watcher import get_file_versions
+from streamlit.time_util import time_to_seconds
+from streamlit.runtime.caching import get_data_cache_stats_provider, get_resource_cache_stats_provider
+
+_lock = threading.Lock()
+_registry = {}
+# Clés présentes dans le cache mémoire, par fonction : clé -> date d'insertion
+_live_keys = {}
+
+
+# ==========================================================
+# DÉCORATEURS
+# ==========================================================
+
+def _register(name, kind, max_entries, ttl, disk):
+    """Inscrit (ou retrouve) une fonction dans le registre."""
+    with _lock:
+        stats = _registry.get(name)
+        if stats is None:
+            stats = _registry[name] = {'calls': 0, 'misses': 0, 'disk_hits': 0, 'compute_time': 0.0,
+                                       'entries': 0, 'evictions': 0}
+            _live_keys[name] = OrderedDict()
+        # Une page qui redéfinit sa fonction à chaque rerun garde ses compteurs
+        stats.update(kind=kind, max_entries=max_entries, ttl=ttl, disk=disk)
+    return stats
+
+def _record_entry(name, key):
+    """
+    Enregistre l'entrée `key` que Streamlit vient de stocker pour `name`,
+    en appliquant les bornes `ttl` puis `max_entries` du cache.
+    """
+    now = time.monotonic()
+    with _lock:
+        stats, live = _registry[name], _live_keys[name]
+        # `ttl` accepte les mêmes formats que Streamlit (secondes, timedelta, "1h"...)
+        ttl = time_to_seconds(stats['ttl'])
+        while live and next(iter(live.values())) + ttl <= now:
+            live.popitem(last=False)
+        if key in live:
+            # Streamlit a évincé cette clé plutôt que celle retirée ici : le nombre d'entrées est inchangé
+            del live[key]
+        elif stats['max_entries'] is not None and len(live) >= stats['max_entries']:
+            live.popitem(last=False)
+            stats['evictions'] += 1
+        live[key] = now
+        stats['entries'] = len(live)
+
+def _forget_entries(name):
+    """Oublie les clés de `name` (appelé avec `_lock`, après un vidage du cache)."""
+    _live_keys[name].clear()
+    _registry[name]['entries'] = 0
+
+def _make_cached(cache_decorator, kind, max_entries, ttl, disk=False, source_files=(), **cache_kwargs):
+    """Construit un décorateur qui enveloppe `cache_decorator` avec les compteurs du registre."""
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        persist = disk and disk_cache.DISK_CACHE_ENABLED
+        stats = _register(name, kind, max_entries, ttl, persist)
+        # Version du code calculée au premier miss : les helpers définis plus
+        # bas dans le module de la fonction existent alors
+        code_version = None
+
+        # Fonction réellement mise en cache : n'est exécutée qu'en cas de miss.
+        # `data_versions` (versions des `source_files`) n'entre que dans les clés.
+        @wraps(func)
+        def compute(data_versions, *args, **kwargs):
+            nonlocal code_version
+            with _lock:
+                stats['misses'] += 1
+            if persist and code_version is None:
+                code_version = disk_cache.get_code_version(func)
+            key = _entry_key(code_version or '', data_versions, args, kwargs)
+            on_disk = persist and isinstance(key, str)
+            if on_disk:
+                found, result = disk_cache.load(name, key)
+                if found:
+                    with _lock:
+                        stats['disk_hits'] += 1
+                    _record_entry(name, key)
+                    return result
+
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            with _lock:
+                stats['compute_time'] += elapsed
+            # None signale un échec de chargement : il n'est pas conservé d'un démarrage à l'autre
+            if on_disk and result is not None:
+                disk_cache.store(name, key, result)
+            _record_entry(name, key)
+            return result
+
+        cached = cache_decorator(max_entries=max_entries, ttl=ttl, **cache_kwargs)(compute)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _lock:
+                stats['calls'] += 1
+            return cached(get_file_versions(source_files) if source_files else None, *args, **kwargs)
+
+        def clear():
+            """Vide le cache de cette fonction (mémoire et disque)."""
+            cached.clear()
+            if persist:
+                disk_cache.clear(name)
+            with _lock:
+                _forget_entries(name)
+
+        wrapper.clear = clear
+        return wrapper
+    return decorator
+
+def _entry_key(code_version, data_versions, args, kwargs):
+    """
+    Empreinte d'un appel (clé du cache disque et des entrées suivies). Un
+    argument impossible à hacher donne une clé unique, non persistée.
+    """
+    try:
+        return disk_cache.make_key(code_version, (data_versions, *args), kwargs)
+    except Exception:
+        return object()
+
+def cached_data(max_entries=None, ttl=None, disk=False, source_files=(), **cache_kwargs):
+    """
+    Équivalent observable de `@st.cache_data` (valeur copiée à chaque hit).
+
+    Args:
+        max_entries (int | None): Nombre maximal d'entrées (les plus anciennes sont évincées).
+        ttl (float | None): Durée de vie d'une entrée, en secondes.
+        disk (bool): Conserve aussi les résultats sur disque (cf. `utils/disk_cache.py`).
+        source_files (tuple): Fichiers lus par la fonction : leur version entre dans la clé.
+    """
+    return _make_cached(st.cache_data, 'data', max_entries, ttl, disk, source_files, **cache_kwargs)
+
+def cached_resource(max_entries=None, ttl=None, source_files=(), **cache_kwargs):
+    """Équivalent observable de `@st.cache_resource` (objet partagé par toutes les sessions)."""
+    return _make_cached(st.cache_resource, 'resource', max_entries, ttl, source_files=source_files, **cache_kwargs)
+
+
+# ==========================================================
+# RAPPORT
+# ==========================================================
+
+def get_cache_counters():
+    """
+    Copie des compteurs bruts (nom -> appels, misses, hits du disque, temps
+    de calcul, entrées présentes, évictions).
+    """
+    with _lock:
+        return {name: dict(stats) for name, stats in _registry.items()}
+
+def iter_cache_stats():
+    """
+    Parcourt les statistiques de Streamlit (une `CacheStat` agrégée par fonction).
+
+    Selon la version, `get_stats()` retourne une liste ou un dictionnaire
+    famille de métriques -> liste.
+    """
+    for provider in (get_data_cache_stats_provider(), get_resource_cache_stats_provider()):
+        stats = provider.get_stats()
+        if isinstance(stats, dict):
+            stats = [stat for family in stats.values() for stat in family]
+        yield from stats
+
+def _bytes_by_cache():
+    """Octets stockés par fonction, d'après les statistiques de Streamlit."""
+    storage = {}
+    for stat in iter_cache_stats():
+        storage[stat.cache_name] = storage.get(stat.cache_name, 0) + stat.byte_length
+    return storage
+
+def get_cache_report():
+    """
+    Retourne une ligne de statistiques par fonction inscrite.
+
+    Returns:
+        list: Dictionnaires (function, kind, max_entries, ttl, calls, hits,
+              misses, hit_rate, disk_hits, compute_time_s, mean_compute_ms,
+              entries, bytes, evictions, disk_entries, disk_bytes), triés par
+              taille stockée décroissante.
+    """
+    storage = _bytes_by_cache()
+    disk_usage = disk_cache.get_disk_usage()
+    report = []
+    for name, stats in get_cache_counters().items():
+        disk_entries, disk_size = disk_usage.get(name, (0, 0))
+        hits = max(stats['calls'] - stats['misses'], 0)
+        computed = stats['misses'] - stats['disk_hits']
+        report.append({
+            'function': name,
+            'kind': stats['kind'],
+            'max_entries': stats['max_entries'],
+            'ttl': stats['ttl'],
+            'calls': stats['calls'],
+            'hits': hits,
+            'misses': stats['misses'],
+            'hit_rate': hits / stats['calls'] if stats['calls'] else None,
+            'disk_hits': stats['disk_hits'],
+            'compute_time_s': stats['compute_time'],
+            'mean_compute_ms': stats['compute_time'] / computed * 1000 if computed else None,
+            'entries': stats['entries'],
+            'bytes': storage.get(name, 0),
+            'evictions': stats['evictions'],
+            'disk_entries': disk_entries,
+            'disk_bytes': disk_size,
+        })
+    return sorted(report, key=lambda row: row['bytes'], reverse=True)
+
+def clear_all_caches():
+    """Vide tous les caches Streamlit et le cache disque, et oublie les entrées suivies."""
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    disk_cache.clear()
+    with _lock:
+        for name in _registry:
+            _forget_entries(name)
@@ -11,27 +11,54 @@ Il fournit des fonctions "setup" distinctes pour :
 1.  **Netflix (Seaborn) :**
     - `setup_netflix_theme()`: Applique le `sns.set_theme()` global
       et retourne les palettes de couleurs (NETFLIX_RED, binary_palette, etc.).
-    - L'utilisation de `@st.cache_resource` garantit que ce
+    - L'utilisation de `@cached_resource` (`@st.cache_resource`) garantit que ce
       thème n'est appliqué qu'une seule fois.
+    - `new_figure()` / `figure_to_png()`: Rendu Matplotlib orienté objet
+      (canevas Agg, sans l'état global de pyplot), sûr entre sessions
+      concurrentes ; la figure est libérée après l'encodage PNG.
 
 2.  **World Happiness (Plotly) :**
     - `get_happiness_layout()`: Retourne le dictionnaire de
       template global (`GLOBAL_TEMPLATE_LAYOUT`) pour tous
       les graphiques Plotly.
+    - `register_happiness_template()`: Enregistre ce dictionnaire une
+      seule fois comme template nommé (`plotly.io.templates`), que les
+      figures référencent par son nom (`template=HAPPINESS_TEMPLATE`).
+
+3.  **Mode de rendu Plotly (gros volumes) :**
+    - `get_render_mode()`: Passe les nuages de points et les courbes
+      en WebGL au-delà de `WEBGL_POINT_THRESHOLD` points.
+    - `downsample_points()` / `aggregate_line_points()`: Réduisent
+      côté serveur les données au-delà de `MAX_DRAWN_POINTS` points.
+
+4.  **Sérialisation compacte (Plotly) :**
+    - `compact_figure()`: Allège le JSON envoyé au navigateur à chaque
+      interaction (infobulles dédoublonnées, valeurs arrondies,
+      tableaux typés base64 de petite taille).
 """
 
+import io
+import re
+import numpy as np
+import pandas as pd
 import seaborn as sns
 import streamlit as st 
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
 import plotly.express as px
+import plotly.graph_objects as go
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from utils.cache_registry import cached_resource
 
 # Charte graphique Netflix
-@st.cache_resource
+@cached_resource(max_entries=1)
 def setup_netflix_theme():
     """
     Applique le thème Seaborn global pour Netflix et met en cache les ressources.
     
     Cette fonction exécute `sns.set_theme()` (une opération de setup)
-    et la met en cache avec @st.cache_resource pour n'être exécutée
+    et la met en cache avec @cached_resource pour n'être exécutée
     qu'une seule fois.
 
     Elle retourne les palettes et couleurs nécessaires pour les pages :
@@ -88,6 +115,38 @@ def setup_netflix_theme():
 
     return main_palette, binary_palette, heatmap_cmap, LIGHT_GREY, DARK_GREY, NETFLIX_BLACK, NETFLIX_RED
 
+# Rendu Matplotlib sans pyplot
+# Streamlit exécute chaque session dans un thread : `plt.subplots()`, `plt.xticks()`...
+# passent par la figure "courante" de pyplot, partagée par tous les threads.
+# Options d'encodage identiques à celles de `st.pyplot`
+PNG_SAVEFIG_OPTIONS = {'bbox_inches': 'tight', 'dpi': 200, 'format': 'png'}
+
+def new_figure(figsize=None):
+    """
+    Crée une figure Matplotlib orientée objet, rattachée à son propre canevas Agg.
+
+    La figure n'est pas enregistrée auprès de pyplot : aucun état global,
+    et elle est libérée par le ramasse-miettes dès qu'elle n'est plus référencée.
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def figure_to_png(fig):
+    """
+    Encode la figure en PNG (mêmes options que `st.pyplot`) puis la libère.
+
+    Returns:
+        bytes: L'image PNG, à afficher avec `st.image`. Contrairement à une
+               figure, ces octets sont légers à mettre en cache.
+    """
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, **PNG_SAVEFIG_OPTIONS)
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
 
 # Charte graphique World Happiness Report
 def get_happiness_layout() :
@@ -164,4 +223,246 @@ def get_happiness_layout() :
         )
     )
 
-    return CONTINUOUS_PALETTE, CATEGORICAL_PALETTE, GLOBAL_TEMPLATE_LAYOUT
\ No newline at end of file
+    return CONTINUOUS_PALETTE, CATEGORICAL_PALETTE, GLOBAL_TEMPLATE_LAYOUT
+
+# Nom du template Plotly de la charte World Happiness
+HAPPINESS_TEMPLATE = 'happiness'
+
+@cached_resource(max_entries=1)
+def register_happiness_template():
+    """
+    Enregistre la charte graphique Plotly comme template nommé et retourne son nom.
+
+    Le template part de 'plotly_white' et intègre `GLOBAL_TEMPLATE_LAYOUT`.
+    Les figures le référencent par son nom (`template=HAPPINESS_TEMPLATE`
+    dans `px.*`) : le dictionnaire imbriqué n'est plus revalidé par
+    `update_layout` à chaque construction de figure.
+
+    L'enregistrement dans `plotly.io.templates` vaut pour tout le processus :
+    `@cached_resource` garantit qu'il n'est fait qu'une seule fois.
+
+    Returns:
+        str: Le nom du template (`HAPPINESS_TEMPLATE`).
+    """
+    _, _, GLOBAL_TEMPLATE_LAYOUT = get_happiness_layout()
+    layout = {key: value for key, value in GLOBAL_TEMPLATE_LAYOUT.items() if key != 'template'}
+
+    template = go.layout.Template(pio.templates[GLOBAL_TEMPLATE_LAYOUT['template']])
+    template.layout.update(layout)
+    # Plotly Express tire les couleurs des catégories du template de la figure :
+    # on garde celles du template par défaut ('streamlit' une fois Streamlit importé),
+    # que le navigateur remplace par la palette du thème de l'application
+    default_colorway = pio.templates[pio.templates.default].layout.colorway
+    if default_colorway is not None:
+        template.layout.colorway = default_colorway
+    pio.templates[HAPPINESS_TEMPLATE] = template
+    return HAPPINESS_TEMPLATE
+
+
+# Mode de rendu Plotly
+# Au-delà de ce nombre de points par image, le rendu SVG ralentit le navigateur : on passe en WebGL
+WEBGL_POINT_THRESHOLD = 1000
+# Au-delà de ce nombre de points, les données sont réduites côté serveur avant le tracé
+MAX_DRAWN_POINTS = 20_000
+
+def get_render_mode(n_points, threshold=WEBGL_POINT_THRESHOLD):
+    """
+    Retourne le `render_mode` de `px.scatter` / `px.line` adapté au nombre de points.
+
+    Contrairement au mode 'auto' de Plotly Express, le choix s'applique aussi
+    aux graphiques animés (`n_points` = nombre de points d'une image).
+    """
+    return 'webgl' if n_points > threshold else 'svg'
+
+def downsample_points(df, max_points=MAX_DRAWN_POINTS, by=None, seed=0):
+    """
+    Échantillonne un nuage de points à `max_points` lignes au plus.
+
+    Avec `by` (ex: 'Region'), l'échantillon est stratifié : chaque groupe
+    garde sa proportion, donc le nuage garde sa composition (couleurs).
+    L'échantillon est déterministe (`seed`) pour que le cache reste valide.
+    """
+    if len(df) <= max_points:
+        return df
+    if by is None:
+        return df.sample(n=max_points, random_state=seed)
+    return df.groupby(by, group_keys=False, observed=True).sample(frac=max_points / len(df), random_state=seed)
+
+def aggregate_line_points(df, x, y, group, max_points=MAX_DRAWN_POINTS):
+    """
+    Réduit des courbes (une par valeur de `group`) à `max_points` points au total.
+
+    Chaque courbe est découpée en tranches consécutives de même effectif,
+    remplacées par leur point moyen (x, y) : la forme de la courbe est
+    conservée. Seules les colonnes `group`, `x` et `y` sont retournées.
+    """
+    if len(df) <= max_points:
+        return df
+    per_group = max(max_points // df[group].nunique(), 2)
+    df = df.sort_values([group, x])
+    position = df.groupby(group, observed=True).cumcount()
+    size = df.groupby(group, observed=True)[x].transform('size')
+    bucket = position * per_group // size
+    return (df.groupby([df[group], bucket.rename('bucket')], observed=True)[[x, y]]
+            .mean()
+            .reset_index(level=group)
+            .reset_index(drop=True))
+
+
+# Sérialisation compacte des figures Plotly
+# Références aux colonnes de `customdata` dans une infobulle : %{customdata[2]:.2f}
+_CUSTOMDATA_REF = re.compile(r'%\{customdata\[(\d+)\](:[^}]*)?\}')
+# Tableaux numériques candidats à l'encodage typé (chemins Plotly)
+_NUMERIC_FIELDS = ('x', 'y', 'z', 'marker.size')
+# Types de traces où `text` n'est affiché que dans l'infobulle (hors mode 'text')
+_HOVER_ONLY_TEXT_TYPES = ('choropleth', 'scatter', 'scattergl')
+
+def _compact_numbers(values, decimals):
+    """
+    Arrondit un tableau numérique et le convertit dans le plus petit type
+    qui conserve les valeurs affichées (entiers courts, float32...).
+
+    Plotly encode les tableaux numpy en base64 typé (`{'dtype', 'bdata'}`) :
+    un float32 coûte deux fois moins d'octets qu'un float64.
+    """
+    if values.dtype.kind in 'iub':
+        if values.size == 0:
+            return values
+        return values.astype(np.result_type(np.min_scalar_type(values.min()), np.min_scalar_type(values.max())))
+    if values.dtype.kind != 'f':
+        return values
+    rounded = np.round(values, decimals)
+    as_float32 = rounded.astype('f4')
+    # float32 n'a que ~7 chiffres significatifs : on le garde seulement s'il ne change pas l'affichage
+    if np.allclose(as_float32, rounded, rtol=0, atol=0.5 * 10 ** -decimals, equal_nan=True):
+        return as_float32
+    return rounded
+
+def _smaller_encoding(values, compacted):
+    """
+    Retourne `compacted` si son JSON est plus court que celui de `values`,
+    sinon `values`.
+
+    Le gain n'est pas garanti : un tableau déjà en float32 (panel WHR, cf.
+    `compact_happiness_frame`) ou de quelques valeurs peut s'écrire plus
+    court en liste décimale qu'en base64 typé.
+    """
+    if compacted is values:
+        return values
+    if len(to_json_plotly(compacted)) < len(to_json_plotly(values)):
+        return compacted
+    return values
+
+def _format_floats(template, field, decimals):
+    """Ajoute un format d'affichage aux références non formatées (`%{x}` -> `%{x:.3~f}`)."""
+    return template.replace(f'%{{{field}}}', f'%{{{field}:.{decimals}~f}}')
+
+def _compact_customdata(trace, template, decimals):
+    """
+    Réduit `customdata` aux seules colonnes utilisées par l'infobulle.
+
+    Les colonnes constantes sur la trace (ex: l'année d'une image) sont
+    écrites en dur dans le `hovertemplate` ; une colonne texte unique
+    passe dans `text` quand il n'est pas affiché ; le reste, s'il est
+    numérique, devient un tableau typé 2D.
+    """
+    customdata = np.asarray(trace.customdata, dtype=object)
+    if customdata.ndim != 2:
+        return template
+    refs = sorted({int(index) for index, _ in _CUSTOMDATA_REF.findall(template)})
+
+    kept = []
+    for index in refs:
+        column = pd.Series(customdata[:, index]).infer_objects()
+        constant = len(column) > 0 and column.nunique(dropna=False) == 1
+        if constant and f'%{{customdata[{index}]}}' in template:
+            template = template.replace(f'%{{customdata[{index}]}}', str(column.iloc[0]))
+        else:
+            kept.append((index, column))
+
+    text_columns = [(index, column) for index, column in kept if not pd.api.types.is_numeric_dtype(column)]
+    movable = (trace.type in _HOVER_ONLY_TEXT_TYPES and trace.text is None
+               and 'text' not in (getattr(trace, 'mode', None) or ''))
+    if len(text_columns) == 1 and movable:
+        index, column = text_columns[0]
+        trace.text = column.to_numpy()
+        template = re.sub(rf'%\{{customdata\[{index}\](:[^}}]*)?\}}', '%{text}', template)
+        kept.remove(text_columns[0])
+
+    # Renumérotation des colonnes conservées
+    new_index = {index: position for position, (index, _) in enumerate(kept)}
+    template = _CUSTOMDATA_REF.sub(
+        lambda m: f'%{{customdata[{new_index[int(m.group(1))]}]{m.group(2) or ""}}}' if int(m.group(1)) in new_index else m.group(0),
+        template)
+
+    if not kept:
+        trace.customdata = None
+    elif all(pd.api.types.is_numeric_dtype(column) for _, column in kept):
+        values = np.column_stack([column.to_numpy(dtype='f8') for _, column in kept])
+        trace.customdata = _smaller_encoding(values, _compact_numbers(values, decimals))
+    else:
+        trace.customdata = np.column_stack([
+            column.round(decimals).to_numpy(dtype=object) if pd.api.types.is_float_dtype(column) else column.to_numpy(dtype=object)
+            for _, column in kept])
+    return template
+
+def _compact_trace(trace, decimals):
+    """Applique `compact_figure` à une trace."""
+    template = trace.hovertemplate if 'hovertemplate' in trace else None
+
+    # Texte d'infobulle constant (une courbe par pays) ou identique à un axe
+    # (ex: le pays en ordonnée d'un bar chart)
+    hovertext = trace.hovertext if 'hovertext' in trace else None
+    if template and hovertext is not None and not isinstance(hovertext, str):
+        if len(hovertext) > 0 and pd.Series(hovertext).nunique(dropna=False) == 1:
+            replacement = str(hovertext[0])
+        else:
+            replacement = next((f'%{{{field}}}' for field in ('y', 'x', 'locations')
+                                if field in trace and trace[field] is not None
+                                and np.array_equal(np.asarray(trace[field], dtype=object), np.asarray(hovertext, dtype=object))),
+                               None)
+        if replacement is not None:
+            trace.hovertext = None
+            template = template.replace('%{hovertext}', replacement)
+
+    if template and 'customdata' in trace and trace.customdata is not None:
+        template = _compact_customdata(trace, template, decimals)
+
+    for field in _NUMERIC_FIELDS:
+        parent, _, name = field.rpartition('.')
+        owner = trace[parent] if parent and parent in trace else (trace if not parent else None)
+        if owner is None or name not in owner:
+            continue
+        values = owner[name]
+        if not isinstance(values, np.ndarray):
+            continue
+        compacted = _smaller_encoding(values, _compact_numbers(values, decimals))
+        if compacted is values:
+            continue
+        owner[name] = compacted
+        if template and compacted.dtype.kind == 'f':
+            template = _format_floats(template, field, decimals)
+
+    if template is not None:
+        trace.hovertemplate = template
+
+def compact_figure(fig, decimals=3):
+    """
+    Allège la sérialisation d'une figure Plotly (modifiée sur place et retournée).
+
+    À chaque interaction, `st.plotly_chart` renvoie toute la figure en JSON :
+    - les colonnes de `customdata` non référencées par l'infobulle sont
+      supprimées, les colonnes constantes écrites dans le `hovertemplate` ;
+    - un `hovertext` identique à un axe est remplacé par une référence à cet axe ;
+    - les valeurs numériques sont arrondies à `decimals` décimales (affichage
+      inchangé à cette précision) et encodées dans le plus petit type possible,
+      seulement si cet encodage est plus court que celui d'origine.
+
+    Les traces des images d'animation (`fig.frames`) sont traitées de même.
+    """
+    for trace in fig.data:
+        _compact_trace(trace, decimals)
+    for frame in fig.frames:
+        for trace in frame.data:
+            _compact_trace(trace, decimals)
+    return fig
@@ -0,0 +1,160 @@
+"""
+Service de Canonicalisation des Noms de Pays.
+
+Les noms de pays ne sont pas homogènes entre nos sources :
+- les fichiers annuels du World Happiness Report ("Trinidad and Tobago"
+  vs "Trinidad & Tobago", "North Cyprus" vs "Northern Cyprus", ...),
+- la colonne `main_country` du dataset Netflix ("West Germany", "Soviet Union", ...),
+- le vocabulaire attendu par Plotly (`locationmode='country names'`).
+
+Ce module associe chaque nom brut à un **code ISO 3166-1 alpha-3**, qui
+sert de clé de jointure commune et de `locations` pour les cartes
+(`locationmode='ISO-3'`).
+
+Fonctionnement :
+1.  Une table d'alias précalculée (`ISO_CODES` + `COUNTRY_ALIASES`)
+    résout instantanément les noms connus.
+2.  Un matcher approché (`difflib`), mis en cache avec `lru_cache`,
+    prend le relais pour les noms jamais vus.
+3.  `map_country_codes()` ne résout qu'**une fois par valeur distincte**,
+    jamais ligne par ligne.
+"""
+
+import re
+import difflib
+from functools import lru_cache
+
+import pandas as pd
+
+# Table de référence : code ISO-3 -> nom canonique (affichage)
+ISO_CODES = {
+    'AFG': 'Afghanistan', 'ALB': 'Albania', 'DZA': 'Algeria', 'AGO': 'Angola',
+    'ARG': 'Argentina', 'ARM': 'Armenia', 'AUS': 'Australia', 'AUT': 'Austria',
+    'AZE': 'Azerbaijan', 'BHS': 'Bahamas', 'BHR': 'Bahrain', 'BGD': 'Bangladesh',
+    'BLR': 'Belarus', 'BEL': 'Belgium', 'BLZ': 'Belize', 'BEN': 'Benin',
+    'BMU': 'Bermuda', 'BTN': 'Bhutan', 'BOL': 'Bolivia', 'BIH': 'Bosnia and Herzegovina',
+    'BWA': 'Botswana', 'BRA': 'Brazil', 'BGR': 'Bulgaria', 'BFA': 'Burkina Faso',
+    'BDI': 'Burundi', 'KHM': 'Cambodia', 'CMR': 'Cameroon', 'CAN': 'Canada',
+    'CYM': 'Cayman Islands', 'CAF': 'Central African Republic', 'TCD': 'Chad', 'CHL': 'Chile',
+    'CHN': 'China', 'COL': 'Colombia', 'COM': 'Comoros', 'COG': 'Congo (Brazzaville)',
+    'COD': 'Congo (Kinshasa)', 'CRI': 'Costa Rica', 'HRV': 'Croatia', 'CUB': 'Cuba',
+    'CYP': 'Cyprus', 'CZE': 'Czech Republic', 'DNK': 'Denmark', 'DJI': 'Djibouti',
+    'DOM': 'Dominican Republic', 'ECU': 'Ecuador', 'EGY': 'Egypt', 'SLV': 'El Salvador',
+    'EST': 'Estonia', 'SWZ': 'Eswatini', 'ETH': 'Ethiopia', 'FIN': 'Finland',
+    'FRA': 'France', 'GAB': 'Gabon', 'GMB': 'Gambia', 'GEO': 'Georgia',
+    'DEU': 'Germany', 'GHA': 'Ghana', 'GRC': 'Greece', 'GTM': 'Guatemala',
+    'GIN': 'Guinea', 'HTI': 'Haiti', 'HND': 'Honduras', 'HKG': 'Hong Kong',
+    'HUN': 'Hungary', 'ISL': 'Iceland', 'IND': 'India', 'IDN': 'Indonesia',
+    'IRN': 'Iran', 'IRQ': 'Iraq', 'IRL': 'Ireland', 'ISR': 'Israel',
+    'ITA': 'Italy', 'CIV': 'Ivory Coast', 'JAM': 'Jamaica', 'JPN': 'Japan',
+    'JOR': 'Jordan', 'KAZ': 'Kazakhstan', 'KEN': 'Kenya', 'XKX': 'Kosovo',
+    'KWT': 'Kuwait', 'KGZ': 'Kyrgyzstan', 'LAO': 'Laos', 'LVA': 'Latvia',
+    'LBN': 'Lebanon', 'LSO': 'Lesotho', 'LBR': 'Liberia', 'LBY': 'Libya',
+    'LIE': 'Liechtenstein', 'LTU': 'Lithuania', 'LUX': 'Luxembourg', 'MDG': 'Madagascar',
+    'MWI': 'Malawi', 'MYS': 'Malaysia', 'MLI': 'Mali', 'MLT': 'Malta',
+    'MRT': 'Mauritania', 'MUS': 'Mauritius', 'MEX': 'Mexico', 'MDA': 'Moldova',
+    'MNG': 'Mongolia', 'MNE': 'Montenegro', 'MAR': 'Morocco', 'MOZ': 'Mozambique',
+    'MMR': 'Myanmar', 'NAM': 'Namibia', 'NPL': 'Nepal', 'NLD': 'Netherlands',
+    'NZL': 'New Zealand', 'NIC': 'Nicaragua', 'NER': 'Niger', 'NGA': 'Nigeria',
+    'MKD': 'North Macedonia', 'NOR': 'Norway', 'OMN': 'Oman', 'PAK': 'Pakistan',
+    'PSE': 'Palestine', 'PAN': 'Panama', 'PRY': 'Paraguay', 'PER': 'Peru',
+    'PHL': 'Philippines', 'POL': 'Poland', 'PRT': 'Portugal', 'PRI': 'Puerto Rico',
+    'QAT': 'Qatar', 'ROU': 'Romania', 'RUS': 'Russia', 'RWA': 'Rwanda',
+    'WSM': 'Samoa', 'SAU': 'Saudi Arabia', 'SEN': 'Senegal', 'SRB': 'Serbia',
+    'SLE': 'Sierra Leone', 'SGP': 'Singapore', 'SVK': 'Slovakia', 'SVN': 'Slovenia',
+    'SOM': 'Somalia', 'ZAF': 'South Africa', 'KOR': 'South Korea', 'SSD': 'South Sudan',
+    'ESP': 'Spain', 'LKA': 'Sri Lanka', 'SDN': 'Sudan', 'SUR': 'Suriname',
+    'SWE': 'Sweden', 'CHE': 'Switzerland', 'SYR': 'Syria', 'TWN': 'Taiwan',
+    'TJK': 'Tajikistan', 'TZA': 'Tanzania', 'THA': 'Thailand', 'TGO': 'Togo',
+    'TTO': 'Trinidad and Tobago', 'TUN': 'Tunisia', 'TUR': 'Turkey', 'TKM': 'Turkmenistan',
+    'UGA': 'Uganda', 'UKR': 'Ukraine', 'ARE': 'United Arab Emirates', 'GBR': 'United Kingdom',
+    'USA': 'United States', 'URY': 'Uruguay', 'UZB': 'Uzbekistan', 'VAT': 'Vatican City',
+    'VEN': 'Venezuela', 'VNM': 'Vietnam', 'YEM': 'Yemen', 'ZMB': 'Zambia',
+    'ZWE': 'Zimbabwe',
+    # Entités sans code ISO officiel (codes réservés "X.." / ISO 3166-3)
+    'XNC': 'Northern Cyprus', 'XSL': 'Somaliland', 'SUN': 'Soviet Union', 'DDR': 'East Germany',
+}
+
+# Variantes rencontrées dans nos sources : nom brut -> code ISO-3
+COUNTRY_ALIASES = {
+    'Trinidad & Tobago': 'TTO',
+    'North Cyprus': 'XNC',
+    'Somaliland Region': 'XSL',
+    'Somaliland region': 'XSL',
+    'Hong Kong S.A.R., China': 'HKG',
+    'Taiwan Province of China': 'TWN',
+    'Palestinian Territories': 'PSE',
+    'Macedonia': 'MKD',
+    'Swaziland': 'SWZ',
+    "Cote d'Ivoire": 'CIV',
+    'Republic of the Congo': 'COG',
+    'Democratic Republic of the Congo': 'COD',
+    'Czechia': 'CZE',
+    'United States of America': 'USA',
+    'UK': 'GBR',
+    'USA': 'USA',
+    'Russian Federation': 'RUS',
+    'Korea': 'KOR',
+    'Republic of Korea': 'KOR',
+    'West Germany': 'DEU',
+    'Vatican': 'VAT',
+}
+
+# Seuil de similarité pour le matcher approché (0 à 1)
+FUZZY_CUTOFF = 0.85
+
+
+def _normalize(name):
+    """Normalise un nom (casse, '&', ponctuation, espaces) avant comparaison."""
+    name = name.strip().lower().replace('&', ' and ')
+    name = re.sub(r"[^a-z0-9 ]", ' ', name)
+    return re.sub(r"\s+", ' ', name).strip()
+
+
+# Table d'alias précalculée (clé normalisée -> code ISO-3), construite une seule fois
+_ALIAS_TABLE = {_normalize(name): code for code, name in ISO_CODES.items()}
+_ALIAS_TABLE.update({_normalize(name): code for name, code in COUNTRY_ALIASES.items()})
+_ALIAS_KEYS = list(_ALIAS_TABLE)
+
+
+@lru_cache(maxsize=None)
+def resolve_country_code(raw_name):
+    """
+    Résout un nom de pays brut en code ISO-3.
+
+    La table d'alias est consultée en premier ; pour un nom inconnu,
+    le matcher approché (`difflib.get_close_matches`) cherche l'alias
+    le plus proche au-dessus de `FUZZY_CUTOFF`. Le résultat est mis
+    en cache : chaque nom distinct n'est résolu qu'une seule fois.
+
+    Returns:
+        str | None: Le code ISO-3, ou None si aucun pays ne correspond.
+    """
+    if not isinstance(raw_name, str) or not raw_name.strip():
+        return None
+
+    key = _normalize(raw_name)
+    if key in _ALIAS_TABLE:
+        return _ALIAS_TABLE[key]
+
+    match = difflib.get_close_matches(key, _ALIAS_KEYS, n=1, cutoff=FUZZY_CUTOFF)
+    return _ALIAS_TABLE[match[0]] if match else None
+
+
+def map_country_codes(country_series):
+    """
+    Associe un code ISO-3 à chaque ligne d'une Series de noms de pays.
+
+    La résolution n'est faite que sur les valeurs distinctes, puis
+    propagée à toutes les lignes avec un `.map()` vectorisé.
+
+    Returns:
+        pd.Series: Les codes ISO-3 (None si le pays n'est pas reconnu).
+    """
+    mapping = {name: resolve_country_code(name) for name in country_series.dropna().unique()}
+    return country_series.map(mapping)
+
+
+def get_country_name(code):
+    """Retourne le nom canonique associé à un code ISO-3 (ou None)."""
+    return ISO_CODES.get(code)
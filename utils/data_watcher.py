@@ -0,0 +1,235 @@
+"""
+Module de Surveillance des Fichiers de Données (versions et invalidation ciblée).
+
+Chaque fichier de `data/` a une **version** : l'empreinte de son contenu
+(sha256). Les fonctions mises en cache qui lisent des fichiers les déclarent
+(`@cached_data(source_files=...)`, cf. `utils/cache_registry.py`) : la version
+publiée de ces fichiers entre dans la clé de leurs caches, mémoire et
+disque. `data_loader.get_dataset_version()` retourne ces mêmes versions
+pour les fonctions qui la reçoivent en argument (index bitmap, table croisée,
+instantanés des pipelines).
+
+Un thread de surveillance relève périodiquement la date de modification et
+la taille des fichiers de `data/`. Un fichier modifié (relevé stable sur
+deux passages, pour ne pas lire un fichier en cours d'écriture) est
+haché ; si son contenu a réellement changé :
+
+1.  les caches sont reconstruits en arrière-plan pour la nouvelle version
+    (fonction `rebuild`, cf. `dashboards/warmup.run_warmup`), le thread
+    de surveillance lisant déjà les nouvelles versions ;
+2.  les nouvelles versions sont publiées d'un seul coup (remplacement du
+    dictionnaire des versions).
+
+Invalidation ciblée : seules les entrées dérivées du fichier modifié
+changent de clé (son loader, puis, par leurs arguments, ses agrégations
+et ses figures). Les entrées des autres fichiers restent valides ; les
+anciennes sont évincées par les bornes `max_entries` des caches.
+
+Bascule atomique : chaque exécution complète d'un script épingle les
+versions publiées (`pin_data_versions()`, appelée par `app.py`). Un rerun
+commencé avant la publication lit l'ancienne version jusqu'au bout (les
+loaders gardent donc deux entrées : l'ancienne et la nouvelle version) ;
+le suivant trouve la nouvelle version déjà reconstruite. L'épinglage est
+propre à un thread : un thread de travail lancé par le rerun (ou par la
+reconstruction) reçoit explicitement les versions de son parent
+(`get_pinned_versions()`, cf. `utils/render_pool.render_charts`).
+
+Configuration (variables d'environnement) :
+- `DASHBOARD_DATA_WATCH=0` désactive la surveillance ;
+- `DASHBOARD_DATA_WATCH_INTERVAL` : période des relevés, en secondes (défaut : 2).
+"""
+
+import os
+import time
+import hashlib
+import threading
+
+from streamlit.logger import get_logger
+
+DATA_WATCH_ENABLED = os.environ.get('DASHBOARD_DATA_WATCH', '1').lower() in ('1', 'true', 'yes')
+DATA_WATCH_INTERVAL = float(os.environ.get('DASHBOARD_DATA_WATCH_INTERVAL', 2))
+DATA_DIR = './data'
+DATA_WATCHER_THREAD_NAME = "data-watcher"
+
+_lock = threading.Lock()
+_local = threading.local()
+_published = {} # Chemin -> version publiée (remplacé, jamais modifié sur place)
+_seen = {}      # Chemin -> dernier relevé (date de modification, taille) traité
+_pending = {}   # Chemin -> relevé en attente de confirmation
+_thread = None
+_logger = get_logger(__name__)
+
+
+# ==========================================================
+# VERSIONS
+# ==========================================================
+
+def hash_file(path, chunk_size=1 << 20):
+    """Empreinte du contenu d'un fichier (None s'il n'existe pas)."""
+    hasher = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                hasher.update(chunk)
+    except OSError:
+        return None
+    return hasher.hexdigest()[:16]
+
+def _publish(versions):
+    """Publie de nouvelles versions (un seul remplacement du dictionnaire)."""
+    global _published
+    with _lock:
+        _published = {**_published, **versions}
+
+def _publish_first(path):
+    """Version d'un fichier lu pour la première fois : elle est hachée puis publiée."""
+    global _published
+    version = hash_file(path)
+    with _lock:
+        # Un autre thread a pu la publier entre-temps : la première publication l'emporte
+        if path not in _published:
+            _published = {**_published, path: version}
+        return _published[path]
+
+def get_file_versions(paths):
+    """
+    Retourne les versions de `paths` vues par le thread courant : celles
+    épinglées pour le rerun en cours, sinon les versions publiées.
+
+    Returns:
+        tuple: Une version (empreinte du contenu, ou None) par fichier.
+    """
+    pinned = getattr(_local, 'versions', None)
+    versions = []
+    for path in map(os.path.normpath, paths):
+        if pinned is not None and path in pinned:
+            versions.append(pinned[path])
+        elif path in _published:
+            versions.append(_published[path])
+        else:
+            versions.append(_publish_first(path))
+    return tuple(versions)
+
+def pin_data_versions(versions=None):
+    """
+    Épingle, pour le thread courant, les versions publiées (ou `versions`) :
+    toutes les lectures du rerun en cours utilisent la même version des données.
+    """
+    _local.versions = dict(_published if versions is None else versions)
+
+def get_pinned_versions():
+    """Versions épinglées par le thread courant (None s'il n'en a pas), à transmettre à ses threads de travail."""
+    return getattr(_local, 'versions', None)
+
+def unpin_data_versions():
+    """Retire l'épinglage du thread courant (retour aux versions publiées)."""
+    _local.versions = None
+
+
+# ==========================================================
+# SURVEILLANCE
+# ==========================================================
+
+def _scan(data_dir):
+    """Relevé des fichiers de `data_dir` (sans les sous-dossiers) : chemin -> (date de modification, taille)."""
+    signatures = {}
+    try:
+        entries = list(os.scandir(data_dir))
+    except OSError:
+        return signatures
+    for entry in entries:
+        try:
+            if entry.is_file():
+                stat = entry.stat()
+                signatures[os.path.normpath(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            continue
+    return signatures
+
+def detect_changes(data_dir=DATA_DIR):
+    """
+    Compare un relevé de `data_dir` au précédent et retourne les fichiers
+    dont le contenu a changé (y compris les fichiers supprimés, version None).
+
+    Un relevé modifié n'est pris en compte qu'une fois stable sur deux
+    appels ; le fichier n'est alors haché que si son relevé a changé.
+
+    Returns:
+        dict: Chemin -> nouvelle version.
+    """
+    signatures = _scan(data_dir)
+    changes = {}
+    for path, signature in signatures.items():
+        if _seen.get(path) == signature:
+            continue
+        if path not in _seen:
+            # Premier relevé du fichier : il sert de référence
+            _seen[path] = signature
+            continue
+        if _pending.get(path) != signature:
+            _pending[path] = signature
+            continue
+        del _pending[path]
+        _seen[path] = signature
+        version = hash_file(path)
+        if path in _published and version != _published[path]:
+            changes[path] = version
+    for path in set(_seen) - set(signatures):
+        del _seen[path]
+        _pending.pop(path, None)
+        if _published.get(path) is not None:
+            changes[path] = None
+    return changes
+
+def apply_changes(changes, rebuild=None):
+    """
+    Reconstruit les caches pour les nouvelles versions, puis les publie.
+
+    Args:
+        changes (dict): Chemin -> nouvelle version (cf. `detect_changes`).
+        rebuild (callable | None): Reconstruction des caches (sans argument),
+            exécutée avec les nouvelles versions épinglées.
+    """
+    start = time.perf_counter()
+    if rebuild is not None:
+        previous = getattr(_local, 'versions', None)
+        pin_data_versions({**_published, **changes})
+        try:
+            rebuild()
+        except Exception:
+            _logger.exception("Surveillance des données : échec de la reconstruction des caches")
+        finally:
+            _local.versions = previous
+    _publish(changes)
+    _logger.info("Surveillance des données : nouvelle version de %s publiée (caches reconstruits en %.1f s)",
+                 ", ".join(sorted(os.path.basename(path) for path in changes)), time.perf_counter() - start)
+
+def _watch(data_dir, interval, rebuild):
+    """Boucle du thread de surveillance."""
+    while True:
+        try:
+            changes = detect_changes(data_dir)
+            if changes:
+                apply_changes(changes, rebuild)
+        except Exception:
+            _logger.exception("Surveillance des données : relevé impossible")
+        time.sleep(interval)
+
+def start_data_watcher(rebuild=None, data_dir=DATA_DIR, interval=DATA_WATCH_INTERVAL):
+    """
+    Lance la surveillance de `data_dir` dans un thread d'arrière-plan, une
+    seule fois par processus.
+
+    Returns:
+        threading.Thread | None: Le thread de surveillance, ou None s'il est désactivé.
+    """
+    global _thread
+    if not DATA_WATCH_ENABLED:
+        return None
+    with _lock:
+        if _thread is None:
+            _seen.update(_scan(data_dir))
+            _thread = threading.Thread(target=_watch, args=(data_dir, interval, rebuild),
+                                       name=DATA_WATCHER_THREAD_NAME, daemon=True)
+            _thread.start()
+        return _thread
@@ -0,0 +1,317 @@
+"""
+Module de Cache Persistant sur Disque (résultats conservés entre deux redémarrages).
+
+Les caches de `st.cache_data` vivent dans la mémoire du processus : un
+redémarrage ou un redéploiement les vide, et les premiers visiteurs
+recalculent les DataFrames nettoyés, les agrégations, les matrices de
+corrélation et les figures. Ce module conserve ces résultats sur disque.
+
+Il n'est pas utilisé directement : `@cached_data(disk=True)` (cf.
+`utils/cache_registry.py`) le consulte quand le cache mémoire n'a pas
+l'entrée, avant de recalculer, puis y écrit le résultat calculé.
+
+Une entrée est identifiée par :
+- l'identité de la fonction (`module.fonction`) ;
+- la version de son code (empreinte de son code source, de celui des
+  fonctions et modules du dépôt qu'elle appelle, et de `DISK_CACHE_VERSION`) ;
+- l'empreinte de ses arguments (contenu des DataFrames, Series et
+  tableaux numpy, valeur des autres arguments) et, pour un loader, la
+  version des fichiers qu'il lit (`source_files`, cf. `utils/data_watcher.py`).
+
+Format : un fichier par entrée, `<dossier>/<fonction>/<clé>.pkl.zst`, soit
+le résultat sérialisé par pickle (protocole 5) et compressé en zstd (codec
+de pyarrow). L'écriture passe par un fichier temporaire puis un renommage
+atomique. La taille totale du dossier est bornée : un compteur (initialisé
+par un parcours du dossier) suit les écritures et, au-delà de la borne,
+les entrées les moins récemment utilisées sont supprimées.
+
+La version du code suit les noms globaux de la fonction décorée, de proche
+en proche : helpers du dépôt (`compact_happiness_frame`...), constantes
+(`WHR_COMPACT_DTYPES`...) et modules du dépôt utilisés comme espaces de noms.
+Un changement ailleurs (bibliothèque, fichier de données non déclaré)
+demande d'incrémenter `DISK_CACHE_VERSION` (ou de vider les caches depuis
+la page d'administration).
+
+Configuration (variables d'environnement) :
+- `DASHBOARD_DISK_CACHE=0` désactive le cache disque ;
+- `DASHBOARD_DISK_CACHE_DIR` (défaut : `./data/cache`) ;
+- `DASHBOARD_DISK_CACHE_MAX_MB` (défaut : 256).
+"""
+
+import os
+import types
+import pickle
+import shutil
+import hashlib
+import inspect
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from streamlit.logger import get_logger
+from utils.io import write_atomic
+
+DISK_CACHE_ENABLED = os.environ.get('DASHBOARD_DISK_CACHE', '1').lower() in ('1', 'true', 'yes')
+DISK_CACHE_DIR = os.environ.get('DASHBOARD_DISK_CACHE_DIR', './data/cache')
+DISK_CACHE_MAX_BYTES = int(float(os.environ.get('DASHBOARD_DISK_CACHE_MAX_MB', 256)) * 1e6)
+# À incrémenter quand un changement hors des fonctions décorées modifie leurs résultats
+DISK_CACHE_VERSION = 1
+
+CODEC = 'zstd'
+EXTENSION = '.pkl.zst'
+
+# Racine du dépôt : seuls les fonctions et modules qui s'y trouvent entrent dans les versions
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_lock = threading.Lock()
+_logger = get_logger(__name__)
+# Taille totale du dossier, connue après un premier parcours (None : à recalculer)
+_total_bytes = None
+
+
+# ==========================================================
+# CLÉS
+# ==========================================================
+
+def _in_repo(obj):
+    """Vrai si `obj` (fonction, classe ou module) est défini dans un fichier du dépôt."""
+    try:
+        path = os.path.abspath(inspect.getfile(obj))
+    except TypeError:
+        return False
+    return path.startswith(ROOT_DIR + os.sep) and 'site-packages' not in path
+
+def _global_names(code):
+    """Noms globaux lus par `code` et par les fonctions imbriquées (lambdas, compréhensions...)."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+def _is_literal(value):
+    """Vrai pour une constante dont la représentation est stable d'un processus à l'autre."""
+    if value is None or isinstance(value, (str, bytes, bool, int, float)):
+        return True
+    if isinstance(value, (tuple, list)):
+        return all(_is_literal(item) for item in value)
+    if isinstance(value, dict):
+        return all(_is_literal(key) and _is_literal(item) for key, item in value.items())
+    return False
+
+def _source(obj):
+    """Code source de `obj` (ou le bytecode d'une fonction dont la source est introuvable)."""
+    try:
+        return inspect.getsource(obj).encode()
+    except (OSError, TypeError):
+        return obj.__code__.co_code if hasattr(obj, '__code__') else repr(obj).encode()
+
+def get_code_version(func):
+    """
+    Empreinte du code de `func` et de ses dépendances dans le dépôt.
+
+    Les noms globaux de la fonction sont suivis de proche en proche : une
+    fonction ou une classe du dépôt ajoute son code source (et ses propres
+    dépendances), un module du dépôt son fichier entier, une constante
+    simple sa valeur. Les bibliothèques ne sont pas suivies.
+    """
+    hasher = hashlib.sha256(f"v{DISK_CACHE_VERSION}:".encode())
+    seen = set()
+    pending = [inspect.unwrap(func)]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        hasher.update(_source(obj))
+        if not isinstance(obj, types.FunctionType):
+            continue
+        for name in sorted(_global_names(obj.__code__)):
+            value = obj.__globals__.get(name)
+            if isinstance(value, (types.FunctionType, type, types.ModuleType)):
+                value = inspect.unwrap(value) if callable(value) else value
+                if _in_repo(value):
+                    pending.append(value)
+            elif _is_literal(value):
+                hasher.update(f"{name}={value!r}".encode())
+    return hasher.hexdigest()
+
+def _update_fingerprint(hasher, value):
+    """Ajoute le contenu de `value` à l'empreinte `hasher` (stable d'un processus à l'autre)."""
+    hasher.update(type(value).__qualname__.encode())
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        meta = (value.shape, getattr(value, 'name', None),
+                list(value.columns) if isinstance(value, pd.DataFrame) else None,
+                [str(dtype) for dtype in (value.dtypes if isinstance(value, pd.DataFrame) else [value.dtype])])
+        hasher.update(repr(meta).encode())
+        try:
+            hasher.update(pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index)).to_numpy().tobytes())
+        except TypeError:
+            # Valeurs non hachables par pandas (listes dans une colonne object...)
+            hasher.update(pickle.dumps(value, protocol=5))
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        hasher.update(repr((value.dtype.str, value.shape)).encode())
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        hasher.update(str(len(value)).encode())
+        for item in value:
+            _update_fingerprint(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(str(len(value)).encode())
+        for key, item in value.items():
+            _update_fingerprint(hasher, key)
+            _update_fingerprint(hasher, item)
+    elif value is None or isinstance(value, (str, bytes, bool, int, float, np.generic)):
+        hasher.update(repr(value).encode())
+    else:
+        hasher.update(pickle.dumps(value, protocol=5))
+
+def make_key(code_version, args, kwargs):
+    """
+    Calcule la clé d'une entrée.
+
+    Args:
+        code_version (str): Version du code de la fonction (cf. `get_code_version`).
+        args (tuple), kwargs (dict): Arguments de l'appel (précédés des
+            versions des fichiers lus par la fonction).
+
+    Returns:
+        str: Empreinte hexadécimale (nom du fichier de l'entrée).
+    """
+    hasher = hashlib.sha256(code_version.encode())
+    _update_fingerprint(hasher, args)
+    _update_fingerprint(hasher, dict(sorted(kwargs.items())))
+    return hasher.hexdigest()
+
+
+# ==========================================================
+# LECTURE / ÉCRITURE
+# ==========================================================
+
+def _entry_path(name, key):
+    return os.path.join(DISK_CACHE_DIR, name, key + EXTENSION)
+
+def load(name, key):
+    """
+    Lit une entrée.
+
+    Returns:
+        tuple: (True, résultat) si l'entrée existe, (False, None) sinon.
+               Une entrée illisible (fichier tronqué, classe disparue...) est
+               supprimée et traitée comme absente.
+    """
+    path = _entry_path(name, key)
+    try:
+        with pa.input_stream(path, compression=CODEC) as stream:
+            result = pickle.loads(stream.read())
+    except FileNotFoundError:
+        return False, None
+    except Exception:
+        _logger.warning("Cache disque : entrée illisible supprimée (%s)", path, exc_info=True)
+        _remove(path)
+        return False, None
+    # La date de modification sert d'horodatage "dernière utilisation" pour l'éviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return True, result
+
+def store(name, key, result):
+    """
+    Écrit une entrée (fichier temporaire puis renommage atomique), puis
+    applique la borne de taille si le compteur du dossier la dépasse.
+    """
+    global _total_bytes
+    path = _entry_path(name, key)
+
+    def write(tmp_path):
+        with pa.output_stream(tmp_path, compression=CODEC) as stream:
+            stream.write(pickle.dumps(result, protocol=5))
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        write_atomic(path, write)
+        size = os.path.getsize(path)
+    except Exception:
+        _logger.warning("Cache disque : écriture impossible (%s)", path, exc_info=True)
+        return
+    with _lock:
+        if _total_bytes is None:
+            _total_bytes = sum(size for _, _, size, _ in _iter_entries())
+        else:
+            _total_bytes += size - previous
+        over_limit = _total_bytes > DISK_CACHE_MAX_BYTES
+    if over_limit:
+        # Descendre sous 90 % de la borne : les écritures suivantes ne reparcourent pas le dossier
+        evict(int(DISK_CACHE_MAX_BYTES * 0.9))
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# ==========================================================
+# ÉVICTION ET ADMINISTRATION
+# ==========================================================
+
+def _iter_entries():
+    """Parcourt les entrées : (fonction, chemin, taille, date de dernière utilisation)."""
+    if not os.path.isdir(DISK_CACHE_DIR):
+        return
+    for function_dir in os.scandir(DISK_CACHE_DIR):
+        if not function_dir.is_dir():
+            continue
+        for entry in os.scandir(function_dir.path):
+            if not entry.name.endswith(EXTENSION):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield function_dir.name, entry.path, stat.st_size, stat.st_mtime
+
+def evict(max_bytes=None):
+    """
+    Supprime les entrées les moins récemment utilisées tant que le dossier
+    dépasse `max_bytes` (par défaut `DISK_CACHE_MAX_BYTES`).
+
+    Le dossier est parcouru en entier : sa taille réelle (qui inclut les
+    écritures des autres processus) recale le compteur de `store()`.
+
+    Returns:
+        int: Nombre d'entrées supprimées.
+    """
+    global _total_bytes
+    max_bytes = DISK_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    with _lock:
+        entries = list(_iter_entries())
+        total = sum(size for _, _, size, _ in entries)
+        removed = 0
+        for _, path, size, _ in sorted(entries, key=lambda entry: entry[3]):
+            if total <= max_bytes:
+                break
+            _remove(path)
+            total -= size
+            removed += 1
+        _total_bytes = total
+    return removed
+
+def get_disk_usage():
+    """Nombre d'entrées et octets stockés sur disque, par fonction."""
+    usage = {}
+    for name, _, size, _ in _iter_entries():
+        entries, total = usage.get(name, (0, 0))
+        usage[name] = (entries + 1, total + size)
+    return usage
+
+def clear(name=None):
+    """Supprime les entrées d'une fonction (`name`), ou tout le cache disque."""
+    global _total_bytes
+    path = DISK_CACHE_DIR if name is None else os.path.join(DISK_CACHE_DIR, name)
+    with _lock:
+        shutil.rmtree(path, ignore_errors=True)
+        _total_bytes = None
@@ -0,0 +1,152 @@
+"""
+Module de Génération et de Service des Fichiers Téléchargeables.
+
+Les pages "2_🔎" et "4_♻️" proposent de télécharger le DataFrame final
+qu'elles présentent. Plutôt que de ré-encoder ce DataFrame en CSV à
+chaque visite, les fichiers sont générés **une seule fois** par une étape
+de build, puis servis tels quels :
+
+1.  `build_downloads()` écrit `netflix_cleaned` et
+    `world_happiness_2015-2019_combined` en CSV **et** en Parquet dans
+    `data/downloads/` (écriture atomique). Chaque fichier est accompagné
+    d'une étiquette (`<nom>.version`) : la version du code qui le construit
+    (`disk_cache.get_code_version`) et celle de ses sources (empreintes du
+    contenu, cf. `utils/data_watcher.py`). Il n'est régénéré que si l'une
+    d'elles a changé ; une nouvelle version publiée par la surveillance des
+    données relance le build.
+    Avec `DASHBOARD_PIPELINE_BACKEND=polars`, les DataFrames sont construits
+    par les plans paresseux de `utils/lazy_pipelines.py`.
+2.  `get_download_payload()` lit un fichier une fois par processus via
+    `@st.cache_resource` : toutes les sessions partagent le même objet
+    `bytes`, sans copie ni re-sérialisation (contrairement à `@st.cache_data`,
+    qui renvoie une copie à chaque appel).
+3.  `render_download_buttons()` affiche les boutons CSV et Parquet.
+
+Étape de build (optionnelle, sinon faite à la première visite) :
+    python -m utils.downloads
+"""
+
+import os
+import streamlit as st
+from utils import disk_cache
+from utils.io import write_atomic
+from utils.cache_registry import cached_resource
+from utils.data_watcher import get_file_versions
+from utils.netflix_cleaning import clean_netflix, RAW_PATH as NETFLIX_RAW_PATH
+from utils.happiness_harmonization import load_raw_happiness, harmonize_happiness, RAW_PATHS as HAPPINESS_RAW_PATHS
+from utils.lazy_pipelines import clean_netflix_lazy, harmonize_happiness_lazy, use_lazy_pipelines
+
+DOWNLOAD_DIR = './data/downloads'
+
+MIME_TYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# Nom du fichier -> (fichiers sources, fonction de construction du DataFrame)
+if use_lazy_pipelines():
+    DOWNLOAD_SOURCES = {
+        'netflix_cleaned': ([NETFLIX_RAW_PATH], clean_netflix_lazy),
+        'world_happiness_2015-2019_combined': (list(HAPPINESS_RAW_PATHS.values()), harmonize_happiness_lazy),
+    }
+else:
+    DOWNLOAD_SOURCES = {
+        'netflix_cleaned': ([NETFLIX_RAW_PATH], clean_netflix),
+        'world_happiness_2015-2019_combined': (list(HAPPINESS_RAW_PATHS.values()),
+                                               lambda: harmonize_happiness(load_raw_happiness())),
+    }
+ALL_SOURCES = tuple(source for sources, _ in DOWNLOAD_SOURCES.values() for source in sources)
+
+
+def get_download_path(name, fmt):
+    """Retourne le chemin du fichier téléchargeable `name` au format `fmt`."""
+    return os.path.join(DOWNLOAD_DIR, f"{name}.{fmt}")
+
+def _get_build_stamp(sources, build_df):
+    """Étiquette d'un build : version du code de `build_df` et versions de ses sources."""
+    versions = get_file_versions(sources)
+    return "\n".join([disk_cache.get_code_version(build_df), *map(str, versions)])
+
+def _is_stale(name, stamp):
+    """Vrai si un des fichiers générés est absent ou s'il a été construit avec une autre étiquette."""
+    if not all(os.path.exists(get_download_path(name, fmt)) for fmt in MIME_TYPES):
+        return True
+    try:
+        with open(get_download_path(name, 'version'), encoding='utf-8') as f:
+            return f.read() != stamp
+    except OSError:
+        return True
+
+def _write_text(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def build_downloads(force=False):
+    """
+    Génère les fichiers CSV et Parquet de chaque DataFrame téléchargeable.
+
+    Un fichier n'est régénéré que si son code ou ses sources ont changé
+    (ou si `force`). L'étiquette est écrite après les fichiers : un build
+    interrompu est refait.
+
+    Returns:
+        list: Les noms des fichiers (re)générés.
+    """
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+    built = []
+    for name, (sources, build_df) in DOWNLOAD_SOURCES.items():
+        stamp = _get_build_stamp(sources, build_df)
+        if not force and not _is_stale(name, stamp):
+            continue
+        df = build_df()
+        write_atomic(get_download_path(name, 'csv'), lambda path: df.to_csv(path, index=False))
+        write_atomic(get_download_path(name, 'parquet'), lambda path: df.to_parquet(path, index=False))
+        write_atomic(get_download_path(name, 'version'), lambda path: _write_text(path, stamp))
+        built.append(name)
+    return built
+
+@cached_resource(max_entries=2, source_files=ALL_SOURCES)
+def _ensure_downloads_built():
+    """
+    Lance l'étape de build une fois par processus et par version des sources
+    (`source_files`) : une nouvelle version publiée reconstruit les fichiers.
+    """
+    return build_downloads()
+
+@cached_resource(max_entries=8)
+def get_download_payload(path, version):
+    """
+    Charge le contenu d'un fichier téléchargeable, partagé par toutes les sessions.
+
+    Le fichier est lu une fois par processus (`cached_resource`), puis le
+    même objet `bytes` est servi à chaque session. `version` (date de
+    modification) invalide l'entrée si le fichier est régénéré.
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+def render_download_buttons(name, label, container=st, **button_kwargs):
+    """
+    Affiche les boutons de téléchargement CSV et Parquet d'un fichier généré.
+
+    Args:
+        name (str): Nom du fichier (clé de `DOWNLOAD_SOURCES`).
+        label (str): Libellé du bouton (le format est ajouté à la fin).
+        container: Conteneur Streamlit (`st`, une colonne, ...).
+    """
+    _ensure_downloads_built()
+    for fmt, mime in MIME_TYPES.items():
+        path = get_download_path(name, fmt)
+        container.download_button(
+            label=f"{label} ({fmt.upper()})",
+            data=get_download_payload(path, os.path.getmtime(path)),
+            file_name=os.path.basename(path),
+            mime=mime,
+            key=f"download_{name}_{fmt}",
+            **button_kwargs
+        )
+
+
+if __name__ == '__main__':
+    built_names = build_downloads(force=True)
+    print(f"Fichiers générés dans {DOWNLOAD_DIR} : {', '.join(built_names)}")
@@ -0,0 +1,108 @@
+"""
+Pipeline d'Harmonisation du World Happiness Report (2015-2019).
+
+Ce module reprend, sous forme de fonctions réutilisables, le processus
+d'ETL présenté sur la page "4_♻️_Partie 2 - Harmonisation des datasets" :
+
+1.  Sélection et renommage des colonnes de chaque année (`COLS_BY_YEAR`).
+2.  Ajout de la colonne `Year` et du code pays `ISO_Code`.
+3.  Rétro-ingénierie de la colonne `Region` (2017-2019) à partir de 2016.
+4.  Concaténation verticale des 5 DataFrames.
+
+Il peut être utilisé hors de Streamlit (étape de build, benchmarks).
+"""
+
+import pandas as pd
+from utils.country_names import map_country_codes
+
+RAW_PATHS = {
+    2015: './data/2015.csv',
+    2016: './data/2016.csv',
+    2017: './data/2017.csv',
+    2018: './data/2018.csv',
+    2019: './data/2019.csv',
+}
+
+# 1. Dictionnaires de renommage pour chaque année
+COLS_2015 = {
+    'Country': 'Country', 'Region': 'Region', 'Happiness Rank': 'Rank', 'Happiness Score': 'Score',
+    'Economy (GDP per Capita)': 'GDP_per_Capita', 'Family': 'Social_Support',
+    'Health (Life Expectancy)': 'Health_Life_Expectancy', 'Freedom': 'Freedom',
+    'Trust (Government Corruption)': 'Trust_Government_Corruption', 'Generosity': 'Generosity'
+}
+COLS_2016 = COLS_2015 # 2016 est identique à 2015
+COLS_2017 = {
+    'Country': 'Country', 'Happiness.Rank': 'Rank', 'Happiness.Score': 'Score',
+    'Economy..GDP.per.Capita.': 'GDP_per_Capita', 'Family': 'Social_Support',
+    'Health..Life.Expectancy.': 'Health_Life_Expectancy', 'Freedom': 'Freedom',
+    'Trust..Government.Corruption.': 'Trust_Government_Corruption', 'Generosity': 'Generosity'
+}
+COLS_2018 = {
+    'Country or region': 'Country', 'Overall rank': 'Rank', 'Score': 'Score',
+    'GDP per capita': 'GDP_per_Capita', 'Social support': 'Social_Support',
+    'Healthy life expectancy': 'Health_Life_Expectancy', 'Freedom to make life choices': 'Freedom',
+    'Perceptions of corruption': 'Trust_Government_Corruption', 'Generosity': 'Generosity'
+}
+COLS_2019 = COLS_2018 # 2019 est identique à 2018
+
+COLS_BY_YEAR = {2015: COLS_2015, 2016: COLS_2016, 2017: COLS_2017, 2018: COLS_2018, 2019: COLS_2019}
+
+# Année servant de table de correspondance Pays -> Région
+REGION_REFERENCE_YEAR = 2016
+
+# Ordre des colonnes du DataFrame final
+COLUMNS_FINAL = ['Country', 'Region', 'Rank', 'Score', 'GDP_per_Capita', 'Social_Support',
+                 'Health_Life_Expectancy', 'Freedom', 'Trust_Government_Corruption', 'Generosity',
+                 'Year', 'ISO_Code']
+
+
+def load_raw_happiness(paths=RAW_PATHS):
+    """Lit les fichiers annuels bruts (dictionnaire année -> DataFrame)."""
+    return {year: pd.read_csv(path) for year, path in paths.items()}
+
+def harmonize_year(df, year):
+    """Sélectionne, renomme et enrichit (Year, ISO_Code) le DataFrame d'une année."""
+    cols = COLS_BY_YEAR[year]
+    df = df[list(cols.keys())].rename(columns=cols)
+    df['Year'] = year
+    df['ISO_Code'] = map_country_codes(df['Country'])
+    return df
+
+def harmonize_years(raw_dfs):
+    """
+    Harmonise chaque fichier annuel et complète la colonne `Region`.
+
+    Args:
+        raw_dfs (dict): Dictionnaire année -> DataFrame brut.
+
+    Returns:
+        dict: Dictionnaire année -> DataFrame harmonisé (avant concaténation).
+    """
+    harmonized = {year: harmonize_year(df, year) for year, df in raw_dfs.items()}
+
+    # Table de correspondance Code ISO -> Région
+    # ("Trinidad & Tobago" et "Trinidad and Tobago" partagent la même clé)
+    reference = harmonized[REGION_REFERENCE_YEAR]
+    region_map = reference[['ISO_Code', 'Region']].dropna().drop_duplicates('ISO_Code').set_index('ISO_Code')['Region']
+
+    for df in harmonized.values():
+        if 'Region' not in df.columns:
+            df['Region'] = df['ISO_Code'].map(region_map)
+    return harmonized
+
+def concat_years(harmonized):
+    """Concatène verticalement les DataFrames annuels harmonisés."""
+    df_final = pd.concat([harmonized[year] for year in sorted(harmonized)], ignore_index=True)
+    return df_final[COLUMNS_FINAL]
+
+def harmonize_happiness(raw_dfs):
+    """
+    Harmonise et concatène les fichiers annuels du World Happiness Report.
+
+    Args:
+        raw_dfs (dict): Dictionnaire année -> DataFrame brut.
+
+    Returns:
+        pd.DataFrame: Le DataFrame final (colonnes `COLUMNS_FINAL`).
+    """
+    return concat_years(harmonize_years(raw_dfs))
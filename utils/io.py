@@ -0,0 +1,42 @@
+"""
+Module d'Écriture Atomique des Fichiers.
+
+Plusieurs modules écrivent des fichiers relus par d'autres sessions ou
+d'autres processus : fichiers téléchargeables (`utils/downloads.py`),
+export des mesures (`utils/profiling.py`), cache disque
+(`utils/disk_cache.py`) et sidecar Parquet du catalogue SQL
+(`utils/sql_backend.py`). Ils passent tous par `write_atomic()` :
+
+- l'écriture se fait dans un fichier temporaire, puis un renommage
+  (`os.replace`) le met en place : aucun lecteur ne voit un fichier partiel ;
+- le nom temporaire est propre au processus et au thread : deux écritures
+  simultanées du même fichier n'écrivent pas dans le même fichier temporaire ;
+- le fichier temporaire est supprimé si l'écriture échoue.
+"""
+
+import os
+import threading
+
+
+def get_temp_path(path):
+    """Chemin temporaire de `path`, propre au processus et au thread courants."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+def write_atomic(path, write_func):
+    """
+    Écrit `path` de façon atomique.
+
+    Args:
+        path (str): Chemin du fichier final.
+        write_func (callable): Écrit le contenu dans le chemin temporaire qu'elle reçoit.
+
+    Les exceptions de `write_func` sont propagées (le fichier final n'est
+    alors pas modifié).
+    """
+    tmp_path = get_temp_path(path)
+    try:
+        write_func(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
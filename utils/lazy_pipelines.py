@@ -0,0 +1,198 @@
+"""
+Pipelines de Nettoyage et d'Harmonisation en Plans Paresseux (Polars, optionnel).
+
+Les pipelines de `utils/netflix_cleaning.py` et de
+`utils/happiness_harmonization.py` sont exécutés par pandas, étape par
+étape : chaque affectation de colonne matérialise un résultat
+intermédiaire. Ce module exprime les mêmes étapes sous forme d'un plan de
+requête `polars.LazyFrame`, optimisé puis exécuté d'un bloc :
+
+- projection à la lecture : seules les colonnes utilisées sont lues
+  (`RAW_COLUMNS` de `netflix_titles.csv`, colonnes de `COLS_BY_YEAR` des
+  fichiers annuels) ;
+- les expressions d'une même étape sont fusionnées et évaluées en
+  parallèle par le pool de threads de Polars (`POLARS_MAX_THREADS`).
+
+Les codes ISO-3 ne sont pas une expression Polars (matcher approché de
+`utils/country_names.py`) : comme `map_country_codes()`, ils sont résolus
+une fois par nom distinct, puis appliqués par `replace_strict`.
+
+Les deux chemins produisent les mêmes valeurs (les types texte et
+datetime de pandas peuvent différer). Les décimaux lus par Polars sont
+arrondis au plus près, comme `pd.read_csv(float_precision='round_trip')` :
+le parseur par défaut de pandas peut s'en écarter d'un ulp (~1e-14 en
+relatif). Vérification et chronométrage sur les fichiers de `data/` :
+    pip install polars
+    python -m utils.lazy_pipelines
+
+`DASHBOARD_PIPELINE_BACKEND=polars` fait construire les fichiers
+téléchargeables (`utils/downloads.py`) par ce chemin.
+"""
+
+import os
+import time
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+from utils.country_names import resolve_country_code
+from utils.netflix_cleaning import RAW_PATH, RAW_COLUMNS, DATE_FORMAT, COLUMNS_FINAL as NETFLIX_COLUMNS_FINAL
+from utils.happiness_harmonization import (RAW_PATHS, COLS_BY_YEAR, REGION_REFERENCE_YEAR,
+                                           COLUMNS_FINAL as HAPPINESS_COLUMNS_FINAL)
+
+PIPELINE_BACKEND = os.environ.get('DASHBOARD_PIPELINE_BACKEND', 'pandas').lower()
+POLARS_AVAILABLE = importlib.util.find_spec('polars') is not None
+
+# Valeurs lues comme manquantes par `pd.read_csv` (valeurs par défaut de pandas)
+CSV_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                 '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+
+def use_lazy_pipelines():
+    """Indique si les pipelines complets passent par Polars (cf. `DASHBOARD_PIPELINE_BACKEND`)."""
+    return PIPELINE_BACKEND == 'polars' and POLARS_AVAILABLE
+
+def _country_code_expr(names, column, alias):
+    """Expression des codes ISO-3 de `column`, résolus une fois par nom distinct de `names`."""
+    import polars as pl
+
+    mapping = {name: resolve_country_code(name) for name in names.drop_nulls().unique().to_list()}
+    return pl.col(column).replace_strict(mapping, default=None, return_dtype=pl.String).alias(alias)
+
+
+# ==========================================================
+# NETFLIX
+# ==========================================================
+
+def netflix_cleaning_plan(raw_path=RAW_PATH):
+    """
+    Plan paresseux des étapes 1 à 3 du nettoyage Netflix (`CLEANING_STEPS`),
+    hors code ISO-3 du pays principal.
+
+    Returns:
+        polars.LazyFrame: Le plan (rien n'est lu avant `collect()`).
+    """
+    import polars as pl
+
+    # Tout est lu en texte (comme `RAW_DTYPES`), seules les colonnes utiles sont parsées
+    netflix = (pl.scan_csv(raw_path, infer_schema=False, null_values=CSV_NA_VALUES)
+               .select(RAW_COLUMNS)
+               .with_columns(pl.col('release_year').cast(pl.Int64)))
+
+    # Étape 1 : date d'ajout, année / mois / jour et délai d'ajout
+    date_added = pl.col('date_added').str.strip_chars().str.to_datetime(DATE_FORMAT, strict=False)
+    netflix = netflix.with_columns(date_added_feature=date_added)
+    netflix = netflix.with_columns(
+        year_added=pl.col('date_added_feature').dt.year().cast(pl.Float64),
+        month_added=pl.col('date_added_feature').dt.month().cast(pl.Float64),
+        added_day_of_month=pl.col('date_added_feature').dt.day().cast(pl.Float64),
+    )
+
+    # Étapes 2 et 3 : durées, pays et genre principaux
+    # (les deux branches de `when` sont évaluées sur toutes les lignes : conversion non stricte)
+    is_movie = (pl.col('type') == 'Movie') & pl.col('duration').is_not_null()
+    is_show = (pl.col('type') == 'TV Show') & pl.col('duration').is_not_null()
+    minutes = pl.col('duration').str.replace_all(' min', '', literal=True)
+    seasons = pl.col('duration').str.replace_all(' Seasons', '', literal=True).str.replace_all(' Season', '', literal=True)
+    return netflix.with_columns(
+        lag_time=pl.col('year_added') - pl.col('release_year'),
+        duration_min=pl.when(is_movie).then(minutes.cast(pl.Float64, strict=False)),
+        duration_seasons=pl.when(is_show).then(seasons.cast(pl.Float64, strict=False)),
+        main_country=pl.col('country').str.split(',').list.first(),
+        main_genre=pl.col('listed_in').str.split(',').list.first(),
+    )
+
+def clean_netflix_lazy(raw_path=RAW_PATH):
+    """
+    Nettoie le catalogue Netflix par un plan Polars (équivalent de `clean_netflix()`).
+
+    Returns:
+        pd.DataFrame: Le DataFrame nettoyé (colonnes `COLUMNS_FINAL`).
+    """
+    netflix = netflix_cleaning_plan(raw_path).collect()
+    netflix = netflix.with_columns(_country_code_expr(netflix['main_country'], 'main_country', 'main_country_code'))
+    return netflix.select(NETFLIX_COLUMNS_FINAL).to_pandas()
+
+
+# ==========================================================
+# WORLD HAPPINESS REPORT
+# ==========================================================
+
+def _scan_year(path, year):
+    """Plan de lecture d'un fichier annuel : colonnes de `COLS_BY_YEAR` renommées, plus `Year`."""
+    import polars as pl
+
+    # Schéma inféré sur tout le fichier : une colonne décimale ne doit pas être lue en entiers
+    return (pl.scan_csv(path, infer_schema_length=None, null_values=CSV_NA_VALUES)
+            .select([pl.col(raw).alias(name) for raw, name in COLS_BY_YEAR[year].items()])
+            .with_columns(Year=pl.lit(year, dtype=pl.Int64)))
+
+def harmonize_happiness_lazy(paths=RAW_PATHS):
+    """
+    Harmonise et concatène les fichiers annuels du World Happiness Report
+    par un plan Polars (équivalent de `harmonize_happiness(load_raw_happiness())`).
+
+    Returns:
+        pd.DataFrame: Le DataFrame final (colonnes `COLUMNS_FINAL`).
+    """
+    import polars as pl
+
+    years = {year: _scan_year(path, year) for year, path in sorted(paths.items())}
+    names = pl.concat([plan.select('Country') for plan in years.values()]).collect()['Country']
+    iso_code = _country_code_expr(names, 'Country', 'ISO_Code')
+    years = {year: plan.with_columns(iso_code) for year, plan in years.items()}
+
+    # Table de correspondance Code ISO -> Région (première région de l'année de référence)
+    region_map = (years[REGION_REFERENCE_YEAR].select('ISO_Code', 'Region').drop_nulls()
+                  .unique('ISO_Code', keep='first', maintain_order=True))
+    harmonized = []
+    for year, plan in years.items():
+        if 'Region' not in COLS_BY_YEAR[year].values():
+            plan = plan.join(region_map, on='ISO_Code', how='left', maintain_order='left')
+        harmonized.append(plan.select(HAPPINESS_COLUMNS_FINAL))
+    # Une colonne entière une année et décimale une autre est promue en décimale
+    return pl.concat(harmonized, how='vertical_relaxed').collect().to_pandas()
+
+
+# ==========================================================
+# VÉRIFICATION ET CHRONOMÉTRAGE
+# ==========================================================
+
+def _normalize_frame(df):
+    """Uniformise les types texte (object) et les valeurs manquantes avant comparaison."""
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_string_dtype(df[column]) and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].astype('object').where(df[column].notna(), np.nan)
+        elif pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].astype('datetime64[ns]')
+    return df
+
+def assert_same_result(lazy, eager, rtol=1e-12):
+    """
+    Vérifie que les deux chemins produisent les mêmes valeurs (types numériques
+    compris ; décimaux à `rtol` près, cf. lecture des décimaux par pandas).
+    """
+    pd.testing.assert_frame_equal(_normalize_frame(lazy), _normalize_frame(eager), check_exact=False, rtol=rtol, atol=0)
+
+
+if __name__ == '__main__':
+    from utils.netflix_cleaning import clean_netflix
+    from utils.happiness_harmonization import load_raw_happiness, harmonize_happiness
+    import polars as pl
+
+    pipelines = [
+        ('netflix', clean_netflix, clean_netflix_lazy),
+        ('happiness', lambda: harmonize_happiness(load_raw_happiness()), harmonize_happiness_lazy),
+    ]
+    print(f"Polars {pl.__version__}, {pl.thread_pool_size()} thread(s)")
+    for name, eager_path, lazy_path in pipelines:
+        timings = {}
+        for label, path in (('pandas', eager_path), ('polars', lazy_path)):
+            start = time.perf_counter()
+            timings[label] = path()
+            timings[label + '_s'] = time.perf_counter() - start
+        assert_same_result(timings['polars'], timings['pandas'])
+        print(f"{name:<10} pandas {timings['pandas_s'] * 1e3:8.1f} ms   polars {timings['polars_s'] * 1e3:8.1f} ms"
+              f"   ({len(timings['pandas'])} lignes identiques)")
@@ -0,0 +1,176 @@
+"""
+Pipeline de Nettoyage du Dataset Netflix (en mémoire et par morceaux).
+
+Ce module reprend, sous forme de fonctions réutilisables, les étapes de
+nettoyage présentées sur la page "2_🔎_Partie 1 - Analyse Exploratoire" :
+
+1.  `parse_date_added()`      : conversion de `date_added` en datetime (+ year/month/day, lag_time).
+2.  `split_duration()`        : séparation de la durée des films et du nombre de saisons.
+3.  `extract_main_features()` : extraction du pays principal (+ code ISO-3) et du genre principal.
+4.  `select_final_columns()`  : sélection des colonnes finales.
+
+Deux chemins d'exécution partagent exactement ces étapes :
+- `clean_netflix()` : le DataFrame complet en mémoire (comportement historique).
+- `clean_netflix_chunked()` : lecture du CSV brut par morceaux de taille fixe
+  (`chunksize`) et ajout de chaque morceau nettoyé à un fichier Parquet.
+  La mémoire maximale dépend de `chunksize`, pas de la taille du catalogue.
+
+Chaque étape ne dépend que de la ligne traitée (aucun agrégat global) et
+force des types de sortie fixes : les deux chemins produisent donc un
+résultat identique.
+
+Vérification de l'égalité des deux chemins (sans écrire dans `data/`) :
+    python -m pytest tests/test_netflix_cleaning.py
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from utils.country_names import map_country_codes
+
+RAW_PATH = './data/netflix_titles.csv'
+PARQUET_PATH = './data/netflix_cleaned.parquet'
+
+# Colonnes brutes réellement utilisées (projection à la lecture)
+RAW_COLUMNS = ['show_id', 'type', 'title', 'country', 'date_added', 'release_year', 'duration', 'listed_in']
+
+# Types imposés à la lecture : un morceau entièrement vide ne doit pas changer de type
+RAW_DTYPES = {
+    'show_id': 'object', 'type': 'object', 'title': 'object', 'country': 'object',
+    'date_added': 'object', 'release_year': 'int64', 'duration': 'object', 'listed_in': 'object',
+}
+
+# Format des dates de `date_added` (ex: "September 25, 2021")
+DATE_FORMAT = '%B %d, %Y'
+
+COLUMNS_FINAL = [
+    'show_id',
+    'type',
+    'title',
+    'main_country',
+    'main_country_code',
+    'main_genre',
+    'release_year',
+    'date_added_feature',
+    'year_added',
+    'month_added',
+    'added_day_of_month',
+    'lag_time',
+    'duration_min',
+    'duration_seasons'
+]
+
+# Schéma de sortie (Parquet) aligné sur les types pandas de `clean_netflix()`
+OUTPUT_SCHEMA = pa.schema([
+    ('show_id', pa.string()),
+    ('type', pa.string()),
+    ('title', pa.string()),
+    ('main_country', pa.string()),
+    ('main_country_code', pa.string()),
+    ('main_genre', pa.string()),
+    ('release_year', pa.int64()),
+    ('date_added_feature', pa.timestamp('ns')),
+    ('year_added', pa.float64()),
+    ('month_added', pa.float64()),
+    ('added_day_of_month', pa.float64()),
+    ('lag_time', pa.float64()),
+    ('duration_min', pa.float64()),
+    ('duration_seasons', pa.float64()),
+])
+
+
+# ==========================================================
+# ÉTAPES DE NETTOYAGE
+# ==========================================================
+
+def parse_date_added(netflix):
+    """Étape 1 : convertit `date_added` en datetime et en dérive year/month/day et `lag_time`."""
+    # Conversion de 'date_added' (objet) en 'date_added_feature' (datetime)
+    # .str.strip() supprime les espaces blancs en début et en fin
+    netflix['date_added_feature'] = pd.to_datetime(netflix['date_added'].str.strip(), format=DATE_FORMAT, errors='coerce')
+
+    # Extraction de l'année, du mois et du jour d'ajout
+    # (float64 forcé : un morceau sans date manquante donnerait sinon des entiers)
+    netflix['year_added'] = netflix['date_added_feature'].dt.year.astype('float64')
+    netflix['month_added'] = netflix['date_added_feature'].dt.month.astype('float64')
+    netflix['added_day_of_month'] = netflix['date_added_feature'].dt.day.astype('float64')
+
+    # Création de la colonne 'lag_time' : durée entre l'ajout et la sortie
+    netflix['lag_time'] = netflix['year_added'] - netflix['release_year']
+    return netflix
+
+def split_duration(netflix):
+    """Étape 2 : sépare `duration` en `duration_min` (films) et `duration_seasons` (séries)."""
+    # Initialisation des colonnes à remplir
+    netflix['duration_min'] = np.nan # Colonne pour la durée des films
+    netflix['duration_seasons'] = np.nan # Colonne pour le nombre de saisons
+
+    # Création des masques pour séparer Films et Séries
+    mask_films = (netflix['type'] == 'Movie') & (netflix['duration'].notna())
+    mask_series = (netflix['type'] == 'TV Show') & (netflix['duration'].notna())
+
+    # Application des masques et séparation
+    netflix.loc[mask_films, 'duration_min'] = netflix.loc[mask_films, 'duration'].str.replace(' min', '').astype(float)
+    netflix.loc[mask_series, 'duration_seasons'] = netflix.loc[mask_series, 'duration'].str.replace(' Seasons', '').str.replace(' Season', '').astype(float)
+    return netflix
+
+def extract_main_features(netflix):
+    """Étape 3 : extrait le pays principal (et son code ISO-3) et le genre principal."""
+    # Pour les pays
+    netflix['main_country'] = netflix['country'].str.split(',').str[0]
+
+    # Code ISO-3 du pays principal (clé commune avec le World Happiness Report)
+    netflix['main_country_code'] = map_country_codes(netflix['main_country'])
+
+    # Pour les catégories
+    netflix['main_genre'] = netflix['listed_in'].str.split(',').str[0]
+    return netflix
+
+def select_final_columns(netflix):
+    """Étape 4 : ne conserve que les colonnes utiles à l'analyse."""
+    # Nouveau dataframe à partir de la liste de colonnes finales (COLUMNS_FINAL)
+    return netflix[COLUMNS_FINAL].copy()
+
+# Étapes du pipeline, dans l'ordre d'exécution
+CLEANING_STEPS = [parse_date_added, split_duration, extract_main_features, select_final_columns]
+
+def clean_chunk(netflix):
+    """Applique les 4 étapes de nettoyage à un DataFrame (complet ou morceau)."""
+    for step in CLEANING_STEPS:
+        netflix = step(netflix)
+    return netflix
+
+
+# ==========================================================
+# CHEMINS D'EXÉCUTION
+# ==========================================================
+
+def clean_netflix(raw_path=RAW_PATH):
+    """
+    Nettoie le catalogue Netflix entièrement en mémoire.
+
+    Returns:
+        pd.DataFrame: Le DataFrame nettoyé (colonnes `COLUMNS_FINAL`).
+    """
+    netflix = pd.read_csv(raw_path, usecols=RAW_COLUMNS, dtype=RAW_DTYPES)
+    return clean_chunk(netflix)
+
+def clean_netflix_chunked(raw_path=RAW_PATH, output_path=PARQUET_PATH, chunksize=50_000):
+    """
+    Nettoie le catalogue Netflix par morceaux de `chunksize` lignes.
+
+    Chaque morceau est lu, nettoyé puis ajouté (row group) au fichier
+    Parquet `output_path` avant de lire le suivant : seul un morceau
+    réside en mémoire à la fois.
+
+    Returns:
+        int: Le nombre total de lignes écrites.
+    """
+    total_rows = 0
+    with pq.ParquetWriter(output_path, OUTPUT_SCHEMA) as writer:
+        for chunk in pd.read_csv(raw_path, usecols=RAW_COLUMNS, dtype=RAW_DTYPES, chunksize=chunksize):
+            cleaned = clean_chunk(chunk)
+            writer.write_table(pa.Table.from_pandas(cleaned, schema=OUTPUT_SCHEMA, preserve_index=False))
+            total_rows += len(cleaned)
+    return total_rows
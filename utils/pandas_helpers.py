@@ -2,15 +2,180 @@
 Cette page regroupe et met en cache les fonctions utiles afin d'aléger le code des autres pages.
 """
 
+import numpy as np
 import pandas as pd
-import streamlit as st
+from utils.cache_registry import cached_data
 
-@st.cache_data
+@cached_data(max_entries=16, disk=True)
 def get_extremes_by_year(df, variable_col, ascending=False, n=10):
         """
         Groupe par 'Year', puis pour chaque année, trouve les N
         premiers/derniers pays pour la 'variable_col' sélectionnée.
+
+        Un tri stable suivi de `groupby().head(n)` garde la colonne 'Year'
+        (que `groupby().apply` retire depuis pandas 3) et évite un appel
+        Python par groupe.
+        """
+        return (df.sort_values(variable_col, ascending=ascending, kind='stable')
+                .groupby('Year').head(n)
+                .sort_values('Year', kind='stable')
+                .reset_index(drop=True))
+
+# Indicateurs du World Happiness Report repris dans les vues croisées
+WHR_INDICATORS = ['Score', 'GDP_per_Capita', 'Social_Support', 'Health_Life_Expectancy',
+                  'Freedom', 'Trust_Government_Corruption', 'Generosity']
+
+# Types de stockage du panel WHR : indicateurs en float32 (7 chiffres
+# significatifs, pour des valeurs publiées avec 3 à 5 décimales), rang et
+# année en int16, noms répétés en catégories
+WHR_COMPACT_DTYPES = {**dict.fromkeys(WHR_INDICATORS, 'float32'), 'Rank': 'int16', 'Year': 'int16',
+                      **dict.fromkeys(['Country', 'Region', 'ISO_Code'], 'category')}
+
+def compact_happiness_frame(happiness_df):
+        """
+        Convertit le panel WHR dans ses types de stockage compacts
+        (`WHR_COMPACT_DTYPES`) ; les colonnes absentes sont ignorées.
+
+        Une catégorie est un dictionnaire des valeurs distinctes plus un code
+        entier par ligne : les ~170 pays (et leurs régions, codes ISO-3) ne
+        sont stockés qu'une fois. Les moyennes, le tri et le Top N travaillent
+        sur des colonnes deux fois plus étroites ; `corr()` calcule toujours
+        en float64.
+        """
+        dtypes = {col: dtype for col, dtype in WHR_COMPACT_DTYPES.items() if col in happiness_df.columns}
+        # `astype` laisse un bloc par colonne convertie : la copie regroupe les
+        # indicateurs float32 en un seul tableau 2D (agrégations par groupe ~3x plus rapides)
+        return happiness_df.astype(dtypes).copy()
+
+def build_country_year_panel(netflix_df, happiness_df):
+        """
+        Construit la table croisée Netflix x World Happiness, indexée par
+        (`ISO_Code`, `Year`).
+
+        Pour chaque pays et chaque année du WHR, on associe le nombre de
+        productions Netflix (par `release_year` et `main_country_code`)
+        aux indicateurs de bonheur. Un pays sans production a un compte de 0.
+        La table est compacte (compteurs en int32, Region en catégorie) et
+        n'a pas à être recalculée tant que les datasets ne changent pas.
+        """
+        counts = (netflix_df.dropna(subset=['main_country_code'])
+                  .groupby(['main_country_code', 'release_year', 'type'])
+                  .size()
+                  .unstack('type', fill_value=0)
+                  .rename(columns={'Movie': 'nb_movies', 'TV Show': 'nb_tv_shows'}))
+        counts.index = counts.index.set_names(['ISO_Code', 'Year'])
+        counts = counts.reindex(columns=['nb_movies', 'nb_tv_shows'], fill_value=0)
+        counts['nb_titles'] = counts['nb_movies'] + counts['nb_tv_shows']
+
+        panel = (happiness_df.dropna(subset=['ISO_Code'])
+                 .set_index(['ISO_Code', 'Year'])[['Country', 'Region'] + WHR_INDICATORS]
+                 .join(counts, how='left'))
+        count_cols = ['nb_titles', 'nb_movies', 'nb_tv_shows']
+        panel[count_cols] = panel[count_cols].fillna(0).astype('int32')
+        panel['Region'] = panel['Region'].astype('category')
+        return panel.sort_index()
+
+# Pas de la grille d'évaluation des densités (en unités de la variable)
+KDE_GRID_STEP = 0.25
+
+def binned_kde(values, weights, step=KDE_GRID_STEP):
+        """
+        Estime une densité gaussienne à partir de données déjà regroupées
+        (valeurs distinctes et effectifs), par binning sur une grille
+        régulière puis convolution par FFT.
+
+        Le coût ne dépend que de la taille de la grille, pas du nombre de
+        lignes : la même courbe s'obtient pour 8 000 ou 10 millions de titres.
+        La largeur de bande suit la règle de Scott sur l'effectif total (comme
+        `sns.kdeplot`) et la grille est limitée à l'étendue des données (`cut=0`,
+        comme `sns.histplot(kde=True)`).
+
+        Returns:
+            tuple | None: (grille, densité), ou None si la densité n'est pas
+                          définie (moins de 2 observations ou variance nulle).
+        """
+        values = np.asarray(values, dtype='float64')
+        weights = np.asarray(weights, dtype='float64')
+        n = weights.sum()
+        if n < 2:
+            return None
+        mean = np.average(values, weights=weights)
+        std = np.sqrt(np.average((values - mean) ** 2, weights=weights))
+        if std == 0:
+            return None
+        bandwidth = std * n ** (-1 / 5)
+
+        # Binning linéaire des effectifs sur la grille
+        grid = np.arange(values.min(), values.max() + step / 2, step)
+        position = (values - grid[0]) / step
+        left = np.clip(np.floor(position).astype('int64'), 0, len(grid) - 1)
+        right = np.minimum(left + 1, len(grid) - 1)
+        frac = position - left
+        binned = (np.bincount(left, weights * (1 - frac), minlength=len(grid))
+                  + np.bincount(right, weights * frac, minlength=len(grid)))
+
+        # Convolution par un noyau gaussien tronqué à 4 largeurs de bande
+        half = int(np.ceil(4 * bandwidth / step))
+        offsets = np.arange(-half, half + 1) * step
+        kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+        size = len(binned) + len(kernel) - 1
+        density = np.fft.irfft(np.fft.rfft(binned, size) * np.fft.rfft(kernel, size), size)
+        density = density[half:half + len(grid)] / n
+        return grid, np.clip(density, 0, None)
+
+def compute_box_stats(values, label='', whis=1.5):
+        """
+        Calcule le résumé d'un boxplot (quartiles, moustaches à `whis` x IQR,
+        valeurs aberrantes), au format attendu par `Axes.bxp`.
+
+        Les valeurs aberrantes sont dédoublonnées : le tracé est identique
+        (points superposés) et le résumé reste compact.
+
+        Returns:
+            dict | None: Le résumé, ou None si `values` est vide.
+        """
+        values = pd.Series(values).dropna().to_numpy(dtype='float64')
+        if len(values) == 0:
+            return None
+        q1, med, q3 = np.percentile(values, [25, 50, 75])
+        low, high = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+        inside = values[(values >= low) & (values <= high)]
+        return {
+            'label': label,
+            'med': med, 'q1': q1, 'q3': q3,
+            'whislo': inside.min(), 'whishi': inside.max(),
+            'fliers': np.unique(values[(values < low) | (values > high)]),
+            'mean': values.mean(),
+            'n': len(values),
+        }
+
+def grouped_box_stats(df, value_col, by_col, top_n=None):
+        """
+        Calcule un résumé de boxplot par groupe (`by_col`), pour les `top_n`
+        groupes les plus fréquents (tous si None), du plus au moins fréquent.
+        """
+        df = df.dropna(subset=[value_col, by_col])
+        groups = df[by_col].value_counts().index
+        if top_n is not None:
+            groups = groups[:top_n]
+        grouped = df.groupby(by_col)[value_col]
+        return [compute_box_stats(grouped.get_group(group), label=group) for group in groups]
+
+@cached_data(max_entries=4, disk=True)
+def get_duration_box_stats(netflix_df, top_genres=10):
+        """
+        Précalcule une fois les résumés des boxplots de durée du catalogue Netflix :
+        films (`duration_min`) et séries (`duration_seasons`), au global et
+        pour les `top_genres` genres principaux les plus fréquents.
+
+        Les boxplots sont ensuite tracés à partir de ces résumés (`Axes.bxp`),
+        sans relire le catalogue.
         """
-        return (df.groupby('Year')
-                .apply(lambda x: x.sort_values(variable_col, ascending=ascending).head(n))
-                .reset_index(drop=True)) 
\ No newline at end of file
+        movies = netflix_df[netflix_df['type'] == 'Movie']
+        series = netflix_df[netflix_df['type'] == 'TV Show']
+        return {
+            'movies': compute_box_stats(movies['duration_min'], label='Films'),
+            'series': compute_box_stats(series['duration_seasons'], label='Séries'),
+            'movies_by_genre': grouped_box_stats(movies, 'duration_min', 'main_genre', top_genres),
+            'series_by_genre': grouped_box_stats(series, 'duration_seasons', 'main_genre', top_genres),
+        }
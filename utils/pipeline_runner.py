@@ -0,0 +1,94 @@
+"""
+Exécution Mise en Cache des Pipelines "Making-of" (pages 2 et 4).
+
+Les pages "2_🔎_Partie 1 - Analyse Exploratoire" et
+"4_♻️_Partie 2 - Harmonisation des datasets" présentent les étapes
+de nettoyage une par une. Plutôt que de ré-exécuter tout le pipeline
+(et d'afficher `.head()` sur le DataFrame complet) à chaque visite,
+le pipeline est exécuté **une seule fois par version des données** :
+
+- `run_with_snapshots()` applique les étapes et capture, après chacune,
+  un instantané léger (les premières lignes, le schéma et les dimensions).
+- Les fonctions `get_..._snapshots()` mettent ces instantanés en cache
+  avec `@st.cache_data` ; la page ne fait ensuite que les ré-afficher,
+  en temps constant, avec le code source des étapes (`get_step_source`).
+"""
+
+import inspect
+import pandas as pd
+import streamlit as st
+from data_loader import load_netflix_data_cleaning, load_happiness_all_df
+from utils.netflix_cleaning import CLEANING_STEPS
+from utils.happiness_harmonization import RAW_PATHS, harmonize_years, concat_years
+from utils.cache_registry import cached_data
+
+def take_snapshot(df, n_rows=5):
+    """
+    Capture l'état d'un DataFrame à un instant donné.
+
+    Returns:
+        dict: `head` (premières lignes), `schema` (type et nombre de
+              valeurs non nulles par colonne) et `shape`.
+    """
+    schema = pd.DataFrame({
+        'type': df.dtypes.astype(str),
+        'valeurs non nulles': df.notna().sum()
+    })
+    return {'head': df.head(n_rows).copy(), 'schema': schema, 'shape': df.shape}
+
+def run_with_snapshots(df, steps):
+    """Applique `steps` dans l'ordre et retourne le résultat et un instantané par étape."""
+    snapshots = []
+    for step in steps:
+        df = step(df)
+        snapshots.append(take_snapshot(df))
+    return df, snapshots
+
+def get_step_source(step):
+    """Retourne le code source d'une étape (affiché à la place de `st.echo`)."""
+    return inspect.getsource(step)
+
+def render_snapshot(snapshot):
+    """Affiche un instantané : aperçu des premières lignes, dimensions et schéma."""
+    st.dataframe(snapshot['head'], width="stretch")
+    nb_rows, nb_cols = snapshot['shape']
+    st.caption(f"{nb_rows} lignes x {nb_cols} colonnes")
+    with st.expander("Voir le schéma (types et valeurs non nulles)"):
+        st.dataframe(snapshot['schema'], width="stretch")
+
+@cached_data(max_entries=2, disk=True)
+def get_netflix_cleaning_snapshots(dataset_version):
+    """
+    Exécute une fois le nettoyage Netflix et met en cache ses instantanés.
+
+    Args:
+        dataset_version: Version du fichier brut (cf. `data_loader.get_dataset_version`).
+
+    Returns:
+        list | None: Un instantané par étape de `CLEANING_STEPS`, ou None
+                     si le dataset brut n'a pas pu être chargé.
+    """
+    netflix = load_netflix_data_cleaning()
+    if netflix is None:
+        return None
+    _, snapshots = run_with_snapshots(netflix, CLEANING_STEPS)
+    return snapshots
+
+@cached_data(max_entries=2, disk=True)
+def get_happiness_harmonization_snapshots(dataset_version):
+    """
+    Exécute une fois l'harmonisation du World Happiness Report et met en cache ses instantanés.
+
+    Returns:
+        dict | None: `years` (année -> instantané du fichier harmonisé) et
+                     `final` (instantané du DataFrame concaténé), ou None
+                     si les fichiers bruts n'ont pas pu être chargés.
+    """
+    loaded_data = load_happiness_all_df()
+    if loaded_data is None:
+        return None
+    harmonized = harmonize_years(dict(zip(RAW_PATHS, loaded_data)))
+    return {
+        'years': {year: take_snapshot(df) for year, df in harmonized.items()},
+        'final': take_snapshot(concat_years(harmonized)),
+    }
@@ -0,0 +1,200 @@
+"""
+Module d'Instrumentation des Dashboards (mesure du temps par section).
+
+Quand un rerun du Dashboard est lent, ce module permet de savoir où part
+le temps : filtrage, KPIs, construction d'une figure (`px.choropleth`,
+`sns.heatmap`...), ou sérialisation (encodage PNG, `st.plotly_chart`).
+
+API :
+- `span(name)` : gestionnaire de contexte qui chronomètre un bloc.
+- `@timed(name)` : décorateur qui chronomètre chaque appel d'une fonction.
+- `get_span_stats()` : statistiques agrégées (compte, moyenne, p50/p95, histogramme).
+- `render_profiling_panel()` : panneau de debug dans la barre latérale.
+- `export_metrics(path)` : export JSON des statistiques (écriture atomique).
+- `export_metrics_throttled()` : export au plus une fois par
+  `DASHBOARD_METRICS_INTERVAL` secondes (défaut : 30), appelable à chaque rerun.
+
+Les mesures sont agrégées **par processus** : toutes les sessions
+Streamlit alimentent les mêmes histogrammes (latences par tranches fixes).
+
+Activation (désactivé par défaut) :
+    DASHBOARD_PROFILING=1 streamlit run app.py
+
+Désactivé, `span()` retourne un contexte vide partagé et `@timed` retourne
+la fonction d'origine, sans enveloppe : le coût est quasi nul.
+"""
+
+import os
+import json
+import time
+import threading
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+
+import pandas as pd
+import streamlit as st
+from utils.io import write_atomic
+
+PROFILING_ENABLED = os.environ.get('DASHBOARD_PROFILING', '0').lower() in ('1', 'true', 'yes')
+METRICS_PATH = os.environ.get('DASHBOARD_METRICS_PATH', './data/metrics/spans.json')
+METRICS_INTERVAL = float(os.environ.get('DASHBOARD_METRICS_INTERVAL', 30))
+
+# Bornes supérieures des tranches de l'histogramme (en millisecondes)
+BUCKET_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+_NULL_SPAN = nullcontext()
+_lock = threading.Lock()
+_stats = {}
+_last_export = 0.0
+
+
+# ==========================================================
+# AGRÉGATION
+# ==========================================================
+
+def record_span(name, duration):
+    """Ajoute une mesure (en secondes) à l'histogramme du span `name`."""
+    duration_ms = duration * 1000
+    with _lock:
+        stat = _stats.get(name)
+        if stat is None:
+            stat = _stats[name] = {'count': 0, 'total_ms': 0.0, 'min_ms': duration_ms, 'max_ms': duration_ms,
+                                   'buckets': [0] * (len(BUCKET_BOUNDS_MS) + 1)}
+        stat['count'] += 1
+        stat['total_ms'] += duration_ms
+        stat['min_ms'] = min(stat['min_ms'], duration_ms)
+        stat['max_ms'] = max(stat['max_ms'], duration_ms)
+        stat['buckets'][bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+
+def _bucket_quantile(buckets, count, q):
+    """Estime un quantile à partir de l'histogramme (borne supérieure de la tranche atteinte)."""
+    target = q * count
+    cumulative = 0
+    for bound, n in zip(BUCKET_BOUNDS_MS + [float('inf')], buckets):
+        cumulative += n
+        if cumulative >= target:
+            return bound
+    return float('inf')
+
+def get_span_stats():
+    """
+    Retourne les statistiques agrégées de chaque span.
+
+    Returns:
+        dict: Nom du span -> compte, total, min, max, moyenne, p50, p95 (ms) et tranches.
+    """
+    with _lock:
+        snapshot = {name: {**stat, 'buckets': list(stat['buckets'])} for name, stat in _stats.items()}
+    for stat in snapshot.values():
+        stat['mean_ms'] = stat['total_ms'] / stat['count']
+        stat['p50_ms'] = _bucket_quantile(stat['buckets'], stat['count'], 0.5)
+        stat['p95_ms'] = _bucket_quantile(stat['buckets'], stat['count'], 0.95)
+    return snapshot
+
+def reset_span_stats():
+    """Vide toutes les statistiques."""
+    with _lock:
+        _stats.clear()
+
+
+# ==========================================================
+# API DE MESURE
+# ==========================================================
+
+class _Span:
+    """Contexte qui chronomètre son bloc et enregistre la durée, même en cas d'exception."""
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_span(self.name, time.perf_counter() - self.start)
+        return False
+
+def span(name):
+    """
+    Chronomètre un bloc de code.
+
+    Exemple :
+        with span("happiness.map.build"):
+            fig_map = create_map_figure(...)
+    """
+    if not PROFILING_ENABLED:
+        return _NULL_SPAN
+    return _Span(name)
+
+def timed(name=None):
+    """
+    Décorateur qui chronomètre chaque appel de la fonction (span `name`,
+    par défaut `module.fonction`).
+
+    Placé **sous** `@st.cache_data`, il ne mesure que les calculs réels
+    (les "misses" du cache).
+    """
+    def decorator(func):
+        if not PROFILING_ENABLED:
+            return func
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ==========================================================
+# EXPORT ET PANNEAU DE DEBUG
+# ==========================================================
+
+def export_metrics(path=METRICS_PATH):
+    """Écrit les statistiques au format JSON (fichier temporaire puis renommage atomique)."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    report = {'bucket_bounds_ms': BUCKET_BOUNDS_MS, 'exported_at': time.time(), 'spans': get_span_stats()}
+
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=2)
+    write_atomic(path, write)
+    return path
+
+def export_metrics_throttled(path=METRICS_PATH, interval=METRICS_INTERVAL):
+    """
+    Exporte les statistiques si le dernier export du processus date de plus
+    de `interval` secondes (un seul thread exporte à la fois).
+
+    Returns:
+        str | None: Le chemin écrit, ou None si l'export n'était pas dû.
+    """
+    global _last_export
+    now = time.monotonic()
+    with _lock:
+        if now - _last_export < interval:
+            return None
+        _last_export = now
+    return export_metrics(path)
+
+def render_profiling_panel():
+    """Affiche les statistiques des spans dans la barre latérale (si l'instrumentation est active)."""
+    if not PROFILING_ENABLED:
+        return
+    stats = get_span_stats()
+    with st.sidebar.expander("⏱️ Profilage (debug)"):
+        if not stats:
+            st.caption("Aucune mesure pour le moment.")
+            return
+        df_stats = pd.DataFrame.from_dict(stats, orient='index')
+        df_stats = df_stats[['count', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms']].sort_values('mean_ms', ascending=False)
+        st.dataframe(df_stats.round(1), width="stretch")
+        col_export, col_reset = st.columns(2)
+        if col_export.button("Exporter", key="profiling_export"):
+            st.caption(f"Écrit dans {export_metrics()}")
+        if col_reset.button("Réinitialiser", key="profiling_reset"):
+            reset_span_stats()
@@ -0,0 +1,158 @@
+"""
+Module de Rendu des Graphiques en Parallèle (pool de processus, optionnel).
+
+Le rendu Matplotlib est lié au CPU et sérialisé par le GIL : dans un même
+processus, les graphiques d'un rerun sont dessinés l'un après l'autre. Ce
+module permet de les envoyer à un `ProcessPoolExecutor` de workers
+"chauds" (charte `setup_netflix_theme` déjà appliquée au démarrage).
+
+API :
+- `@pooled` : placé **sous** `@cached_data`, exécute le constructeur de
+  graphique dans un worker (en cas de miss du cache) et retourne son
+  résultat (l'image PNG encodée).
+- `render_charts(calls)` : résout plusieurs graphiques en même temps ;
+  un rerun à froid dure alors à peu près le temps du graphique le plus lent.
+
+Une "spec" de graphique envoyée au worker est : l'identifiant du
+constructeur (`module:fonction`) + ses arguments, c'est-à-dire des
+données déjà agrégées (comptes, résumés de boîtes, matrice de
+corrélation...) et la charte (couleurs) : elle est légère à sérialiser.
+
+Activation (désactivé par défaut : rendu dans le processus Streamlit) :
+    DASHBOARD_RENDER_BACKEND=process DASHBOARD_RENDER_WORKERS=4 streamlit run app.py
+"""
+
+import os
+import sys
+import types
+import atexit
+import importlib
+import threading
+import multiprocessing
+from functools import wraps
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from utils.data_watcher import get_pinned_versions, pin_data_versions
+
+RENDER_BACKEND = os.environ.get('DASHBOARD_RENDER_BACKEND', 'inline').lower()
+RENDER_WORKERS = int(os.environ.get('DASHBOARD_RENDER_WORKERS', 0)) or os.cpu_count() or 1
+# Modules dont les constructeurs sont importés (et la charte appliquée) au démarrage des workers
+WARM_MODULES = ('dashboards.netflix_page',)
+
+_lock = threading.Lock()
+_pool = None
+_charts = {}
+
+
+# ==========================================================
+# CÔTÉ WORKER
+# ==========================================================
+
+def _init_worker(modules):
+    """Prépare un worker : backend Agg, puis import des modules (charte appliquée, constructeurs inscrits)."""
+    import matplotlib
+    from streamlit import logger
+    matplotlib.use('Agg')
+    # Hors serveur, chaque fonction mise en cache signale l'absence de runtime Streamlit
+    logger.set_log_level('error')
+    for module in modules:
+        importlib.import_module(module)
+
+def _warm_up():
+    """Tâche vide : force le démarrage d'un worker."""
+    return os.getpid()
+
+def _render_chart(chart_id, args):
+    """Exécute le constructeur `chart_id` (fonction d'origine, sans cache) dans le worker."""
+    module, _, _ = chart_id.partition(':')
+    importlib.import_module(module)
+    return _charts[chart_id](*args)
+
+
+# ==========================================================
+# CÔTÉ STREAMLIT
+# ==========================================================
+
+def _start_pool():
+    """
+    Crée le pool et démarre tous ses workers.
+
+    'spawn' évite de forker un serveur multi-threadé. Mais un processus
+    "spawné" réexécute le module `__main__` du parent, que Streamlit
+    remplace par le script de la page en cours : les workers sont donc
+    tous démarrés ici (une tâche vide chacun), `__main__` étant
+    temporairement un module vide.
+    """
+    pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS,
+                               mp_context=multiprocessing.get_context('spawn'),
+                               initializer=_init_worker, initargs=(WARM_MODULES,))
+    main_module = sys.modules['__main__']
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        warm_up = [pool.submit(_warm_up) for _ in range(RENDER_WORKERS)]
+    finally:
+        sys.modules['__main__'] = main_module
+    wait(warm_up)
+    return pool
+
+def get_render_pool():
+    """Retourne le pool de processus (créé au premier appel, partagé par toutes les sessions)."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = _start_pool()
+            atexit.register(_pool.shutdown, cancel_futures=True)
+        return _pool
+
+def pooled(func):
+    """
+    Inscrit un constructeur de graphique et, avec le backend 'process',
+    l'exécute dans un worker du pool.
+
+    Avec le backend par défaut ('inline'), la fonction est retournée telle quelle.
+    """
+    chart_id = f"{func.__module__}:{func.__qualname__}"
+    _charts[chart_id] = func
+    if RENDER_BACKEND != 'process':
+        return func
+
+    @wraps(func)
+    def wrapper(*args):
+        return get_render_pool().submit(_render_chart, chart_id, args).result()
+    return wrapper
+
+def _init_render_thread(ctx, versions):
+    """
+    Prépare un thread de `render_charts` : contexte de la session (cache,
+    avertissements Streamlit) et versions des données épinglées par l'appelant.
+    """
+    add_script_run_ctx(None, ctx)
+    if versions is not None:
+        pin_data_versions(versions)
+
+def render_charts(calls):
+    """
+    Résout plusieurs graphiques et retourne leurs résultats.
+
+    Args:
+        calls (dict): Nom -> (constructeur mis en cache, tuple d'arguments).
+
+    Returns:
+        dict: Nom -> résultat du constructeur (image PNG).
+
+    Avec le backend 'process', chaque appel passe par son propre thread :
+    les hits du cache reviennent aussitôt, les misses attendent leur worker
+    en parallèle. Sinon, les appels sont faits l'un après l'autre.
+    """
+    if RENDER_BACKEND != 'process' or len(calls) < 2:
+        return {name: builder(*args) for name, (builder, args) in calls.items()}
+
+    # Les threads héritent du contexte de la session et des versions épinglées
+    # (propres à chaque thread) ; leur nom prolonge celui de l'appelant
+    # ("cache-warmup-render_0"...), cf. `dashboards/warmup.py`
+    ctx = get_script_run_ctx(suppress_warning=True)
+    with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix=f"{threading.current_thread().name}-render",
+                            initializer=_init_render_thread, initargs=(ctx, get_pinned_versions())) as threads:
+        futures = {name: threads.submit(builder, *args) for name, (builder, args) in calls.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,322 @@
+"""
+Module de Requêtes SQL Embarquées (backend DuckDB, optionnel).
+
+Par défaut, le dashboard Netflix charge le catalogue dans un DataFrame
+pandas et le filtre par l'index bitmap (`utils/bitmap_index.py`). Avec ce
+backend, le catalogue est chargé dans une base DuckDB en mémoire
+(colonnaire), depuis le CSV ou depuis son fichier Parquet "sidecar"
+(`netflix_cleaned.sql.parquet`) : aucun DataFrame pandas du catalogue
+n'est construit. Le sidecar est écrit par ce module, à partir du CSV, au
+premier chargement ; il porte la version du CSV dont il est la copie
+(métadonnées Parquet `source_version`) et n'est relu que si elle est
+toujours celle du CSV. Les KPIs, le Top N,
+les comptes par année, la matrice de corrélation et les résumés des
+boxplots sont des requêtes SQL qui retournent de petits résultats.
+
+Les colonnes catégorielles (type, pays, genre) sont stockées en ENUM
+(dictionnaire de valeurs, codes entiers) : les filtres et les regroupements
+comparent des entiers et non des chaînes, comme les codes de l'index bitmap.
+
+Le "catalogue" est un dictionnaire qui reprend les clés et les fonctions
+de l'index bitmap (`categories`, `select_rows`, `count_values`,
+`most_frequent`, `get_value_range`) : le dashboard l'utilise de la même
+façon. Une "sélection" n'est pas une liste de numéros de lignes mais une
+clause WHERE et ses paramètres.
+
+Activation :
+    pip install duckdb
+    DASHBOARD_QUERY_BACKEND=duckdb streamlit run app.py
+
+`DASHBOARD_QUERY_BACKEND=auto` n'utilise DuckDB qu'au-delà de
+`DASHBOARD_SQL_AUTO_MB` Mo de CSV (défaut : 64, environ 650 000 titres) :
+en dessous, le DataFrame et l'index bitmap sont plus rapides.
+"""
+
+import os
+import importlib.util
+
+import numpy as np
+import pandas as pd
+from streamlit.logger import get_logger
+from utils.io import write_atomic
+from utils.data_watcher import hash_file
+
+QUERY_BACKEND = os.environ.get('DASHBOARD_QUERY_BACKEND', 'pandas').lower()
+SQL_AUTO_MIN_MB = float(os.environ.get('DASHBOARD_SQL_AUTO_MB', 64))
+DUCKDB_AVAILABLE = importlib.util.find_spec('duckdb') is not None
+TABLE = 'catalogue'
+
+_logger = get_logger(__name__)
+if QUERY_BACKEND != 'pandas' and not DUCKDB_AVAILABLE:
+    _logger.warning("DASHBOARD_QUERY_BACKEND=%s : duckdb n'est pas installé, backend pandas utilisé.", QUERY_BACKEND)
+
+
+def use_sql_backend(path):
+    """Indique si le dataset `path` doit être interrogé par DuckDB (cf. `DASHBOARD_QUERY_BACKEND`)."""
+    if QUERY_BACKEND == 'pandas' or not DUCKDB_AVAILABLE:
+        return False
+    if QUERY_BACKEND == 'auto':
+        try:
+            return os.path.getsize(path) >= SQL_AUTO_MIN_MB * 1e6
+        except OSError:
+            return False
+    return True
+
+def sidecar_path(path):
+    """
+    Chemin du fichier Parquet associé à un CSV (`x.csv` -> `x.sql.parquet`).
+
+    Le nom est propre à ce module : `x.parquet` peut être écrit par un autre
+    traitement, avec un autre schéma (cf. `utils/netflix_cleaning.py`).
+    """
+    return os.path.splitext(path)[0] + '.sql.parquet'
+
+
+# ==========================================================
+# CONSTRUCTION
+# ==========================================================
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+def _sidecar_version(con, parquet):
+    """Version du CSV dont le sidecar est la copie (None s'il est absent, illisible ou d'un autre format)."""
+    if not os.path.exists(parquet):
+        return None
+    try:
+        rows = con.execute("SELECT value FROM parquet_kv_metadata(?) WHERE key = 'source_version'",
+                           [parquet]).fetchall()
+    except Exception:
+        return None
+    return rows[0][0].decode() if rows else None
+
+def _write_sidecar(con, table, parquet, source_version):
+    """Écrit `table` dans le sidecar (fichier temporaire puis renommage atomique) ; un échec est journalisé."""
+    def write(tmp_path):
+        con.execute(f"COPY {table} TO {_literal(tmp_path)} "
+                    f"(FORMAT parquet, KV_METADATA {{source_version: {_literal(source_version)}}})")
+    try:
+        write_atomic(parquet, write)
+    except Exception:
+        _logger.warning("Catalogue SQL : écriture du sidecar impossible (%s)", parquet, exc_info=True)
+
+def build_sql_catalogue(path, categorical_columns, range_columns, source_version=None, sidecar=True):
+    """
+    Charge un dataset dans une base DuckDB en mémoire.
+
+    Le fichier Parquet associé (`sidecar_path`) est lu à la place du CSV
+    s'il a été écrit à partir de la version courante du CSV ; sinon le CSV
+    est lu puis recopié dans le sidecar pour les chargements suivants.
+    Lève `FileNotFoundError` si le CSV est manquant. Les colonnes
+    catégorielles sont converties en ENUM (valeurs triées : l'ordre des
+    codes est celui des valeurs).
+
+    Args:
+        path (str): Chemin du CSV.
+        categorical_columns (list): Colonnes filtrées par valeurs.
+        range_columns (list): Colonnes numériques filtrées par intervalle.
+        source_version (str | None): Version du CSV (cf. `utils/data_watcher.py`),
+            calculée si elle n'est pas fournie.
+        sidecar (bool): False : lit toujours le CSV, sans écrire de sidecar.
+
+    Returns:
+        dict: `engine`, `con` (connexion DuckDB), `source`, `n_rows`,
+              `categories` (valeurs triées des colonnes catégorielles) et
+              `ranges` (minimum et maximum des colonnes d'intervalle).
+    """
+    import duckdb
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    con = duckdb.connect()
+    parquet = sidecar_path(path)
+    if sidecar and source_version is None:
+        source_version = hash_file(path)
+    if sidecar and source_version is not None and _sidecar_version(con, parquet) == source_version:
+        source, reader = parquet, f"read_parquet({_literal(parquet)})"
+    else:
+        source, reader = path, f"read_csv({_literal(path)}, header = true)"
+
+    catalogue = {'engine': 'duckdb', 'con': con, 'source': source, 'categories': {}, 'ranges': {}}
+    con.execute(f"CREATE TEMP TABLE staging AS SELECT * FROM {reader}")
+    if sidecar and source == path and source_version is not None:
+        _write_sidecar(con, 'staging', parquet, source_version)
+    enums = []
+    for column in categorical_columns:
+        values = [value for value, in con.execute(f"SELECT DISTINCT {_quote(column)} FROM staging "
+                                                  f"WHERE {_quote(column)} IS NOT NULL ORDER BY 1").fetchall()]
+        catalogue['categories'][column] = pd.Index(values)
+        if values:
+            enum_type = _quote(f"{column}_enum")
+            con.execute(f"CREATE TYPE {enum_type} AS ENUM ({', '.join(map(_literal, values))})")
+            enums.append(f"CAST({_quote(column)} AS {enum_type}) AS {_quote(column)}")
+    replace = f" REPLACE ({', '.join(enums)})" if enums else ""
+    # L'ordre d'insertion (celui du fichier) est conservé : `rowid` sert d'ordre d'apparition
+    con.execute(f"CREATE TABLE {TABLE} AS SELECT *{replace} FROM staging")
+    con.execute("DROP TABLE staging")
+    catalogue['n_rows'] = con.execute(f"SELECT count(*) FROM {TABLE}").fetchone()[0]
+    for column in range_columns:
+        catalogue['ranges'][column] = con.execute(f"SELECT min({_quote(column)}), max({_quote(column)}) "
+                                                  f"FROM {TABLE}").fetchone()
+    return catalogue
+
+def get_value_range(catalogue, column):
+    """Retourne le minimum et le maximum d'une colonne d'intervalle (ou None si elle est vide)."""
+    low, high = catalogue['ranges'][column]
+    if low is None:
+        return None
+    return low, high
+
+def _query(catalogue, sql, params=()):
+    """Exécute une requête sur un curseur dédié (une connexion DuckDB n'est pas partagée entre threads)."""
+    cursor = catalogue['con'].cursor()
+    try:
+        return cursor.execute(sql, list(params)).fetchall()
+    finally:
+        cursor.close()
+
+
+# ==========================================================
+# FILTRAGE
+# ==========================================================
+
+def select_rows(catalogue, equals=None, ranges=None):
+    """
+    Traduit une combinaison de filtres en sélection SQL (même sémantique que
+    `bitmap_index.select_rows` : une liste vide ou un intervalle qui couvre
+    toutes les valeurs ne filtre pas).
+
+    Returns:
+        tuple: (clause WHERE, paramètres).
+    """
+    clauses, params = [], []
+    for column, values in (equals or {}).items():
+        if values:
+            clauses.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})")
+            params += values
+    for column, (start, end) in (ranges or {}).items():
+        full_range = get_value_range(catalogue, column)
+        if full_range is not None and start <= full_range[0] and end >= full_range[1]:
+            continue
+        clauses.append(f"{_quote(column)} BETWEEN ? AND ?")
+        params += [start, end]
+    return " AND ".join(clauses) or "TRUE", tuple(params)
+
+
+# ==========================================================
+# AGRÉGATIONS SUR UNE SÉLECTION
+# ==========================================================
+
+def count_rows(catalogue, rows):
+    """Nombre de lignes de la sélection `rows`."""
+    where, params = rows
+    return _query(catalogue, f"SELECT count(*) FROM {TABLE} WHERE {where}", params)[0][0]
+
+def mean_value(catalogue, column, rows):
+    """Moyenne d'une colonne sur la sélection (valeurs manquantes ignorées), ou None."""
+    where, params = rows
+    return _query(catalogue, f"SELECT avg({_quote(column)}) FROM {TABLE} WHERE {where}", params)[0][0]
+
+def count_values(catalogue, column, rows, sort=True):
+    """
+    Compte les valeurs d'une colonne sur la sélection `rows`
+    (même résultat que `bitmap_index.count_values`).
+
+    Args:
+        sort (bool): True : comptes décroissants (à égalité, ordre d'apparition) ;
+                     False : ordre d'apparition des valeurs.
+    """
+    where, params = rows
+    order = "count DESC, first_seen" if sort else "first_seen"
+    result = _query(catalogue, f"""
+        SELECT {_quote(column)} AS value, count(*) AS count, min(rowid) AS first_seen
+        FROM {TABLE}
+        WHERE {where} AND {_quote(column)} IS NOT NULL
+        GROUP BY 1
+        ORDER BY {order}""", params)
+    values = [value for value, _, _ in result]
+    counts = np.asarray([count for _, count, _ in result], dtype='int64')
+    # Type des valeurs connu même pour une sélection vide (colonnes catégorielles)
+    categories = catalogue['categories'].get(column)
+    dtype = categories.dtype if categories is not None else None
+    return pd.Series(counts, index=pd.Index(values, dtype=dtype, name=column), name='count')
+
+def most_frequent(catalogue, column, rows):
+    """Valeur la plus fréquente d'une colonne sur la sélection (à égalité, la plus petite), ou None."""
+    where, params = rows
+    result = _query(catalogue, f"""
+        SELECT {_quote(column)} FROM {TABLE}
+        WHERE {where} AND {_quote(column)} IS NOT NULL
+        GROUP BY 1
+        ORDER BY count(*) DESC, 1
+        LIMIT 1""", params)
+    return result[0][0] if result else None
+
+
+# ==========================================================
+# RÉSUMÉS DU CATALOGUE
+# ==========================================================
+
+def corr_matrix(catalogue, columns):
+    """Matrice de corrélation de Pearson de `columns` (paires de valeurs non manquantes, comme `DataFrame.corr`)."""
+    pairs = [(a, b) for a in columns for b in columns]
+    expressions = ", ".join(f"corr({_quote(a)}, {_quote(b)})" for a, b in pairs)
+    values = _query(catalogue, f"SELECT {expressions} FROM {TABLE}")[0]
+    matrix = np.array([np.nan if value is None else value for value in values], dtype='float64')
+    return pd.DataFrame(matrix.reshape(len(columns), len(columns)), index=columns, columns=columns)
+
+def box_stats(catalogue, column, rows, label='', by=None, top_n=None, whis=1.5):
+    """
+    Résumés de boxplot d'une colonne sur la sélection `rows`, au format de
+    `pandas_helpers.compute_box_stats` (quartiles interpolés, moustaches à
+    `whis` x IQR, valeurs aberrantes dédoublonnées).
+
+    Args:
+        by (str | None): Colonne de regroupement : un résumé par groupe, pour
+            les `top_n` groupes les plus fréquents (cf. `grouped_box_stats`).
+
+    Returns:
+        dict | list | None: Un résumé (ou None si la sélection est vide),
+                            ou une liste de résumés avec `by`.
+    """
+    where, params = rows
+    group = _quote(by) if by is not None else "NULL"
+    group_filter = f"AND {_quote(by)} IS NOT NULL" if by is not None else ""
+    limit = f"LIMIT {int(top_n)}" if top_n is not None else ""
+    result = _query(catalogue, f"""
+        WITH base AS (
+            SELECT {group} AS label, CAST({_quote(column)} AS DOUBLE) AS v, rowid AS r
+            FROM {TABLE}
+            WHERE {where} AND {_quote(column)} IS NOT NULL {group_filter}
+        ), groups AS (
+            SELECT label, count(*) AS n, min(r) AS first_seen, avg(v) AS mean,
+                   quantile_cont(v, 0.25) AS q1, quantile_cont(v, 0.5) AS med, quantile_cont(v, 0.75) AS q3
+            FROM base
+            GROUP BY label
+            ORDER BY n DESC, first_seen
+            {limit}
+        ), fences AS (
+            SELECT *, q1 - {whis} * (q3 - q1) AS low, q3 + {whis} * (q3 - q1) AS high FROM groups
+        )
+        SELECT f.label, f.n, f.mean, f.q1, f.med, f.q3,
+               min(b.v) FILTER (WHERE b.v BETWEEN f.low AND f.high),
+               max(b.v) FILTER (WHERE b.v BETWEEN f.low AND f.high),
+               list(DISTINCT b.v ORDER BY b.v) FILTER (WHERE b.v < f.low OR b.v > f.high)
+        FROM fences f JOIN base b ON b.label IS NOT DISTINCT FROM f.label
+        GROUP BY f.label, f.n, f.first_seen, f.mean, f.q1, f.med, f.q3
+        ORDER BY f.n DESC, f.first_seen""", params)
+
+    summaries = [{
+        'label': group_label if by is not None else label,
+        'med': med, 'q1': q1, 'q3': q3,
+        'whislo': whislo, 'whishi': whishi,
+        'fliers': np.asarray(fliers or [], dtype='float64'),
+        'mean': mean,
+        'n': n,
+    } for group_label, n, mean, q1, med, q3, whislo, whishi, fliers in result]
+    if by is not None:
+        return summaries
+    return summaries[0] if summaries else None